@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+"""Benchmark of aggregates over Place attributes
+
+Usage: ./benchmarks/bench_aggregate.py [number of objects]
+"""
+import os
+import random
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+os.chdir(tempfile.mkdtemp())
+
+from models import storage  # noqa: E402
+from models.place import Place  # noqa: E402
+from models.engine import column_store  # noqa: E402
+from models.engine.db_storage import DBStorage  # noqa: E402
+
+
+def main(count):
+    """
+    Time an average, a count per city and an average per city over
+    count Places, with a loop over a copy of the objects, with
+    FileStorage.aggregate() and with DBStorage.aggregate().
+
+    Args:
+        count (int): The number of Places in the storage.
+    """
+
+    database = DBStorage()
+    database.reload()
+    with database.batch():
+        for i in range(count):
+            place = Place()
+            place.city_id = "city{}".format(random.randrange(1000))
+            place.price_by_night = random.randint(10, 1000)
+            database.new(place)
+
+    def loop_avg():
+        prices = [place.price_by_night
+                  for place in storage.all(Place).values()]
+        return sum(prices) / len(prices)
+
+    def loop_count():
+        counts = {}
+        for place in storage.all(Place).values():
+            counts[place.city_id] = counts.get(place.city_id, 0) + 1
+        return counts
+
+    def loop_group_avg():
+        groups = {}
+        for place in storage.all(Place).values():
+            groups.setdefault(place.city_id, []).append(
+                place.price_by_night)
+        return {city_id: sum(prices) / len(prices)
+                for city_id, prices in groups.items()}
+
+    storage.column_store(Place)
+    print("{} Places, NumPy {}".format(
+        count, "installed" if column_store.numpy else "not installed"))
+    print("{:>24} {:>12} {:>12} {:>12}".format(
+        "", "loop (ms)", "file (ms)", "sqlite (ms)"))
+    for name, loop, arguments in (
+            ("avg price", loop_avg, ("avg", "price_by_night")),
+            ("count by city", loop_count, ("count", None, "city_id")),
+            ("avg price by city", loop_group_avg,
+             ("avg", "price_by_night", "city_id"))):
+        print("{:>24} {:>12.1f} {:>12.1f} {:>12.1f}".format(
+            name, timeit.timeit(loop, number=1) * 1000,
+            timeit.timeit(lambda: storage.aggregate(Place, *arguments),
+                          number=1) * 1000,
+            timeit.timeit(lambda: database.aggregate(Place, *arguments),
+                          number=1) * 1000))
+    database.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+"""Benchmark of the event loop latency while large saves run
+
+Usage: ./benchmarks/bench_async.py [number of objects]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+os.chdir(tempfile.mkdtemp())
+
+from models import storage  # noqa: E402
+from models.engine.async_storage import AsyncStorage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+async def measure(save, saves):
+    """
+    Run some saves 10 ms apart while a ticker task sleeps 1 ms at a
+    time, and record how late the ticker wakes up.
+
+    Args:
+        save (coroutine function): Saves the storage once.
+        saves (int): The number of saves to run.
+
+    Returns:
+        tuple: The total time and the median and worst lateness of the
+            ticker, in milliseconds.
+    """
+
+    delays = []
+    running = True
+
+    async def tick():
+        while running:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            delays.append(time.perf_counter() - start - 0.001)
+
+    places = list(storage.all(Place).values())[:10]
+    ticker = asyncio.ensure_future(tick())
+    start = time.perf_counter()
+    for i in range(saves):
+        for place in places:
+            place.name = str(i)
+        await save()
+        await asyncio.sleep(0.01)
+    total = time.perf_counter() - start
+    running = False
+    await ticker
+    delays.sort()
+    return (total * 1000, delays[len(delays) // 2] * 1000,
+            delays[-1] * 1000)
+
+
+async def main(count, saves=10):
+    """
+    Compare the ticker lateness while Places are saved on the event loop
+    and through an AsyncStorage.
+
+    Args:
+        count (int): The number of Places to store.
+        saves (int): The number of saves to run.
+    """
+
+    with storage.batch():
+        for i in range(count):
+            Place().save()
+
+    async def blocking():
+        storage.save()
+
+    print("{:>10} {:>12} {:>14} {:>13}".format(
+        "saves", "total (ms)", "median (ms)", "worst (ms)"))
+    print("{:>10} {:>12.1f} {:>14.3f} {:>13.3f}".format(
+        "loop", *await measure(blocking, saves)))
+    async with AsyncStorage(storage) as facade:
+        print("{:>10} {:>12.1f} {:>14.3f} {:>13.3f}".format(
+            "async", *await measure(facade.save, saves)))
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000))
@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+"""Benchmark of creating objects one save at a time and in one batch
+
+Usage: ./benchmarks/bench_batch.py [number of objects]
+"""
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+os.chdir(tempfile.mkdtemp())
+
+from models import storage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def main(count):
+    """
+    Time creating and saving 10, 100, ... up to count Places, each
+    saved on its own and all saved in one batch.
+
+    Args:
+        count (int): The largest number of Places to create.
+    """
+
+    def create(number):
+        for i in range(number):
+            Place().save()
+
+    def create_batch(number):
+        with storage.batch():
+            create(number)
+
+    print("{:>10} {:>14} {:>14}".format("objects", "saves (ms)",
+                                        "batch (ms)"))
+    number = 10
+    while number <= count:
+        storage.load({})
+        saves = timeit.timeit(lambda: create(number), number=1)
+        storage.load({})
+        batch = timeit.timeit(lambda: create_batch(number), number=1)
+        print("{:>10} {:>14.3f} {:>14.3f}".format(number, saves * 1000,
+                                                  batch * 1000))
+        number *= 10
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,60 @@
+#!/usr/bin/python3
+"""Benchmark of range filters and aggregates over the Place column store
+
+Usage: ./benchmarks/bench_between.py [number of objects]
+"""
+import os
+import random
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+os.chdir(tempfile.mkdtemp())
+
+from models import storage  # noqa: E402
+from models.place import Place  # noqa: E402
+from models.engine import column_store  # noqa: E402
+
+
+def main(count):
+    """
+    Time a price range filter and a mean over count Places, looping
+    over the objects and through the column store.
+
+    Args:
+        count (int): The number of Places in the storage.
+    """
+
+    for i in range(count):
+        place = Place()
+        place.price_by_night = random.randint(10, 1000)
+        place.latitude = random.uniform(-90, 90)
+    places = storage.all(Place)
+    store = storage.column_store(Place)
+
+    def loop_filter():
+        return {key: place for key, place in places.items()
+                if 100 <= place.price_by_night <= 200}
+
+    def loop_mean():
+        prices = [place.price_by_night for place in places.values()
+                  if place.latitude >= 0]
+        return sum(prices) / len(prices)
+
+    print("{} Places, NumPy {}".format(
+        count, "installed" if column_store.numpy else "not installed"))
+    print("{:>24} {:>12} {:>12}".format("", "loop (ms)", "column (ms)"))
+    for name, loop, column in (
+            ("price in [100, 200]", loop_filter,
+             lambda: storage.between(Place, price_by_night=(100, 200))),
+            ("mean price, lat >= 0", loop_mean,
+             lambda: store.aggregate("price_by_night", "mean",
+                                     latitude=(0, None)))):
+        print("{:>24} {:>12.3f} {:>12.3f}".format(
+            name, timeit.timeit(loop, number=5) * 200,
+            timeit.timeit(column, number=5) * 200))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
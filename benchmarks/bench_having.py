@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+"""Benchmark of amenity filters on Places with the bitmap index
+
+Usage: ./benchmarks/bench_having.py [number of objects]
+"""
+import os
+import random
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+os.chdir(tempfile.mkdtemp())
+
+from models import storage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def main(count):
+    """
+    Time amenity filters over count Places holding a few of 40 amenity
+    ids each, with a scan of the lists and through the index.
+
+    Args:
+        count (int): The number of Places in the storage.
+    """
+
+    amenities = ["amenity-{}".format(i) for i in range(40)]
+    weights = [1 / (rank + 1) for rank in range(len(amenities))]
+    for i in range(count):
+        place = Place()
+        place.amenity_ids = list(set(random.choices(amenities, weights,
+                                                    k=6)))
+    wifi, tv, pets, pool = amenities[:4]
+    filters = (("wifi AND tv AND pets", ([wifi, tv, pets], (), ())),
+               ("3 rare amenities", (amenities[-3:], (), ())),
+               ("wifi AND (pets OR pool)", ([wifi], [pets, pool], ())),
+               ("tv AND NOT wifi", ([tv], (), [wifi])))
+
+    def scan(all_of, any_of, none_of):
+        return [place for place in storage.all(Place).values()
+                if all(value in place.amenity_ids for value in all_of) and
+                (not any_of or
+                 any(value in place.amenity_ids for value in any_of)) and
+                not any(value in place.amenity_ids for value in none_of)]
+
+    def indexed(all_of, any_of, none_of):
+        return storage.having(Place, all_of, any_of, none_of)
+
+    print("{} Places, index built in {:.0f} ms".format(count, timeit.timeit(
+        lambda: storage.having(Place), number=1) * 1000))
+    print("{:>24} {:>9} {:>12} {:>12}".format(
+        "", "matches", "scan (ms)", "index (ms)"))
+    for name, arguments in filters:
+        matches = len(indexed(*arguments))
+        seconds = [timeit.timeit(lambda: search(*arguments), number=5) / 5
+                   for search in (scan, indexed)]
+        print("{:>24} {:>9} {:>12.3f} {:>12.3f}".format(
+            name, matches, *(second * 1000 for second in seconds)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,64 @@
+#!/usr/bin/python3
+"""Benchmark of radius and nearest Place searches with the geospatial index
+
+Usage: ./benchmarks/bench_near.py [number of objects]
+"""
+import heapq
+import os
+import random
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+os.chdir(tempfile.mkdtemp())
+
+from models import storage  # noqa: E402
+from models.place import Place  # noqa: E402
+from models.engine.geo_index import GeoIndex  # noqa: E402
+
+
+def main(count):
+    """
+    Time searches around random points over count Places spread over
+    the globe, with a scan of the objects and through the index.
+
+    Args:
+        count (int): The number of Places in the storage.
+    """
+
+    for i in range(count):
+        place = Place()
+        place.latitude = random.uniform(-60, 70)
+        place.longitude = random.uniform(-180, 180)
+    points = [(random.uniform(-60, 70), random.uniform(-180, 180))
+              for i in range(20)]
+
+    def scan(km, limit):
+        for point in points:
+            found = []
+            for place in storage.all(Place).values():
+                distance = GeoIndex.distance(
+                    point, (place.latitude, place.longitude))
+                if distance <= km:
+                    found.append((distance, place.id))
+            heapq.nsmallest(limit, found) if limit else sorted(found)
+
+    def indexed(km, limit):
+        for point in points:
+            storage.near(*point, km, limit)
+
+    print("{} Places, index built in {:.0f} ms".format(count, timeit.timeit(
+        lambda: storage.near(0, 0, 0), number=1) * 1000))
+    print("{:>24} {:>12} {:>12}".format("", "scan (ms)", "index (ms)"))
+    for name, km, limit in (("10 nearest within 50 km", 50, 10),
+                            ("10 nearest", 20000, 10),
+                            ("all within 200 km", 200, None)):
+        seconds = [timeit.timeit(lambda: search(km, limit), number=1)
+                   for search in (scan, indexed)]
+        print("{:>24} {:>12.3f} {:>12.3f}".format(
+            name, *(second * 1000 / len(points) for second in seconds)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
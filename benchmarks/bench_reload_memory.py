@@ -0,0 +1,103 @@
+#!/usr/bin/python3
+"""Benchmark of the peak memory of FileStorage.reload() against store size
+
+Each measure runs in a fresh interpreter and reports its peak resident set
+size, for the streaming reload() and for a json.load() of the whole file.
+
+Usage: ./benchmarks/bench_reload_memory.py [number of objects ...]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+RELOAD = """
+import resource, sys
+sys.path.insert(0, {root!r})
+from models import storage
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+JSON_LOAD = """
+import json, resource, sys
+sys.path.insert(0, {root!r})
+from models.engine.file_storage import FileStorage
+classes = FileStorage().classes()
+with open("file.json", "r", encoding="utf-8") as file:
+    objects = {{key: classes[value["__class__"]](**value)
+               for key, value in json.load(file).items()}}
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def write_store(directory, count):
+    """
+    Write a file.json of count Places.
+
+    Args:
+        directory (str): The directory of the file.
+        count (int): The number of Places.
+
+    Returns:
+        int: The size of the file in bytes.
+    """
+
+    path = os.path.join(directory, "file.json")
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("{")
+        for i in range(count):
+            value = {"id": str(i), "__class__": "Place",
+                     "created_at": "2023-07-14T13:57:32.171403",
+                     "updated_at": "2023-07-14T13:57:32.171516",
+                     "name": "Place {}".format(i),
+                     "description": "A quiet place " * 8,
+                     "price_by_night": i % 500, "max_guest": i % 8}
+            file.write("{}{}: {}".format(", " if i else "",
+                                         json.dumps("Place." + str(i)),
+                                         json.dumps(value)))
+        file.write("}")
+    return os.path.getsize(path)
+
+
+def peak_rss(directory, code):
+    """
+    Run some code in a fresh interpreter and get its peak memory.
+
+    Args:
+        directory (str): The working directory of the interpreter.
+        code (str): The code to run.
+
+    Returns:
+        int: The peak resident set size in MiB.
+    """
+
+    process = subprocess.run([sys.executable, "-c", code.format(root=ROOT)],
+                             cwd=directory, check=True,
+                             stdout=subprocess.PIPE, text=True)
+    return int(process.stdout) // 1024
+
+
+def main(counts):
+    """
+    Print the peak memory of both loaders for each store size.
+
+    Args:
+        counts (list): The numbers of objects to measure.
+    """
+
+    print("{:>10} {:>10} {:>14} {:>14}".format(
+        "objects", "file (MiB)", "reload (MiB)", "json.load (MiB)"))
+    for count in counts:
+        with tempfile.TemporaryDirectory() as directory:
+            size = write_store(directory, count)
+            streaming = peak_rss(directory, RELOAD)
+            loading = peak_rss(directory, JSON_LOAD)
+            print("{:>10} {:>10} {:>14} {:>14}".format(
+                count, size >> 20, streaming, loading))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000, 300000])
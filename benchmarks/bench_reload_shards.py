@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+"""Benchmark of ShardedStorage reload() and save() against FileStorage
+
+Usage: ./benchmarks/bench_reload_shards.py [number of objects]
+"""
+import json
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+os.chdir(tempfile.mkdtemp())
+
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.engine.sharded_storage import ShardedStorage  # noqa: E402
+
+
+def main(count):
+    """
+    Time a reload of count Places, then a save after changing one, with
+    a single JSON file and with shard directories decoded in this
+    process and across a process pool.
+
+    Args:
+        count (int): The number of Places in the storage.
+    """
+
+    with open("file.json", "w", encoding="utf-8") as file:
+        file.write("{")
+        for i in range(count):
+            value = {"id": str(i), "__class__": "Place",
+                     "created_at": "2023-07-14T13:57:32.171403",
+                     "updated_at": "2023-07-14T13:57:32.171516",
+                     "name": "Place {}".format(i),
+                     "price_by_night": i % 500, "max_guest": i % 8}
+            file.write("{}{}: {}".format(", " if i else "",
+                                         json.dumps("Place." + str(i)),
+                                         json.dumps(value)))
+        file.write("}")
+    ShardedStorage.from_json("file.json", "file.shards")
+    workers = os.cpu_count() or 1
+    print("{} Places, {} CPUs".format(count, workers))
+    print("{:>24} {:>12} {:>12}".format("", "reload (ms)", "save (ms)"))
+    for name, storage, arguments in (
+            ("FileStorage", FileStorage(), ()),
+            ("ShardedStorage, inline", ShardedStorage(), (0,)),
+            ("ShardedStorage, pool", ShardedStorage(), (workers,))):
+        reload = timeit.timeit(lambda: storage.reload(*arguments), number=1)
+        place = storage.get("Place", "0")
+        place.max_guest += 1
+        save = timeit.timeit(storage.save, number=1)
+        print("{:>24} {:>12.0f} {:>12.1f}".format(name, reload * 1000,
+                                                  save * 1000))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,42 @@
+#!/usr/bin/python3
+"""Benchmark of FileStorage.save() against the number of changed objects
+
+Usage: ./benchmarks/bench_save.py [number of objects]
+"""
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+os.chdir(tempfile.mkdtemp())
+
+from models import storage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def main(count):
+    """
+    Time a save after changing 0, 1, 10, ... and all of count Places.
+
+    Args:
+        count (int): The number of Places in the storage.
+    """
+
+    places = [Place() for i in range(count)]
+    seconds = timeit.timeit(storage.save, number=1)
+    print("{:>10} {:>12}".format("changed", "save (ms)"))
+    print("{:>10} {:>12.3f}   (first save)".format(count, seconds * 1000))
+    changed = 0
+    while True:
+        for place in places[:changed]:
+            place.price_by_night += 1
+        seconds = timeit.timeit(storage.save, number=1)
+        print("{:>10} {:>12.3f}".format(changed, seconds * 1000))
+        if changed >= count:
+            break
+        changed = min(count, changed * 10 or 1)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
@@ -1,15 +1,26 @@
 #!/usr/bin/python3
 """HBNBCommand Module"""
+import argparse
 import cmd
+import contextlib
+import datetime
+import io
 import re
 import json
+import math
+import os
+import sys
+import time
 from models.base_model import BaseModel
 from models import storage
+from models.engine.aggregate import Aggregate
+from models.engine.query import Query
 
 
 class HBNBCommand(cmd.Cmd):
     """Class for the command interpreter."""
     prompt = "(hbnb) "
+    __batch = None  # the real output and the buffer of run_batch()
 
     def do_EOF(self, line):
         """
@@ -22,6 +33,7 @@ class HBNBCommand(cmd.Cmd):
             bool: True to exit the program.
 
         """
+        storage.flush()
         print()
         return True
 
@@ -42,6 +54,30 @@ class HBNBCommand(cmd.Cmd):
             instance.save()
             print(instance.id)
 
+    def do_import(self, line):
+        """
+        Creates the instances of a class read from an NDJSON or CSV file,
+        saves them once and prints their number.
+
+        Args:
+            line (str): The command line string.
+
+        """
+        words = line.split(' ', 1)
+        if not words[0]:
+            print("** class name missing **")
+        elif words[0] not in storage.classes():
+            print("** class doesn't exist **")
+        elif len(words) < 2 or not words[1].strip():
+            print("** file path missing **")
+        elif not os.path.isfile(words[1].strip()):
+            print("** file doesn't exist **")
+        else:
+            try:
+                print(storage.bulk_load(words[0], words[1].strip()))
+            except ValueError as error:
+                print("** {} **".format(error))
+
     def do_show(self, line):
         """
         Prints the string representation of an instance.
@@ -59,11 +95,11 @@ class HBNBCommand(cmd.Cmd):
             elif len(words) < 2:
                 print("** instance id missing **")
             else:
-                key = f"{words[0]}.{words[1]}"
-                if key not in storage.all():
+                instance = storage.get(words[0], words[1])
+                if instance is None:
                     print("** no instance found **")
                 else:
-                    print(storage.all()[key])
+                    print(instance)
 
     def do_quit(self, line):
         """
@@ -76,8 +112,88 @@ class HBNBCommand(cmd.Cmd):
             bool: True to exit the program.
 
         """
+        storage.flush()
         return True
 
+    def precmd(self, line):
+        """
+        Picks up the changes other processes saved before running a
+        command.
+
+        Args:
+            line (str): The command line string.
+
+        Returns:
+            str: The command line string.
+
+        """
+        storage.refresh()
+        return line
+
+    def run_batch(self, lines, every=0):
+        """
+        Runs commands back to back within storage batches, and buffers
+        their output until each batch is saved.
+
+        The commands are saved once at the end, or every `every`
+        commands, instead of one save each. An exception rolls back the
+        commands run since the last save. Within the script, begin and
+        commit save the commands run so far, and rollback discards those
+        run since the last save, then batching goes on.
+
+        Args:
+            lines (iterable): The command lines.
+            every (int): The number of commands between two saves, or 0
+                to save only at the end.
+
+        Returns:
+            int: The number of commands run.
+
+        """
+        stdout = sys.stdout
+        output = io.StringIO()
+        count = 0
+        self.__batch = (stdout, output)
+        try:
+            with contextlib.redirect_stdout(output):
+                storage.begin()
+                for line in lines:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    count += 1
+                    if self.onecmd(line):
+                        break
+                    if every and not count % every:
+                        self.__save_batch(stdout, output)
+                        storage.begin()
+        except BaseException:
+            if storage.in_batch():
+                storage.rollback()
+            stdout.write(output.getvalue())
+            raise
+        finally:
+            self.__batch = None
+        self.__save_batch(stdout, output)
+        return count
+
+    @staticmethod
+    def __save_batch(stdout, output):
+        """
+        Saves the current batch, then writes and clears the output
+        buffered since the last save.
+
+        Args:
+            stdout (file): The file to write the output to.
+            output (StringIO): The buffered output.
+
+        """
+        if storage.in_batch():
+            storage.commit()
+        stdout.write(output.getvalue())
+        output.seek(0)
+        output.truncate()
+
     def emptyline(self):
         """Doesn't do anything on ENTER."""
         pass
@@ -99,32 +215,114 @@ class HBNBCommand(cmd.Cmd):
             elif len(words) < 2:
                 print("** instance id missing **")
             else:
-                key = f"{words[0]}.{words[1]}"
-                if key not in storage.all():
+                instance = storage.get(words[0], words[1])
+                if instance is None:
                     print("** no instance found **")
                 else:
-                    del storage.all()[key]
+                    storage.delete(instance)
                     storage.save()
 
+    def do_compact(self, line):
+        """
+        Folds the storage log into a fresh snapshot.
+
+        Args:
+            line (str): The command line string.
+
+        """
+        storage.compact()
+
+    def do_begin(self, line):
+        """
+        Starts a transaction: changes are saved only on commit. In batch
+        mode, saves the commands run so far instead, so that a rollback
+        discards only those run after it.
+
+        Args:
+            line (str): The command line string.
+
+        """
+        if self.__batch is not None:
+            self.__save_batch(*self.__batch)
+            storage.begin()
+        elif storage.in_batch():
+            print("** transaction already in progress **")
+        else:
+            storage.begin()
+
+    def do_commit(self, line):
+        """
+        Saves the changes made since begin, all at once. In batch mode,
+        saves the commands run since the last save and goes on batching.
+
+        Args:
+            line (str): The command line string.
+
+        """
+        if self.__batch is not None:
+            self.__save_batch(*self.__batch)
+            storage.begin()
+        elif not storage.in_batch():
+            print("** no transaction in progress **")
+        else:
+            storage.commit()
+
+    def do_rollback(self, line):
+        """
+        Discards the changes made since begin. In batch mode, discards
+        the commands run since the last save and goes on batching.
+
+        Args:
+            line (str): The command line string.
+
+        """
+        if not storage.in_batch():
+            print("** no transaction in progress **")
+        else:
+            storage.rollback()
+            if self.__batch is not None:
+                storage.begin()
+
     def do_all(self, line):
         """
-        Prints the string representation of instances
+        Prints the string representation of instances, one page of the
+        storage at a time, optionally from an offset or after the key or
+        id of an instance, and up to a limit:
+        all [class name] [limit=N] [offset=N] [after=id]
 
         Args:
             line (str): The command line string.
 
         """
-        if line:
-            words = line.split(' ')
-            if words[0] not in storage.classes():
+        words = line.replace(',', ' ').split()
+        class_name = None
+        if words and '=' not in words[0]:
+            class_name = words.pop(0)
+            if class_name not in storage.classes():
                 print("** class doesn't exist **")
-            else:
-                instance_list = [str(obj) for key, obj in storage.all().items()
-                                 if type(obj).__name__ == words[0]]
-                print(instance_list)
-        else:
-            instance_list = [str(obj) for key, obj in storage.all().items()]
-            print(instance_list)
+                return
+        options = {}
+        for word in words:
+            name, _, value = word.partition('=')
+            value = value.strip('"')
+            if name in ("limit", "offset"):
+                if not value.isdigit():
+                    print("** invalid {} **".format(name))
+                    return
+                options[name] = int(value)
+            elif name == "after" and value:
+                if class_name and '.' not in value:
+                    value = "{}.{}".format(class_name, value)
+                options[name] = value
+        sys.stdout.write("[")
+        for position, obj in enumerate(storage.stream(class_name,
+                                                      **options)):
+            if position:
+                sys.stdout.write(", ")
+            sys.stdout.write(repr(str(obj)))
+            if not position % 100:
+                sys.stdout.flush()
+        sys.stdout.write("]\n")
 
     def do_count(self, line):
         """
@@ -140,10 +338,231 @@ class HBNBCommand(cmd.Cmd):
         elif words[0] not in storage.classes():
             print("** class doesn't exist **")
         else:
-            matches = [
-                k for k in storage.all() if k.startswith(
-                    words[0] + '.')]
-            print(len(matches))
+            print(storage.count(words[0]))
+
+    def do_near(self, line):
+        """
+        Prints the string representation of the instances of a class
+        within a distance in kilometers of a point, nearest first, and
+        up to a limit:
+        near <class name> <latitude> <longitude> <km> [limit]
+
+        Args:
+            line (str): The command line string.
+
+        """
+        words = line.replace(',', ' ').split()
+        if not words:
+            print("** class name missing **")
+            return
+        if words[0] not in storage.classes():
+            print("** class doesn't exist **")
+            return
+        if words[0] not in storage.locations():
+            print("** class has no location **")
+            return
+        if len(words) < 3:
+            print("** coordinates missing **")
+            return
+        if len(words) < 4:
+            print("** distance missing **")
+            return
+        numbers = []
+        for word in words[1:4]:
+            try:
+                numbers.append(float(word))
+            except ValueError:
+                numbers.append(math.nan)
+        latitude, longitude, km = numbers
+        if not (abs(latitude) <= 90 and abs(longitude) <= 180):
+            print("** invalid coordinates **")
+            return
+        if not km >= 0:
+            print("** invalid distance **")
+            return
+        limit = None
+        if len(words) > 4:
+            if not words[4].isdigit():
+                print("** invalid limit **")
+                return
+            limit = int(words[4])
+        print([str(obj) for distance, obj in storage.near(
+            latitude, longitude, km, limit, words[0])])
+
+    def do_having(self, line):
+        """
+        Prints the string representation of the instances of a class
+        whose list attribute, such as the amenity ids of a Place, holds
+        every plain value, one of the values joined by "|", and none of
+        the values starting with "!":
+        having <class name> <value> [<value>|<value>] [!<value>] ...
+
+        Args:
+            line (str): The command line string.
+
+        """
+        words = line.replace(',', ' ').split()
+        if not words:
+            print("** class name missing **")
+            return
+        if words[0] not in storage.classes():
+            print("** class doesn't exist **")
+            return
+        if words[0] not in storage.memberships():
+            print("** class has no list attribute **")
+            return
+        if len(words) < 2:
+            print("** values missing **")
+            return
+        all_of, any_of, none_of = [], [], []
+        for word in words[1:]:
+            if word.startswith("!") and len(word) > 1:
+                none_of.append(word[1:])
+            elif "|" in word and not any_of:
+                any_of = [value for value in word.split("|") if value]
+            elif "|" in word:
+                print("** invalid condition **")
+                return
+            else:
+                all_of.append(word)
+        attribute = storage.memberships()[words[0]][0]
+        print([str(obj) for obj in storage.having(
+            words[0], all_of, any_of, none_of, attribute).values()])
+
+    def do_search(self, line):
+        """
+        Prints the string representation of the instances of a class
+        whose text attributes hold some words, best match first, and up
+        to a limit. Phrases go between double quotes:
+        search <class name> [limit=N] <words>
+
+        Args:
+            line (str): The command line string.
+
+        """
+        class_name, _, text = line.strip().partition(' ')
+        limit = None
+        match = re.search(r'^limit=(\S*)\s*(.*)$', text)
+        if match:
+            limit, text = match.groups()
+        self.print_search(class_name, text, limit)
+
+    def print_search(self, class_name, text, limit=None):
+        """
+        Prints the instances of a class matching a full-text search.
+
+        Args:
+            class_name (str): The name of the class.
+            text (str): The search.
+            limit (str): The largest number of instances to print, or
+                None for all of them.
+
+        """
+        if not class_name:
+            print("** class name missing **")
+        elif class_name not in storage.classes():
+            print("** class doesn't exist **")
+        elif class_name not in storage.texts():
+            print("** class has no text **")
+        elif not text.strip():
+            print("** search missing **")
+        elif limit is not None and not limit.isdigit():
+            print("** invalid limit **")
+        else:
+            print([str(obj) for score, obj in storage.search(
+                class_name, text, None if limit is None else int(limit))])
+
+    def do_sum(self, line):
+        """
+        Prints the sum of the numeric values of an attribute over the
+        instances of a class: sum <class name> <attribute name>
+
+        Args:
+            line (str): The command line string.
+
+        """
+        self.print_aggregate("sum", line.replace(',', ' ').split())
+
+    def do_avg(self, line):
+        """
+        Prints the average of the numeric values of an attribute over the
+        instances of a class: avg <class name> <attribute name>
+
+        Args:
+            line (str): The command line string.
+
+        """
+        self.print_aggregate("avg", line.replace(',', ' ').split())
+
+    def do_min(self, line):
+        """
+        Prints the smallest of the numeric values of an attribute over the
+        instances of a class: min <class name> <attribute name>
+
+        Args:
+            line (str): The command line string.
+
+        """
+        self.print_aggregate("min", line.replace(',', ' ').split())
+
+    def do_max(self, line):
+        """
+        Prints the largest of the numeric values of an attribute over the
+        instances of a class: max <class name> <attribute name>
+
+        Args:
+            line (str): The command line string.
+
+        """
+        self.print_aggregate("max", line.replace(',', ' ').split())
+
+    def do_group_by(self, line):
+        """
+        Prints an aggregate over each group of the instances of a class
+        sharing a value of an attribute, as a dictionary of the values to
+        the aggregates of their groups:
+        group_by <class name> <attribute name> <function> [attribute name]
+        where the function is count, sum, avg, min or max.
+
+        Args:
+            line (str): The command line string.
+
+        """
+        words = line.replace(',', ' ').split()
+        if len(words) == 1 and words[0] in storage.classes():
+            print("** attribute name missing **")
+            return
+        group_by = words.pop(1) if len(words) > 1 else None
+        function = words.pop(1) if len(words) > 1 else None
+        self.print_aggregate(function, words, group_by)
+
+    def print_aggregate(self, function, words, group_by=None):
+        """
+        Prints an aggregate of an attribute over the instances of a
+        class, or over each group of them.
+
+        Args:
+            function (str): The aggregate function.
+            words (list): The class name, then the name of the aggregated
+                attribute, which only count may omit.
+            group_by (str): The name of the attribute grouping the
+                instances, or None.
+
+        """
+        if not words:
+            print("** class name missing **")
+        elif words[0] not in storage.classes():
+            print("** class doesn't exist **")
+        elif function is None:
+            print("** function missing **")
+        elif function not in Aggregate.functions:
+            print("** unknown function **")
+        elif len(words) < 2 and function != "count":
+            print("** attribute name missing **")
+        else:
+            print(storage.aggregate(words[0], function,
+                                    words[1] if len(words) > 1 else None,
+                                    group_by))
 
     def do_update(self, line):
         """
@@ -170,8 +589,8 @@ class HBNBCommand(cmd.Cmd):
         elif uid is None:
             print("** instance id missing **")
         else:
-            key = f"{class_name}.{uid}"
-            if key not in storage.all():
+            instance = storage.get(class_name, uid)
+            if instance is None:
                 print("** no instance found **")
             elif not attribute:
                 print("** attribute name missing **")
@@ -194,8 +613,8 @@ class HBNBCommand(cmd.Cmd):
                         value = cast(value)
                     except ValueError:
                         pass  # fine, stay a string then
-                setattr(storage.all()[key], attribute, value)
-                storage.all()[key].save()
+                setattr(instance, attribute, value)
+                instance.save()
 
     def default(self, line):
         """Called when the entered command is not recognized."""
@@ -212,6 +631,19 @@ class HBNBCommand(cmd.Cmd):
             str: The processed command.
 
         """
+        match = re.search(r'^(\w*)((?:\.(?:where|order_by|limit|explain)'
+                          r'\((?:"[^"]*"|[^"()])*\))+)$', line)
+        if match:
+            self.run_query(match.group(1), match.group(2))
+            return ""
+
+        match = re.search(r'^(\w*)\.search\(\s*("(?:[^"\\]|\\.)*")'
+                          r'\s*(?:,\s*(\S*)\s*)?\)$', line)
+        if match:
+            self.print_search(match.group(1), json.loads(match.group(2)),
+                              match.group(3))
+            return ""
+
         match = re.search(r"^(\w*)\.(\w+)(?:\(([^)]*)\))$", line)
         if not match:
             return line
@@ -243,6 +675,116 @@ class HBNBCommand(cmd.Cmd):
         self.onecmd(command)
         return command
 
+    def run_query(self, class_name, calls):
+        """
+        Prints the instances of a class matching a query, or the plan of
+        the query, given as a chain of calls:
+        <class name>.where(<attribute><operator><value>, ...)
+        .order_by([-]<attribute>, ...).limit(<number>)[.explain()]
+
+        Args:
+            class_name (str): The name of the class.
+            calls (str): The chain of calls.
+
+        """
+        if not class_name:
+            print("** class name missing **")
+            return
+        if class_name not in storage.classes():
+            print("** class doesn't exist **")
+            return
+        query = Query(class_name)
+        explain = False
+        for method, args in re.findall(r'\.(\w+)\(((?:"[^"]*"|[^"()])*)\)',
+                                       calls):
+            if method == "where":
+                conditions = self.parse_conditions(class_name, args)
+                if conditions is None:
+                    print("** invalid condition **")
+                    return
+                query = query.where(*conditions)
+            elif method == "order_by":
+                keys = [key.strip().strip('"') for key in args.split(',')]
+                if not all(re.search(r"^-?\w+$", key) for key in keys):
+                    print("** invalid sort key **")
+                    return
+                query = query.order_by(*keys)
+            elif method == "limit":
+                if not args.strip().isdigit():
+                    print("** invalid limit **")
+                    return
+                query = query.limit(int(args))
+            else:
+                explain = True
+        if explain:
+            for step in storage.explain(query):
+                print(step)
+            return
+        try:
+            print([str(obj) for obj in storage.select(query)])
+        except TypeError:
+            print("** values cannot be compared **")
+
+    def parse_conditions(self, class_name, args):
+        """
+        Parses the conditions of a where() call, converting the values
+        of declared attributes to their type where nothing is lost, so
+        that 0.5 stays a float for an int attribute. Other values are
+        strings if quoted, else numbers when they read as numbers.
+
+        Args:
+            class_name (str): The name of the class.
+            args (str): The arguments of the call.
+
+        Returns:
+            list: The (attribute, operator, value) tuple of each
+            condition, or None if the arguments are invalid.
+
+        """
+        attributes = dict(storage.attributes()["BaseModel"])
+        attributes.update(storage.attributes().get(class_name, {}))
+        rex = r'\s*(\w+)\s*(<=|>=|!=|=|<|>)\s*("[^"]*"|[^,"\s]+)\s*(?:,|$)'
+        conditions = []
+        end = 0
+        for match in re.finditer(rex, args):
+            if match.start() != end:
+                return None
+            end = match.end()
+            attribute, operator, text = match.groups()
+            quoted = text.startswith('"')
+            if quoted:
+                text = text[1:-1]
+            value = text
+            if not quoted:
+                for cast in (int, float):
+                    try:
+                        value = cast(text)
+                        break
+                    except ValueError:
+                        pass
+            kind = attributes.get(attribute)
+            try:
+                if kind is datetime.datetime:
+                    value = datetime.datetime.fromisoformat(text)
+                elif kind is str:
+                    value = text
+                elif kind is float:
+                    value = float(text)
+                elif kind is int:
+                    try:
+                        value = int(text)
+                    except ValueError:
+                        # a fraction stays a float rather than being cut
+                        value = float(text)
+                        if value.is_integer():
+                            value = int(value)
+            except ValueError:
+                return None
+            conditions.append((attribute, operator, value))
+        if end != len(args) or not conditions:
+            return None
+        return conditions
+
     def update_instance_dict(self, class_name, uid, s_dict):
         """
         Updates an instance with values from a dictionary.
@@ -262,17 +804,38 @@ class HBNBCommand(cmd.Cmd):
         elif uid is None:
             print("** instance id missing **")
         else:
-            key = f"{class_name}.{uid}"
-            if key not in storage.all():
+            instance = storage.get(class_name, uid)
+            if instance is None:
                 print("** no instance found **")
             else:
                 attributes = storage.attributes()[class_name]
                 for attribute, value in d.items():
                     if attribute in attributes:
                         value = attributes[attribute](value)
-                    setattr(storage.all()[key], attribute, value)
-                storage.all()[key].save()
+                    setattr(instance, attribute, value)
+                instance.save()
 
 
 if __name__ == '__main__':
-    HBNBCommand().cmdloop()
+    parser = argparse.ArgumentParser(description="The AirBnB console.")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="run the commands of FILE, or of the standard"
+                        " input if FILE is -, in a single save")
+    parser.add_argument("--every", metavar="N", type=int, default=0,
+                        help="save every N commands in batch mode")
+    args = parser.parse_args()
+    if args.batch is None:
+        HBNBCommand().cmdloop()
+    else:
+        with contextlib.ExitStack() as stack:
+            if args.batch == "-":
+                script = sys.stdin
+            else:
+                script = stack.enter_context(open(args.batch, "r"))
+            start = time.perf_counter()
+            count = HBNBCommand().run_batch(script, args.every)
+            elapsed = time.perf_counter() - start
+        storage.flush()
+        print("{} commands in {:.3f} s ({:.0f} commands/s)".format(
+            count, elapsed, count / elapsed if elapsed else 0),
+            file=sys.stderr)
@@ -1,7 +1,28 @@
 #!/usr/bin/python3
 """Initializes the FileStorage"""
+from os import getenv
 from models.engine.file_storage import FileStorage
 
 
-storage = FileStorage()
-storage.reload()
+if getenv("HBNB_TYPE_STORAGE") == "binary":
+    from models.engine.binary_storage import BinaryStorage
+    storage = BinaryStorage()
+elif getenv("HBNB_TYPE_STORAGE") == "sharded":
+    from models.engine.sharded_storage import ShardedStorage
+    storage = ShardedStorage()
+elif getenv("HBNB_TYPE_STORAGE") == "db":
+    from models.engine.db_storage import DBStorage
+    storage = DBStorage(getenv("HBNB_SQLITE_PATH", "file.db"))
+else:
+    storage = FileStorage()
+if getenv("HBNB_FILE_JOURNAL") == "1":
+    storage.journal()
+if getenv("HBNB_FILE_LAZY") == "1":
+    storage.lazy()
+if getenv("HBNB_FILE_WRITE_BEHIND") == "1":
+    storage.write_behind()
+if getenv("HBNB_FILE_SHARED") == "1":
+    storage.share()
+# the workers of a parallel reload only decode the shards they are given
+if getenv("HBNB_RELOAD_WORKER") != "1":
+    storage.reload()
@@ -33,8 +33,26 @@ class BaseModel:
         """
 
         self.updated_at = datetime.today()
+        storage.new(self)
         storage.save()
 
+    def __setattr__(self, name, value):
+        """
+        Set an attribute, letting the storage record its previous value
+        and mark the instance as changed.
+
+        Args:
+            name (str): The name of the attribute.
+            value: The value of the attribute.
+
+        Returns:
+            None
+        """
+
+        storage.changing(self, name)
+        super().__setattr__(name, value)
+        storage.touch(self, name)
+
     def __str__(self):
         """
         Return a string representation of the BaseModel instance.
@@ -1,9 +1,23 @@
 #!/usr/bin/python3
 """City class module"""
+from models import storage
 from models.base_model import BaseModel
+from models.place import Place
 
 
 class City(BaseModel):
     """City class objects"""
 
     state_id, name = "", ""
+
+    @property
+    def places(self):
+        """
+        Get the places of the city, through the storage index of
+        Place.city_id.
+
+        Returns:
+            list: The Place instances whose city_id is the city's id.
+        """
+
+        return list(storage.find(Place, city_id=self.id).values())
@@ -0,0 +1,141 @@
+#!/usr/bin/python3
+"""Aggregate class module"""
+import json
+
+
+class Aggregate:
+    """
+    A running aggregate of the numeric values of one attribute, computed
+    in a single pass without keeping the values.
+
+    Values that are not numbers, booleans included, are ignored: they
+    neither count nor enter the sum. Without an attribute, "count"
+    counts the objects themselves.
+
+    Attributes:
+        function (str): One of "count", "sum", "avg", "min" or "max".
+        __count (int): The number of values added.
+        __total: The sum of the values added.
+        __extreme: The smallest or largest value added, or None.
+    """
+
+    functions = ("count", "sum", "avg", "min", "max")
+
+    def __init__(self, function):
+        """
+        Initialize an empty aggregate.
+
+        Args:
+            function (str): One of "count", "sum", "avg", "min" or "max".
+
+        Raises:
+            ValueError: If the function is unknown.
+        """
+
+        if function not in self.functions:
+            raise ValueError("Unknown aggregate: {}".format(function))
+        self.function = function
+        self.__count = 0
+        self.__total = 0
+        self.__extreme = None
+
+    def add(self, value):
+        """
+        Add a value to the aggregate.
+
+        Args:
+            value: The value, ignored if it is not a number.
+        """
+
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return
+        self.__count += 1
+        if self.function in ("sum", "avg"):
+            self.__total += value
+        elif self.__extreme is None or (
+                value < self.__extreme if self.function == "min"
+                else value > self.__extreme):
+            self.__extreme = value
+
+    def result(self):
+        """
+        Get the value of the aggregate.
+
+        Returns:
+            An int for "count", a float otherwise, or None for "avg",
+            "min" and "max" of no value.
+        """
+
+        if self.function == "count":
+            return self.__count
+        if self.function == "sum":
+            return float(self.__total)
+        if not self.__count:
+            return None
+        if self.function == "avg":
+            return self.__total / self.__count
+        return float(self.__extreme)
+
+    @staticmethod
+    def group_key(value):
+        """
+        Get the dictionary key of the group of a value: lists become
+        tuples, and the other unhashable values their JSON text.
+
+        Args:
+            value: The value of the grouping attribute.
+
+        Returns:
+            The value, or a hashable form of it.
+        """
+
+        if isinstance(value, list):
+            value = tuple(Aggregate.group_key(item) for item in value)
+        try:
+            hash(value)
+        except TypeError:
+            return json.dumps(value, sort_keys=True, default=str)
+        return value
+
+    @classmethod
+    def over(cls, objects, function, attribute=None, group_by=None):
+        """
+        Aggregate an attribute over some objects, or over each group of
+        them, in a single pass.
+
+        Args:
+            objects (iterable): The objects.
+            function (str): One of "count", "sum", "avg", "min" or "max".
+            attribute (str): The name of the aggregated attribute, or
+                None to count the objects.
+            group_by (str): The name of the attribute whose values group
+                the objects, or None for a single group.
+
+        Returns:
+            The aggregate, or a dictionary of each value of group_by,
+            as given by group_key(), to the aggregate of its group.
+
+        Raises:
+            ValueError: If the function is unknown, or is not "count"
+                and has no attribute.
+        """
+
+        if function not in cls.functions:
+            raise ValueError("Unknown aggregate: {}".format(function))
+        if attribute is None and function != "count":
+            raise ValueError("{} needs an attribute".format(function))
+        if group_by is None:
+            aggregate = cls(function)
+            for obj in objects:
+                aggregate.add(1 if attribute is None
+                              else getattr(obj, attribute, None))
+            return aggregate.result()
+        groups = {}
+        for obj in objects:
+            key = cls.group_key(getattr(obj, group_by, None))
+            aggregate = groups.get(key)
+            if aggregate is None:
+                aggregate = groups[key] = cls(function)
+            aggregate.add(1 if attribute is None
+                          else getattr(obj, attribute, None))
+        return {key: aggregate.result() for key, aggregate in groups.items()}
@@ -0,0 +1,195 @@
+#!/usr/bin/python3
+"""AsyncStorage class module"""
+import asyncio
+import concurrent.futures
+import itertools
+
+
+class AsyncStorage:
+    """
+    An asyncio facade of a storage engine, which runs the blocking
+    calls on a bounded thread pool so that they do not stall the event
+    loop.
+
+    Saves requested while no save is running are merged into one, and
+    saves requested while one runs are merged into the next, which
+    starts when the running one ends: a save always includes the
+    changes made before it was requested.
+
+    Attributes:
+        __storage: The storage engine.
+        __executor (ThreadPoolExecutor): The pool of the blocking calls.
+        __next (Future): The save that the next save() call joins, or
+            None if there is none.
+        __saver (Task): The task running the saves, or None if none
+            runs.
+    """
+
+    def __init__(self, storage=None, max_workers=4):
+        """
+        Initialize a facade.
+
+        Args:
+            storage: The storage engine, models.storage by default. It
+                must be safe to share between threads unless max_workers
+                is 1.
+            max_workers (int): The number of threads of the pool.
+        """
+
+        if storage is None:
+            from models import storage
+        self.__storage = storage
+        self.__executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="AsyncStorage")
+        self.__next = None
+        self.__saver = None
+
+    async def __aenter__(self):
+        """
+        Enter an async with block.
+
+        Returns:
+            AsyncStorage: The facade.
+        """
+
+        return self
+
+    async def __aexit__(self, *exc_info):
+        """
+        Wait for the pending saves and close the facade at the end of an
+        async with block.
+        """
+
+        await self.close()
+
+    @property
+    def storage(self):
+        """
+        Get the storage engine.
+
+        Returns:
+            The storage engine.
+        """
+
+        return self.__storage
+
+    async def __run(self, function, *args, **kwargs):
+        """
+        Run a blocking call on the thread pool.
+
+        Args:
+            function (callable): The call to run.
+            *args: The positional arguments of the call.
+            **kwargs: The keyword arguments of the call.
+
+        Returns:
+            The result of the call.
+        """
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.__executor, lambda: function(*args, **kwargs))
+
+    async def get(self, cls, id):
+        """
+        Get one stored object.
+
+        Args:
+            cls (type or str): The class, or class name, of the object.
+            id (str): The id of the object.
+
+        Returns:
+            BaseModel: The object, or None if it is not stored.
+        """
+
+        return await self.__run(self.__storage.get, cls, id)
+
+    async def find(self, cls, **equals):
+        """
+        Get the objects of one class whose attributes equal the given
+        values.
+
+        Args:
+            cls (type or str): The class, or class name, to select.
+            **equals: The attribute names and the values to match.
+
+        Returns:
+            dict: A dictionary of the matching objects.
+        """
+
+        return await self.__run(self.__storage.find, cls, **equals)
+
+    async def reload(self):
+        """
+        Reload the storage from its file, once the pending saves end.
+        """
+
+        if self.__saver is not None:
+            await asyncio.shield(self.__saver)
+        await self.__run(self.__storage.reload)
+
+    async def save(self):
+        """
+        Save the storage, merging the calls made meanwhile into a single
+        save.
+
+        Raises:
+            Exception: Any exception raised by the save.
+        """
+
+        loop = asyncio.get_running_loop()
+        if self.__next is None:
+            self.__next = loop.create_future()
+        pending = self.__next
+        if self.__saver is None:
+            self.__saver = loop.create_task(self.__save_all())
+        await asyncio.shield(pending)
+
+    async def __save_all(self):
+        """
+        Run the requested saves one after the other until none is left.
+        """
+
+        try:
+            while self.__next is not None:
+                pending, self.__next = self.__next, None
+                try:
+                    await self.__run(self.__storage.save)
+                except Exception as error:
+                    pending.set_exception(error)
+                else:
+                    pending.set_result(None)
+        finally:
+            self.__saver = None
+
+    async def stream(self, cls=None, chunk_size=100):
+        """
+        Iterate over the stored objects, or only those of one class,
+        reading them from the storage a chunk at a time on the thread
+        pool.
+
+        Args:
+            cls (type or str): The class, or class name, to select.
+            chunk_size (int): The number of objects read at a time.
+
+        Yields:
+            BaseModel: Each object.
+        """
+
+        objects = self.__storage.stream(cls)
+        while True:
+            chunk = await self.__run(
+                lambda: list(itertools.islice(objects, chunk_size)))
+            for obj in chunk:
+                yield obj
+            if len(chunk) < chunk_size:
+                return
+
+    async def close(self):
+        """
+        Wait for the pending saves and shut the thread pool down.
+        """
+
+        if self.__saver is not None:
+            await asyncio.shield(self.__saver)
+        self.__executor.shutdown(wait=False)
@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+"""AttributeIndex class module"""
+
+
+class AttributeIndex:
+    """
+    A hash index of the stored objects of one class by the value of
+    one of their attributes.
+
+    Attributes:
+        fields (tuple): The names of the attributes the index reads.
+        __entries (dict): A dictionary of attribute values to
+            dictionaries of ids to objects.
+        __values (dict): The indexed value of each object id, used to
+            move an object when its attribute changes.
+    """
+
+    def __init__(self, attribute):
+        """
+        Initialize an empty index.
+
+        Args:
+            attribute (str): The name of the indexed attribute.
+        """
+
+        self.fields = (attribute,)
+        self.__entries = {}
+        self.__values = {}
+
+    def put(self, object_id, obj):
+        """
+        Add an object to the index, or move it if its value changed.
+
+        Args:
+            object_id (str): The id of the object.
+            obj: The object.
+        """
+
+        value = getattr(obj, self.fields[0], None)
+        if object_id in self.__values:
+            previous = self.__values[object_id]
+            if previous == value:
+                self.__entries[previous][object_id] = obj
+                return
+            self.discard(object_id)
+        try:
+            self.__entries.setdefault(value, {})[object_id] = obj
+        except TypeError:
+            return  # unhashable values are not indexed
+        self.__values[object_id] = value
+
+    def discard(self, object_id):
+        """
+        Remove an object from the index, if it is indexed.
+
+        Args:
+            object_id (str): The id of the object.
+        """
+
+        if object_id not in self.__values:
+            return
+        value = self.__values.pop(object_id)
+        entry = self.__entries[value]
+        del entry[object_id]
+        if not entry:
+            del self.__entries[value]
+
+    def lookup(self, value):
+        """
+        Get the objects whose attribute equals a value.
+
+        Args:
+            value: The value to look up.
+
+        Returns:
+            dict: A dictionary of ids to objects. It must not be changed.
+        """
+
+        try:
+            return self.__entries.get(value, {})
+        except TypeError:
+            return {}
@@ -0,0 +1,503 @@
+#!/usr/bin/python3
+"""BinaryStorage class module"""
+import json
+import mmap
+import os
+import struct
+import threading
+from models.engine.file_storage import FileStorage
+from models.engine.mapped_record import MappedRecord
+from models.engine.object_stream import ObjectStream
+
+
+class BinaryStorage(FileStorage):
+    """
+    A storage engine keeping the objects in a memory-mapped binary file,
+    so that one object can be read without reading the others.
+
+    The file holds a fixed header, the length-prefixed JSON encoding of
+    each object, then an index sorted by key. The index starts with a
+    table of the fixed-width positions of its entries, so that a key is
+    found by binary search. Each entry holds the length-prefixed key and
+    the position and length of the encoded object.
+
+    Attributes:
+        __file_path (str): The path to the binary file.
+        __map (mmap): The mapped file, or None if there is none.
+        __index_offset (int): The position of the index in the map.
+        __size (int): The number of objects in the map.
+        __attached (bool): Whether the stored objects hold every object
+            of the map, or only those returned by get().
+        __attach_lock (Lock): Held while the map is attached.
+    """
+
+    __file_path = "file.bin"
+    __map = None
+    __index_offset = 0
+    __size = 0
+    __attached = True
+    __attach_lock = threading.Lock()
+
+    __magic = b"HBNB"
+    __version = 1
+    __header = struct.Struct(">4sHHQQ")
+    __slot = struct.Struct(">Q")
+    __key_length = struct.Struct(">H")
+    __location = struct.Struct(">QI")
+    __record_length = struct.Struct(">I")
+
+    def journal(self, enabled=True, max_bytes=None, max_records=None):
+        """
+        Refuse the append-only log mode, which the binary file does not
+        support.
+
+        Args:
+            enabled (bool): True to append to the log on save.
+            max_bytes (int): Log size that triggers a compaction.
+            max_records (int): Log length that triggers a compaction.
+
+        Raises:
+            ValueError: If enabled is True.
+        """
+
+        if enabled:
+            raise ValueError("BinaryStorage has no log mode")
+
+    def share(self, enabled=True):
+        """
+        Refuse the multi-process mode, which the binary file does not
+        support.
+
+        Args:
+            enabled (bool): True to lock and merge on save.
+
+        Raises:
+            ValueError: If enabled is True.
+        """
+
+        if enabled:
+            raise ValueError("BinaryStorage has no multi-process mode")
+
+    def reload(self):
+        """
+        Map the binary file, if it exists, without reading any object.
+        """
+
+        BinaryStorage.__map = None
+        BinaryStorage.__size = 0
+        BinaryStorage.__attached = True
+        self.load({})
+        if os.path.isfile(self.__file_path):
+            BinaryStorage.__map, BinaryStorage.__size, \
+                BinaryStorage.__index_offset = self.__open(self.__file_path)
+            BinaryStorage.__attached = False
+
+    @classmethod
+    def __open(cls, path):
+        """
+        Map a binary file and read its header.
+
+        Args:
+            path (str): The path to the binary file.
+
+        Returns:
+            tuple: The map, the number of objects and the position of
+            the index.
+
+        Raises:
+            ValueError: If the file is not a binary storage file.
+        """
+
+        with open(path, "rb") as file:
+            header = file.read(cls.__header.size)
+            if len(header) < cls.__header.size:
+                raise ValueError("{} is not a binary storage file".format(
+                    path))
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, size, index_offset = cls.__header.unpack(header)
+        if magic != cls.__magic or version != cls.__version:
+            raise ValueError("{} is not a binary storage file".format(path))
+        return mapped, size, index_offset
+
+    @classmethod
+    def __entry_at(cls, mapped, index_offset, position):
+        """
+        Read an entry of the index.
+
+        Args:
+            mapped (mmap): The mapped file.
+            index_offset (int): The position of the index in the map.
+            position (int): The position of the entry in the index.
+
+        Returns:
+            tuple: The key, the offset and the length of the object.
+        """
+
+        entry = cls.__slot.unpack_from(
+            mapped, index_offset + position * cls.__slot.size)[0]
+        key_length = cls.__key_length.unpack_from(mapped, entry)[0]
+        entry += cls.__key_length.size
+        key = mapped[entry:entry + key_length].decode("utf-8")
+        offset, length = cls.__location.unpack_from(mapped,
+                                                    entry + key_length)
+        return key, offset, length
+
+    def __lookup(self, key):
+        """
+        Find a key in the index by binary search.
+
+        Args:
+            key (str): The key to find.
+
+        Returns:
+            tuple: The offset and the length of the object, or None if
+            the key is not in the map.
+        """
+
+        low, high = 0, self.__size
+        while low < high:
+            middle = (low + high) // 2
+            middle_key, offset, length = self.__entry_at(
+                self.__map, self.__index_offset, middle)
+            if middle_key < key:
+                low = middle + 1
+            elif middle_key > key:
+                high = middle
+            else:
+                return offset, length
+        return None
+
+    def __attach(self):
+        """
+        Store every object of the map as a record that is decoded the
+        first time it is read, keeping the objects returned by get().
+        """
+
+        if self.__attached:
+            return
+        with self.__attach_lock:
+            if self.__attached:
+                return
+            classes = self.classes()
+            looked_up = super().all()
+            objects = {}
+            for position in range(self.__size):
+                key, offset, length = self.__entry_at(
+                    self.__map, self.__index_offset, position)
+                if key in looked_up:
+                    objects[key] = looked_up[key]
+                else:
+                    objects[key] = MappedRecord(
+                        classes[key.partition(".")[0]], self.__map, offset,
+                        length)
+            self.load(objects)
+            BinaryStorage.__attached = True
+
+    def get(self, cls, id):
+        """
+        Get one stored object, decoding only that object of the map.
+
+        Args:
+            cls (type or str): The class, or class name, of the object.
+            id (str): The id of the object.
+
+        Returns:
+            BaseModel: The object, or None if it is not stored.
+        """
+
+        obj = super().get(cls, id)
+        if obj is not None or self.__attached:
+            return obj
+        class_name = cls if isinstance(cls, str) else cls.__name__
+        classes = self.classes()
+        if class_name not in classes:
+            return None
+        location = self.__lookup("{}.{}".format(class_name, id))
+        if location is None:
+            return None
+        obj = MappedRecord(classes[class_name], self.__map,
+                           *location).materialize()
+        self.keep(obj)
+        return obj
+
+    def new(self, obj):
+        """
+        Add a new object to the storage, or mark it as changed.
+
+        Args:
+            obj: The object to be added.
+        """
+
+        self.__attach()
+        super().new(obj)
+
+    def delete(self, obj=None):
+        """
+        Remove an object from the storage, if it is stored.
+
+        Args:
+            obj: The object to be removed.
+        """
+
+        self.__attach()
+        super().delete(obj)
+
+    def all(self, cls=None):
+        """
+        Get all stored objects, or only those of one class.
+
+        Args:
+            cls (type or str): The class, or class name, to select.
+
+        Returns:
+            dict: A dictionary of objects.
+        """
+
+        self.__attach()
+        return super().all(cls)
+
+    def stream(self, cls=None, offset=0, limit=None, after=None):
+        """
+        Iterate over the stored objects, or only those of one class, in
+        storage order, without copying them.
+
+        Args:
+            cls (type or str): The class, or class name, to select.
+            offset (int): The number of objects to skip.
+            limit (int): The largest number of objects to return, or
+                None for all of them.
+            after (str): The key of an object to start after.
+
+        Returns:
+            generator: The objects.
+        """
+
+        self.__attach()
+        return super().stream(cls, offset, limit, after)
+
+    def select(self, query):
+        """
+        Get the objects matching a query.
+
+        Args:
+            query (Query): The query.
+
+        Returns:
+            list: The matching objects, in order and up to the limit.
+        """
+
+        self.__attach()
+        return super().select(query)
+
+    def explain(self, query):
+        """
+        Describe how select() runs a query.
+
+        Args:
+            query (Query): The query.
+
+        Returns:
+            list: A line for each step of the plan.
+        """
+
+        self.__attach()
+        return super().explain(query)
+
+    def find(self, cls, **equals):
+        """
+        Get the objects of one class whose attributes equal the given
+        values.
+
+        Args:
+            cls (type or str): The class, or class name, to select.
+            **equals: The attribute names and the values to match.
+
+        Returns:
+            dict: A dictionary of the matching objects.
+        """
+
+        self.__attach()
+        return super().find(cls, **equals)
+
+    def near(self, latitude, longitude, km, limit=None, cls="Place"):
+        """
+        Get the objects of one class within a distance of a point,
+        nearest first.
+
+        Args:
+            latitude (float): The latitude of the point, in degrees.
+            longitude (float): The longitude of the point, in degrees.
+            km (float): The largest distance, in kilometers.
+            limit (int): The largest number of objects to return, or
+                None for all of them.
+            cls (type or str): The class, or class name, to select.
+
+        Returns:
+            list: The (distance, object) tuple of each object.
+        """
+
+        self.__attach()
+        return super().near(latitude, longitude, km, limit, cls)
+
+    def search(self, cls, text, limit=None):
+        """
+        Get the objects of one class whose text attributes hold the
+        words or phrases of a search, best match first.
+
+        Args:
+            cls (type or str): The class, or class name, to select.
+            text (str): The search.
+            limit (int): The largest number of objects to return, or
+                None for all of them.
+
+        Returns:
+            list: The (score, object) tuple of each object.
+        """
+
+        self.__attach()
+        return super().search(cls, text, limit)
+
+    def having(self, cls, all_of=(), any_of=(), none_of=(),
+               attribute="amenity_ids"):
+        """
+        Get the objects of one class whose list attribute holds every
+        value of all_of, one of any_of and none of none_of.
+
+        Args:
+            cls (type or str): The class, or class name, to select.
+            all_of (iterable): The values that must all be held.
+            any_of (iterable): The values one of which must be held.
+            none_of (iterable): The values that must not be held.
+            attribute (str): The name of the list attribute.
+
+        Returns:
+            dict: A dictionary of the matching objects.
+        """
+
+        self.__attach()
+        return super().having(cls, all_of, any_of, none_of, attribute)
+
+    def column_store(self, cls):
+        """
+        Get the column store of a class, building it the first time it
+        is needed.
+
+        Args:
+            cls (type or str): The class, or class name.
+
+        Returns:
+            ColumnStore: The column store of the numeric attributes of
+            the class.
+        """
+
+        self.__attach()
+        return super().column_store(cls)
+
+    def count(self, cls=None):
+        """
+        Count the stored objects, or only those of one class.
+
+        Args:
+            cls (type or str): The class, or class name, to count.
+
+        Returns:
+            int: The number of objects.
+        """
+
+        self.__attach()
+        return super().count(cls)
+
+    def save(self):
+        """
+        Save the stored objects to the binary file.
+        """
+
+        self.__attach()
+        super().save()
+
+    def write(self, entries):
+        """
+        Write a snapshot of the stored objects to the binary file.
+
+        Args:
+            entries (iterable): The key, the JSON encoding of the key and
+                the JSON encoding of the object of each stored object.
+        """
+
+        self.__write(self.__file_path,
+                     ((key, value_json) for key, _, value_json in entries))
+
+    @classmethod
+    def __write(cls, path, entries):
+        """
+        Write a binary file, then replace the previous one with it.
+
+        Args:
+            path (str): The path to the binary file.
+            entries (iterable): The key and the JSON encoding of each
+                object.
+        """
+
+        temporary_path = path + ".tmp"
+        locations = []
+        with open(temporary_path, "wb") as file:
+            file.write(bytes(cls.__header.size))
+            for key, value_json in entries:
+                record = value_json.encode("utf-8")
+                file.write(cls.__record_length.pack(len(record)))
+                locations.append((key, file.tell(), len(record)))
+                file.write(record)
+            locations.sort()
+            index_offset = file.tell()
+            entry = index_offset + cls.__slot.size * len(locations)
+            for key, offset, length in locations:
+                file.write(cls.__slot.pack(entry))
+                entry += cls.__key_length.size + len(key.encode("utf-8")) + \
+                    cls.__location.size
+            for key, offset, length in locations:
+                encoded_key = key.encode("utf-8")
+                file.write(cls.__key_length.pack(len(encoded_key)))
+                file.write(encoded_key)
+                file.write(cls.__location.pack(offset, length))
+            file.seek(0)
+            file.write(cls.__header.pack(cls.__magic, cls.__version, 0,
+                                         len(locations), index_offset))
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def from_json(cls, json_path, binary_path):
+        """
+        Convert a JSON storage file to a binary storage file, reading
+        one object at a time.
+
+        Args:
+            json_path (str): The path to the JSON file.
+            binary_path (str): The path to the binary file.
+        """
+
+        with open(json_path, "r", encoding="utf-8") as file:
+            cls.__write(binary_path, ((key, json.dumps(value))
+                                      for key, value in ObjectStream(file)))
+
+    @classmethod
+    def to_json(cls, binary_path, json_path):
+        """
+        Convert a binary storage file to a JSON storage file, in key
+        order.
+
+        Args:
+            binary_path (str): The path to the binary file.
+            json_path (str): The path to the JSON file.
+        """
+
+        mapped, size, index_offset = cls.__open(binary_path)
+        with open(json_path, "w", encoding="utf-8") as file:
+            file.write("{")
+            for position in range(size):
+                key, offset, length = cls.__entry_at(mapped, index_offset,
+                                                     position)
+                file.write("{}{}: {}".format(
+                    ", " if position else "", json.dumps(key),
+                    mapped[offset:offset + length].decode("utf-8")))
+            file.write("}")
+        mapped.close()
@@ -0,0 +1,257 @@
+#!/usr/bin/python3
+"""BitmapIndex class module"""
+from models.engine.lazy_record import LazyRecord
+
+
+class BitmapIndex:
+    """
+    A bitmap index of the stored objects of one class by the values of
+    one of their list attributes, such as the amenity ids of Places.
+
+    Each object is numbered by a dense ordinal, and each value has a
+    bitset with the bits of the ordinals of the objects whose list holds
+    it. The ordinals of removed objects are given to the next ones, so
+    that the bitsets stay as short as the number of objects. A bitset is
+    kept in a bytearray, which changes in place, and read as an int for
+    the AND, OR and NOT of a match, cached until it changes again.
+
+    Attributes:
+        fields (tuple): The names of the attributes the index reads.
+        __ordinal_of (dict): The ordinal of each object id.
+        __ids (list): The object id of each ordinal, or None once the
+            object is removed.
+        __free (list): The ordinals of the removed objects.
+        __values (dict): The indexed values of each object id.
+        __bits (dict): The bitset of each value, as a bytearray.
+        __counts (dict): The number of objects holding each value.
+        __live (bytearray): The bitset of the ordinals in use.
+        __numbers (dict): The bitsets read as ints, by value, with None
+            for the live bitset.
+    """
+
+    marks = bytes([0]) + bytes([1]) * 255
+    bits = tuple(tuple(bit for bit in range(8) if byte >> bit & 1)
+                 for byte in range(256))
+
+    def __init__(self, attribute):
+        """
+        Initialize an empty index.
+
+        Args:
+            attribute (str): The name of the indexed list attribute.
+        """
+
+        self.fields = (attribute,)
+        self.__ordinal_of = {}
+        self.__ids = []
+        self.__free = []
+        self.__values = {}
+        self.__bits = {}
+        self.__counts = {}
+        self.__live = bytearray()
+        self.__numbers = {}
+
+    def __len__(self):
+        """
+        Get the number of indexed objects.
+
+        Returns:
+            int: The number of objects in the index.
+        """
+
+        return len(self.__ordinal_of)
+
+    @staticmethod
+    def __set(bits, ordinal, on):
+        """
+        Set or clear the bit of an ordinal in a bitset, growing it when
+        needed.
+
+        Args:
+            bits (bytearray): The bitset.
+            ordinal (int): The ordinal.
+            on (bool): Whether to set the bit rather than clear it.
+        """
+
+        byte, bit = divmod(ordinal, 8)
+        if byte >= len(bits):
+            if not on:
+                return
+            bits.extend(bytes(byte + 1 - len(bits)))
+        if on:
+            bits[byte] |= 1 << bit
+        else:
+            bits[byte] &= ~(1 << bit)
+
+    def __flip(self, value, ordinal, on):
+        """
+        Set or clear the bit of an ordinal in the bitset of a value,
+        dropping the bitsets that become empty.
+
+        Args:
+            value: The value, or None for the live bitset.
+            ordinal (int): The ordinal.
+            on (bool): Whether to set the bit rather than clear it.
+        """
+
+        self.__numbers.pop(value, None)
+        if value is None:
+            self.__set(self.__live, ordinal, on)
+            return
+        if on:
+            bits = self.__bits.get(value)
+            if bits is None:
+                bits = self.__bits[value] = bytearray()
+            self.__set(bits, ordinal, True)
+            self.__counts[value] = self.__counts.get(value, 0) + 1
+        elif self.__counts[value] > 1:
+            self.__set(self.__bits[value], ordinal, False)
+            self.__counts[value] -= 1
+        else:
+            del self.__bits[value]
+            del self.__counts[value]
+
+    def put(self, object_id, obj):
+        """
+        Add an object to the index, or update the bits of the values
+        its list gained or lost.
+
+        Args:
+            object_id (str): The id of the object.
+            obj: The object.
+        """
+
+        # read the values set on the object rather than the attribute,
+        # as the class default of a list may set a new list on it
+        values = obj.values if isinstance(obj, LazyRecord) else vars(obj)
+        items = values.get(self.fields[0])
+        values = set()
+        if isinstance(items, (list, tuple, set, frozenset)):
+            for value in items:
+                try:
+                    if value is not None:
+                        values.add(value)
+                except TypeError:
+                    continue  # unhashable values are not indexed
+        ordinal = self.__ordinal_of.get(object_id)
+        if ordinal is None:
+            if self.__free:
+                ordinal = self.__free.pop()
+                self.__ids[ordinal] = object_id
+            else:
+                ordinal = len(self.__ids)
+                self.__ids.append(object_id)
+            self.__ordinal_of[object_id] = ordinal
+            self.__flip(None, ordinal, True)
+            previous = set()
+        else:
+            previous = self.__values[object_id]
+        for value in previous - values:
+            self.__flip(value, ordinal, False)
+        for value in values - previous:
+            self.__flip(value, ordinal, True)
+        self.__values[object_id] = values
+
+    def discard(self, object_id):
+        """
+        Remove an object from the index, if it is indexed.
+
+        Args:
+            object_id (str): The id of the object.
+        """
+
+        ordinal = self.__ordinal_of.pop(object_id, None)
+        if ordinal is None:
+            return
+        for value in self.__values.pop(object_id):
+            self.__flip(value, ordinal, False)
+        self.__flip(None, ordinal, False)
+        self.__ids[ordinal] = None
+        self.__free.append(ordinal)
+
+    def __number(self, value):
+        """
+        Get the bitset of a value as an int, 0 for values no object
+        holds.
+
+        Args:
+            value: The value, or None for the live bitset.
+
+        Returns:
+            int: The bitset, bit n being the ordinal n.
+        """
+
+        number = self.__numbers.get(value)
+        if number is None:
+            bits = self.__live if value is None else self.__bits.get(value)
+            if bits is None:
+                return 0
+            number = self.__numbers[value] = int.from_bytes(bits, "little")
+        return number
+
+    def match(self, all_of=(), any_of=(), none_of=()):
+        """
+        Get the objects whose list holds every value of all_of, at least
+        one value of any_of, and no value of none_of.
+
+        An empty all_of or none_of puts no condition, and so does an
+        empty any_of.
+
+        Args:
+            all_of (iterable): The values that must all be held.
+            any_of (iterable): The values one of which must be held.
+            none_of (iterable): The values that must not be held.
+
+        Returns:
+            list: The ids of the matching objects, in ordinal order.
+        """
+
+        number = self.__number(None)
+        for value in all_of:
+            if not number:
+                break
+            number &= self.__number(value)
+        any_of = tuple(any_of)
+        if any_of and number:
+            union = 0
+            for value in any_of:
+                union |= self.__number(value)
+            number &= union
+        for value in none_of:
+            if not number:
+                break
+            number &= ~self.__number(value)
+        return [self.__ids[ordinal] for ordinal in self.ordinals(number)]
+
+    @classmethod
+    def ordinals(cls, number):
+        """
+        Get the ordinals of the set bits of a bitset.
+
+        The bytes that hold set bits are found with a C-speed scan, so
+        that a bitset with few bits costs little more than its bytes.
+        When many bytes hold set bits, its binary digits are scanned
+        instead.
+
+        Args:
+            number (int): The bitset, bit n being the ordinal n.
+
+        Returns:
+            list: The ordinals, in increasing order.
+        """
+
+        found = []
+        data = number.to_bytes((number.bit_length() + 7) // 8, "little")
+        marks = data.translate(cls.marks)
+        if marks.count(1) * 8 > len(marks):
+            digits = bin(number)[:1:-1]
+            ordinal = digits.find("1")
+            while ordinal >= 0:
+                found.append(ordinal)
+                ordinal = digits.find("1", ordinal + 1)
+            return found
+        byte = marks.find(1)
+        while byte >= 0:
+            found.extend(byte * 8 + bit for bit in cls.bits[data[byte]])
+            byte = marks.find(1, byte + 1)
+        return found
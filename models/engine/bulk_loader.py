@@ -0,0 +1,248 @@
+#!/usr/bin/python3
+"""BulkLoader class module"""
+import collections
+import concurrent.futures
+import csv
+import datetime
+import json
+import os
+import uuid
+
+
+class BulkLoader:
+    """
+    A streaming reader of the rows of an NDJSON or CSV file, which turns
+    each row into the attribute dictionary of an instance of one class:
+    the declared attributes are converted to their type, and the id and
+    timestamps are filled in when missing.
+
+    Rows are read in chunks. Chunks of large files are converted across
+    a process pool, a few chunks ahead of the records handed out, so
+    that the file is never held in memory at once.
+
+    Attributes:
+        __class_name (str): The name of the class of the instances.
+        __types (dict): The type of each declared attribute.
+        __format (str): "ndjson" or "csv".
+        __chunk_size (int): The number of rows of a chunk.
+    """
+
+    __pool_bytes = 1 << 20
+
+    def __init__(self, class_name, types, format, chunk_size=1000):
+        """
+        Initialize a reader.
+
+        Args:
+            class_name (str): The name of the class of the instances.
+            types (dict): The type of each declared attribute.
+            format (str): "ndjson" or "csv".
+            chunk_size (int): The number of rows of a chunk.
+
+        Raises:
+            ValueError: If the format is unknown.
+        """
+
+        if format not in ("ndjson", "csv"):
+            raise ValueError("Unknown format {!r}".format(format))
+        self.__class_name = class_name
+        self.__types = types
+        self.__format = format
+        self.__chunk_size = chunk_size
+
+    @staticmethod
+    def format_of(path):
+        """
+        Guess the format of a file from its extension.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            str: "csv" for a .csv file, "ndjson" otherwise.
+        """
+
+        return "csv" if path.lower().endswith(".csv") else "ndjson"
+
+    def records(self, path, workers=None):
+        """
+        Read the records of a file.
+
+        Args:
+            path (str): The path of the file.
+            workers (int): The number of processes converting the rows,
+                by default one per CPU for files of 1 MiB or more. 0 or
+                1 converts them in this process.
+
+        Yields:
+            dict: The record of each row, in file order.
+
+        Raises:
+            ValueError: If a row is malformed or a value has the wrong
+                type, with the line number of the row.
+        """
+
+        if workers is None:
+            workers = os.cpu_count() if os.path.getsize(
+                path) >= self.__pool_bytes else 0
+        with open(path, "r", encoding="utf-8", newline="") as file:
+            chunks = self.__chunks(file)
+            if workers <= 1:
+                for chunk in chunks:
+                    yield from self(chunk)
+                return
+            with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+                pending = collections.deque()
+                for chunk in chunks:
+                    pending.append(pool.submit(self, chunk))
+                    if len(pending) >= 2 * workers:
+                        yield from pending.popleft().result()
+                while pending:
+                    yield from pending.popleft().result()
+
+    def __chunks(self, file):
+        """
+        Split a file into chunks of rows.
+
+        Args:
+            file: The text file.
+
+        Yields:
+            list: The line number and the row of each row of a chunk, a
+            row being a line in NDJSON and a dictionary of column names
+            to cells in CSV.
+        """
+
+        chunk = []
+        for line_number, row in self.__rows(file):
+            chunk.append((line_number, row))
+            if len(chunk) >= self.__chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def __rows(self, file):
+        """
+        Read the rows of a file.
+
+        Args:
+            file: The text file.
+
+        Yields:
+            tuple: The line number where each row starts, and the row.
+        """
+
+        if self.__format != "csv":
+            yield from enumerate(file, 1)
+            return
+        reader = csv.DictReader(file)
+        line_number = reader.line_num + 2
+        for row in reader:
+            yield line_number, row
+            line_number = reader.line_num + 1
+
+    def __call__(self, chunk):
+        """
+        Convert a chunk of rows into records.
+
+        Args:
+            chunk (list): The line number and the row of each row.
+
+        Returns:
+            list: The record of each row, skipping blank NDJSON lines.
+
+        Raises:
+            ValueError: If a row is malformed or a value has the wrong
+                type, with the line number of the row.
+        """
+
+        records = []
+        for line_number, row in chunk:
+            try:
+                if self.__format == "ndjson":
+                    if not row.strip():
+                        continue
+                    row = json.loads(row)
+                    if not isinstance(row, dict):
+                        raise ValueError("Expecting an object")
+                records.append(self.__record(row))
+            except ValueError as error:
+                raise ValueError("Line {}: {}".format(line_number, error))
+        return records
+
+    def __record(self, row):
+        """
+        Convert a row into a record.
+
+        Args:
+            row (dict): The attribute names and values of the row.
+
+        Returns:
+            dict: The record, the attribute dictionary of the instance.
+
+        Raises:
+            ValueError: If a value has the wrong type, or the row is of
+                another class.
+        """
+
+        record = {}
+        for name, value in row.items():
+            if name is None:
+                raise ValueError("More cells than columns")
+            if name == "__class__":
+                if value != self.__class_name:
+                    raise ValueError("Expecting class {}, got {!r}".format(
+                        self.__class_name, value))
+                continue
+            if value is None or (value == "" and self.__format == "csv"):
+                continue
+            expected = self.__types.get(name)
+            if expected is not None:
+                value = self.__convert(name, value, expected)
+            record[name] = value
+        now = datetime.datetime.today()
+        record.setdefault("id", str(uuid.uuid4()))
+        record.setdefault("created_at", now)
+        record.setdefault("updated_at", record["created_at"])
+        record["__class__"] = self.__class_name
+        return record
+
+    def __convert(self, name, value, expected):
+        """
+        Convert the value of a declared attribute to its type.
+
+        Args:
+            name (str): The name of the attribute.
+            value: The value read from the row.
+            expected (type): The type of the attribute.
+
+        Returns:
+            The converted value.
+
+        Raises:
+            ValueError: If the value cannot be converted.
+        """
+
+        try:
+            if expected is datetime.datetime:
+                # the format of to_dict(), checked before the faster
+                # fromisoformat() parses it
+                if len(value) != 26 or value[19] != ".":
+                    raise ValueError
+                return datetime.datetime.fromisoformat(value)
+            if expected is list:
+                if isinstance(value, str):
+                    value = json.loads(value) if value.startswith("[") \
+                        else value.split(",")
+                if not isinstance(value, list):
+                    raise TypeError
+                return value
+            if expected is int and isinstance(value, float) or \
+                    expected is str and not isinstance(value, str) or \
+                    isinstance(value, (bool, list, dict)):
+                raise TypeError
+            return expected(value)
+        except (TypeError, ValueError):
+            raise ValueError("{} must be of type {}, got {!r}".format(
+                name, expected.__name__, value))
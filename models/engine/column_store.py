@@ -0,0 +1,232 @@
+#!/usr/bin/python3
+"""ColumnStore class module"""
+import array
+import math
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class ColumnStore:
+    """
+    A columnar mirror of the numeric attributes of the stored objects of
+    one class, so that range filters and aggregates run over arrays
+    instead of over the objects.
+
+    Each attribute is kept in an array of floats, with NaN where an
+    object has no numeric value. The rows are packed: removing an object
+    moves the last row in its place. The arrays are NumPy arrays when
+    NumPy is installed, and the filters then run as vectorized
+    operations; otherwise they are arrays of the array module, read by
+    plain loops.
+
+    Attributes:
+        fields (tuple): The names of the attributes the store reads.
+        __ids (list): The object id of each row.
+        __rows (dict): The row of each object id.
+        __columns (dict): The array of each attribute. With NumPy the
+            arrays have spare capacity past the last row.
+        __capacity (int): The number of rows the NumPy arrays can hold.
+    """
+
+    functions = ("count", "sum", "mean", "min", "max")
+
+    def __init__(self, fields):
+        """
+        Initialize an empty store.
+
+        Args:
+            fields (iterable): The names of the numeric attributes.
+        """
+
+        self.fields = tuple(fields)
+        self.__ids = []
+        self.__rows = {}
+        self.__capacity = 16
+        if numpy is None:
+            self.__columns = {field: array.array("d")
+                              for field in self.fields}
+        else:
+            self.__columns = {field: numpy.empty(self.__capacity)
+                              for field in self.fields}
+
+    def __len__(self):
+        """
+        Get the number of rows.
+
+        Returns:
+            int: The number of objects in the store.
+        """
+
+        return len(self.__ids)
+
+    @staticmethod
+    def __number(value):
+        """
+        Get the float value of an attribute.
+
+        Args:
+            value: The value of the attribute.
+
+        Returns:
+            float: The value, or NaN if it is not a number.
+        """
+
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return math.nan
+        return float(value)
+
+    def put(self, object_id, obj):
+        """
+        Add an object to the store, or update its row.
+
+        Args:
+            object_id (str): The id of the object.
+            obj: The object.
+        """
+
+        row = self.__rows.get(object_id)
+        if row is None:
+            row = len(self.__ids)
+            self.__ids.append(object_id)
+            self.__rows[object_id] = row
+            if numpy is None:
+                for column in self.__columns.values():
+                    column.append(math.nan)
+            elif row == self.__capacity:
+                self.__capacity *= 2
+                for field, column in self.__columns.items():
+                    self.__columns[field] = numpy.resize(column,
+                                                         self.__capacity)
+        for field, column in self.__columns.items():
+            column[row] = self.__number(getattr(obj, field, None))
+
+    def discard(self, object_id):
+        """
+        Remove an object from the store, if it is stored.
+
+        Args:
+            object_id (str): The id of the object.
+        """
+
+        row = self.__rows.pop(object_id, None)
+        if row is None:
+            return
+        last = len(self.__ids) - 1
+        last_id = self.__ids.pop()
+        if row != last:
+            self.__ids[row] = last_id
+            self.__rows[last_id] = row
+            for column in self.__columns.values():
+                column[row] = column[last]
+        if numpy is None:
+            for column in self.__columns.values():
+                column.pop()
+
+    def __mask(self, bounds):
+        """
+        Get the rows whose values are within some bounds.
+
+        Args:
+            bounds (dict): A dictionary of attribute names to (low, high)
+                tuples of inclusive bounds, None meaning unbounded.
+
+        Returns:
+            The boolean NumPy array of the matching rows, or the list of
+            their positions without NumPy.
+
+        Raises:
+            KeyError: If an attribute is not in the store.
+        """
+
+        size = len(self.__ids)
+        if numpy is not None:
+            mask = numpy.ones(size, dtype=bool)
+            for field, (low, high) in bounds.items():
+                column = self.__columns[field][:size]
+                if low is not None:
+                    mask &= column >= low
+                if high is not None:
+                    mask &= column <= high
+            return mask
+        rows = None
+        for field, (low, high) in bounds.items():
+            low = -math.inf if low is None else float(low)
+            high = math.inf if high is None else float(high)
+            column = self.__columns[field]
+            if rows is None:
+                rows = [row for row, value in enumerate(column)
+                        if low <= value <= high]
+            else:
+                rows = [row for row in rows if low <= column[row] <= high]
+        return range(size) if rows is None else rows
+
+    def select(self, **bounds):
+        """
+        Get the ids of the objects whose values are within some bounds.
+
+        Objects without a numeric value for a bounded attribute never
+        match.
+
+        Args:
+            **bounds: The attribute names and (low, high) tuples of
+                inclusive bounds, None meaning unbounded.
+
+        Returns:
+            list: The ids of the matching objects.
+        """
+
+        mask = self.__mask(bounds)
+        if numpy is not None:
+            mask = numpy.flatnonzero(mask)
+        return [self.__ids[row] for row in mask]
+
+    def aggregate(self, field, function, **bounds):
+        """
+        Compute an aggregate of one attribute over the objects whose
+        values are within some bounds, ignoring the missing values.
+
+        Args:
+            field (str): The name of the aggregated attribute.
+            function (str): One of "count", "sum", "mean", "min" or
+                "max".
+            **bounds: The attribute names and (low, high) tuples of
+                inclusive bounds, None meaning unbounded.
+
+        Returns:
+            The aggregate: an int for "count", a float otherwise, or None
+            for "mean", "min" and "max" of no value.
+
+        Raises:
+            ValueError: If the function is unknown.
+        """
+
+        if function not in self.functions:
+            raise ValueError("Unknown aggregate: {}".format(function))
+        mask = self.__mask(bounds)
+        column = self.__columns[field]
+        if numpy is not None:
+            values = column[:len(self.__ids)][mask]
+            values = values[~numpy.isnan(values)]
+            if function == "count":
+                return int(values.size)
+            if function == "sum":
+                return float(values.sum())
+            if not values.size:
+                return None
+            return float(getattr(numpy, function)(values))
+        if isinstance(mask, range):
+            values = [value for value in column if value == value]
+        else:
+            values = [column[row] for row in mask
+                      if column[row] == column[row]]
+        if function == "count":
+            return len(values)
+        if function == "sum":
+            return math.fsum(values)
+        if not values:
+            return None
+        if function == "mean":
+            return math.fsum(values) / len(values)
+        return min(values) if function == "min" else max(values)
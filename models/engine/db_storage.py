@@ -0,0 +1,1124 @@
+#!/usr/bin/python3
+"""DBStorage class module"""
+import contextlib
+import datetime
+import json
+import sqlite3
+from models.engine.aggregate import Aggregate
+from models.engine.bulk_loader import BulkLoader
+from models.engine.file_storage import FileStorage
+from models.engine.geo_index import GeoIndex
+from models.engine.query import Query
+from models.engine.text_index import TextIndex
+from models.engine.undo_log import UndoLog
+
+
+class DBStorage:
+    """
+    A storage engine keeping the objects in a SQLite database, with one
+    table per class.
+
+    Each attribute of FileStorage.attributes() gets its own column, the
+    attributes of FileStorage.indexes() get an index, and any other
+    attribute is kept as JSON in an "extra" column.
+
+    Attributes:
+        __path (str): The path to the database file.
+        __connection (Connection): The connection to the database.
+        __objects (dict): The instances read or added, by key, so that
+            an object is always the same instance.
+        __dirty (set): Keys added or changed since the last flush.
+        __deleted (set): Keys deleted since the last flush.
+        __batch_depth (int): The number of nested batches in progress.
+        __undo (UndoLog): The undo log of the batch in progress, or None.
+    """
+
+    __types = {str: "TEXT", int: "INTEGER", float: "REAL",
+               datetime.datetime: "TEXT", list: "TEXT"}
+    __aggregates = {"count": "COUNT", "sum": "TOTAL", "avg": "AVG",
+                    "min": "MIN", "max": "MAX"}
+    __page_size = 1000
+
+    def __init__(self, path="file.db"):
+        """
+        Initialize the storage without opening the database.
+
+        Args:
+            path (str): The path to the database file.
+        """
+
+        self.__path = path
+        self.__connection = None
+        self.__objects = {}
+        self.__dirty = set()
+        self.__deleted = set()
+        self.__batch_depth = 0
+        self.__undo = None
+
+    def attributes(self):
+        """
+        Get the dictionary of class names and their attribute definitions.
+
+        Returns:
+            dict: A dictionary mapping class names to their
+            attribute definitions.
+        """
+
+        return FileStorage().attributes()
+
+    def classes(self):
+        """
+        Get the dictionary of class names and their corresponding classes.
+
+        Returns:
+            dict: A dictionary mapping class names to their classes.
+        """
+
+        return FileStorage().classes()
+
+    def indexes(self):
+        """
+        Get the dictionary of class names and their indexed attributes.
+
+        Returns:
+            dict: A dictionary mapping class names to the names of the
+            attributes that have an index.
+        """
+
+        return FileStorage().indexes()
+
+    def locations(self):
+        """
+        Get the dictionary of class names and their coordinates.
+
+        Returns:
+            dict: A dictionary mapping class names to the names of their
+            latitude and longitude attributes.
+        """
+
+        return FileStorage().locations()
+
+    def texts(self):
+        """
+        Get the dictionary of class names and their text attributes.
+
+        Returns:
+            dict: A dictionary mapping class names to the names of the
+            attributes search() looks up through a full-text table.
+        """
+
+        return FileStorage().texts()
+
+    def memberships(self):
+        """
+        Get the dictionary of class names and their list attributes.
+
+        Returns:
+            dict: A dictionary mapping class names to the names of the
+            list attributes having() can filter.
+        """
+
+        return FileStorage().memberships()
+
+    def journal(self, enabled=True, max_bytes=None, max_records=None):
+        """
+        Refuse the append-only log mode, which the database does not
+        need.
+
+        Args:
+            enabled (bool): True to append to the log on save.
+            max_bytes (int): Log size that triggers a compaction.
+            max_records (int): Log length that triggers a compaction.
+
+        Raises:
+            ValueError: If enabled is True.
+        """
+
+        if enabled:
+            raise ValueError("DBStorage has no log mode")
+
+    def write_behind(self, enabled=True, quiet=None, max_delay=None):
+        """
+        Refuse the write-behind mode: a save only commits the pending
+        changes, which does not rewrite the database.
+
+        Args:
+            enabled (bool): True to defer the saves to a flusher.
+            quiet (float): Seconds without a save before writing.
+            max_delay (float): Most seconds a save is deferred.
+
+        Raises:
+            ValueError: If enabled is True.
+        """
+
+        if enabled:
+            raise ValueError("DBStorage has no write-behind mode")
+
+    def flush(self):
+        """
+        Do nothing, as no save is ever deferred past a batch.
+        """
+
+    def share(self, enabled=True):
+        """
+        Accept the multi-process mode, which the database always
+        supports: SQLite locks the database file itself, and refresh()
+        drops the instances other processes may have changed.
+
+        Args:
+            enabled (bool): True to lock and merge on save.
+        """
+
+    def refresh(self):
+        """
+        Drop the instances read that have no unsaved changes, so that
+        the next query builds them again from the rows other processes
+        committed. Nothing is dropped within a batch, whose changes may
+        already be written to the transaction.
+        """
+
+        if self.__batch_depth:
+            return
+        self.__objects = {key: obj for key, obj in self.__objects.items()
+                          if key in self.__dirty}
+
+    def lazy(self, enabled=True):
+        """
+        Accept the lazy loading mode, which the database always uses:
+        an instance is built the first time a query returns it.
+
+        Args:
+            enabled (bool): True to build the instances on first access.
+        """
+
+    def compact(self, wait=True):
+        """
+        Commit the pending changes and rebuild the database file to
+        reclaim the space of the deleted rows.
+
+        Args:
+            wait (bool): Ignored, the database is always compacted in
+                the calling thread.
+        """
+
+        self.save()
+        self.__connection.execute("VACUUM")
+
+    def __columns(self, class_name):
+        """
+        Get the columns of the table of a class, besides "extra".
+
+        Args:
+            class_name (str): The name of the class.
+
+        Returns:
+            dict: A dictionary of column names to attribute types.
+        """
+
+        attributes = self.attributes()
+        columns = dict(attributes["BaseModel"])
+        if class_name != "BaseModel":
+            columns.update(attributes[class_name])
+        return columns
+
+    def reload(self):
+        """
+        Open the database, creating the missing tables and indexes, and
+        forget the instances read so far.
+        """
+
+        self.close()
+        self.__connection = sqlite3.connect(self.__path,
+                                            check_same_thread=False)
+        # let the rows INSERT OR REPLACE deletes fire the delete triggers
+        self.__connection.execute("PRAGMA recursive_triggers = ON")
+        indexes = self.indexes()
+        locations = self.locations()
+        with self.__connection:
+            for class_name in self.classes():
+                columns = ", ".join(
+                    "{} {}{}".format(name, self.__types[kind],
+                                     " PRIMARY KEY" if name == "id" else "")
+                    for name, kind in self.__columns(class_name).items())
+                self.__connection.execute(
+                    "CREATE TABLE IF NOT EXISTS {} ({}, extra TEXT)".format(
+                        class_name, columns))
+                # near() narrows the rows down by latitude
+                for name in indexes.get(class_name, ()) + \
+                        locations.get(class_name, ())[:1]:
+                    self.__connection.execute(
+                        "CREATE INDEX IF NOT EXISTS {0}_{1} "
+                        "ON {0} ({1})".format(class_name, name))
+            for class_name, fields in self.texts().items():
+                self.__create_search(class_name, fields)
+
+    def __create_search(self, class_name, fields):
+        """
+        Create the full-text table of a class, if it is missing, with
+        the triggers keeping it in sync with the table of the class, and
+        fill it with the rows already stored.
+
+        Args:
+            class_name (str): The name of the class.
+            fields (tuple): The names of the text attributes.
+        """
+
+        table = "{}_search".format(class_name)
+        if self.__connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = ?",
+                (table,)).fetchone():
+            return
+        columns = ", ".join(fields)
+        values = ", ".join("new." + field for field in fields)
+        self.__connection.execute(
+            "CREATE VIRTUAL TABLE {} USING fts5({})".format(table, columns))
+        self.__connection.execute(
+            "CREATE TRIGGER {0}_insert AFTER INSERT ON {1} BEGIN "
+            "INSERT INTO {0} (rowid, {2}) VALUES (new.rowid, {3}); "
+            "END".format(table, class_name, columns, values))
+        self.__connection.execute(
+            "CREATE TRIGGER {0}_delete AFTER DELETE ON {1} BEGIN "
+            "DELETE FROM {0} WHERE rowid = old.rowid; END".format(
+                table, class_name))
+        self.__connection.execute(
+            "INSERT INTO {0} (rowid, {2}) SELECT rowid, {2} FROM {1}".format(
+                table, class_name, columns))
+
+    def close(self):
+        """
+        Close the database, dropping the changes not saved.
+        """
+
+        if self.__connection is not None:
+            self.__connection.close()
+            self.__connection = None
+        self.__objects = {}
+        self.__dirty = set()
+        self.__deleted = set()
+        self.__batch_depth = 0
+        self.__undo = None
+
+    def new(self, obj):
+        """
+        Add a new object to the storage, or mark it as changed.
+
+        Args:
+            obj: The object to be added.
+        """
+
+        key = "{}.{}".format(type(obj).__name__, obj.id)
+        if self.__undo is not None and self.__objects.get(key) is not obj:
+            self.__undo.entry(key, self.__objects.get(key))
+        self.__objects[key] = obj
+        self.__dirty.add(key)
+        self.__deleted.discard(key)
+
+    def changing(self, obj, name):
+        """
+        Record the value of an attribute of a stored object before it
+        changes, so that a rollback can restore it.
+
+        Nothing is recorded outside of a batch.
+
+        Args:
+            obj: The object about to change.
+            name (str): The name of the attribute about to change.
+        """
+
+        if self.__undo is None:
+            return
+        key = "{}.{}".format(type(obj).__name__, obj.__dict__.get("id"))
+        if self.__objects.get(key) is obj:
+            self.__undo.attribute(obj, name)
+
+    def touch(self, obj, name=None):
+        """
+        Mark a stored object as changed since the last save. Objects
+        that have no id yet are ignored.
+
+        Args:
+            obj: The object that changed.
+            name (str): The name of the changed attribute.
+        """
+
+        object_id = obj.__dict__.get("id")
+        if object_id is None:
+            return
+        key = "{}.{}".format(type(obj).__name__, object_id)
+        if self.__objects.get(key) is obj:
+            self.__dirty.add(key)
+
+    def delete(self, obj=None):
+        """
+        Remove an object from the storage.
+
+        Args:
+            obj: The object to be removed.
+        """
+
+        if obj is None or obj.__dict__.get("id") is None:
+            return
+        key = "{}.{}".format(type(obj).__name__, obj.id)
+        previous = self.__objects.pop(key, None)
+        if self.__undo is not None and previous is not None:
+            self.__undo.entry(key, previous)
+        self.__dirty.discard(key)
+        self.__deleted.add(key)
+
+    def __row(self, obj, columns):
+        """
+        Get the column values of an object.
+
+        Args:
+            obj: The object.
+            columns (dict): The columns of the table of its class.
+
+        Returns:
+            list: The value of each column, then of "extra".
+        """
+
+        values = obj.__dict__
+        row = []
+        for name, kind in columns.items():
+            value = values.get(name)
+            if isinstance(value, datetime.datetime):
+                value = value.isoformat()
+            elif kind is list and value is not None:
+                value = json.dumps(value)
+            row.append(value)
+        extra = {name: value for name, value in obj.to_dict().items()
+                 if name not in columns and name != "__class__"}
+        row.append(json.dumps(extra) if extra else None)
+        return row
+
+    def __flush(self):
+        """
+        Write the changes made since the last flush into the current
+        transaction, one statement per class.
+        """
+
+        by_class = {}
+        for key in self.__deleted:
+            class_name, _, object_id = key.partition(".")
+            by_class.setdefault(class_name, ([], []))[1].append(
+                (object_id,))
+        for key in self.__dirty:
+            obj = self.__objects[key]
+            by_class.setdefault(type(obj).__name__, ([], []))[0].append(obj)
+        for class_name, (changed, deleted) in by_class.items():
+            if deleted:
+                self.__connection.executemany(
+                    "DELETE FROM {} WHERE id = ?".format(class_name),
+                    deleted)
+            if changed:
+                columns = self.__columns(class_name)
+                self.__connection.executemany(
+                    "INSERT OR REPLACE INTO {} ({}, extra) "
+                    "VALUES ({}?)".format(class_name, ", ".join(columns),
+                                          "?, " * len(columns)),
+                    [self.__row(obj, columns) for obj in changed])
+        self.__dirty.clear()
+        self.__deleted.clear()
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Run a block as one batch: the saves within it are deferred to a
+        single commit at the end, and an exception rolls the batch back.
+
+        Yields:
+            DBStorage: The storage.
+        """
+
+        self.begin()
+        try:
+            yield self
+        except BaseException:
+            if self.in_batch():
+                self.rollback()
+            raise
+        self.commit()
+
+    def in_batch(self):
+        """
+        Tell whether a batch is in progress.
+
+        Returns:
+            bool: True if a batch is in progress.
+        """
+
+        return self.__batch_depth > 0
+
+    def begin(self):
+        """
+        Start a batch, or a nested batch within the one in progress.
+
+        The changes made before the batch are committed first. Until the
+        outermost batch is committed, save() does not commit.
+        """
+
+        if not self.__batch_depth:
+            self.save()
+            self.__undo = UndoLog()
+        self.__batch_depth += 1
+
+    def commit(self):
+        """
+        End the innermost batch, and commit the changes of the batch
+        once the outermost batch ends.
+
+        Raises:
+            RuntimeError: If no batch is in progress.
+        """
+
+        if not self.__batch_depth:
+            raise RuntimeError("No batch in progress")
+        self.__batch_depth -= 1
+        if not self.__batch_depth:
+            self.__undo = None
+            self.save()
+
+    def rollback(self):
+        """
+        End every batch in progress, rolling back the database
+        transaction and restoring the attributes and the instances it
+        changed. Changes made in place, such as appending to a list
+        attribute, are not restored.
+
+        Raises:
+            RuntimeError: If no batch is in progress.
+        """
+
+        if not self.__batch_depth:
+            raise RuntimeError("No batch in progress")
+        undo = self.__undo
+        self.__batch_depth = 0
+        self.__undo = None
+        self.__connection.rollback()
+        objects = self.__objects
+
+        def restore(key, previous):
+            if previous is None:
+                objects.pop(key, None)
+            else:
+                objects[key] = previous
+
+        undo.undo(restore)
+        self.__dirty.clear()
+        self.__deleted.clear()
+
+    def save(self):
+        """
+        Commit the changes made since the last save in one transaction.
+        Within a batch the commit is deferred to the end of the batch.
+        """
+
+        if self.__batch_depth:
+            return
+        self.__flush()
+        self.__connection.commit()
+
+    def __select(self, class_name, where="", parameters=(), clauses=""):
+        """
+        Get the objects of a class matching a SQL condition.
+
+        Args:
+            class_name (str): The name of the class.
+            where (str): The SQL condition, or "" to select every row.
+            parameters (tuple): The parameters of the condition and of
+                the clauses.
+            clauses (str): The SQL clauses following the condition, such
+                as ORDER BY and LIMIT.
+
+        Returns:
+            dict: A dictionary of the matching objects, in row order.
+        """
+
+        self.__flush()
+        cls = self.classes()[class_name]
+        columns = self.__columns(class_name)
+        objects = {}
+        for row in self.__connection.execute(
+                self.__statement(class_name, where, clauses), parameters):
+            key = "{}.{}".format(class_name, row[0])
+            obj = self.__objects.get(key)
+            if obj is None:
+                values = {name: value for name, value
+                          in zip(columns, row) if value is not None}
+                for name, kind in columns.items():
+                    if kind is list and name in values:
+                        values[name] = json.loads(values[name])
+                if row[-1]:
+                    values.update(json.loads(row[-1]))
+                obj = cls(**values)
+                self.__objects[key] = obj
+            objects[key] = obj
+        return objects
+
+    def __statement(self, class_name, where="", clauses=""):
+        """
+        Build the SELECT statement of __select().
+
+        Args:
+            class_name (str): The name of the class.
+            where (str): The SQL condition, or "" to select every row.
+            clauses (str): The SQL clauses following the condition.
+
+        Returns:
+            str: The statement.
+        """
+
+        return "SELECT {}, extra FROM {}{}{}".format(
+            ", ".join(self.__columns(class_name)), class_name,
+            " WHERE " + where if where else "", clauses)
+
+    def __compile(self, query):
+        """
+        Translate a query into SQL as far as its attributes are columns:
+        conditions on other attributes are left to be checked on the
+        objects, and the order and the limit are translated only if
+        every condition and sort key is.
+
+        A column is NULL when the attribute is unset, and the attribute
+        then reads as the class default: a condition the default meets
+        also accepts NULL, and sort keys read NULL as the default.
+
+        Args:
+            query (Query): The query.
+
+        Returns:
+            tuple: The condition, the clauses, their parameters, the
+            conditions left to check, and whether the order and the
+            limit were translated.
+        """
+
+        model = self.classes()[query.class_name]
+        columns = self.__columns(query.class_name)
+        conditions = []
+        parameters = []
+        residual = []
+        for attribute, op, value in query.conditions:
+            if columns.get(attribute, list) is list or value is None or \
+                    isinstance(value, (bool, list, dict)):
+                residual.append((attribute, op, value))
+                continue
+            condition = "{} {} ?".format(attribute, op)
+            try:
+                default_matches = Query.operators[op](
+                    getattr(model, attribute, None), value)
+            except TypeError:
+                default_matches = False
+            if default_matches:
+                condition = "({} OR {} IS NULL)".format(condition, attribute)
+            conditions.append(condition)
+            parameters.append(value.isoformat() if isinstance(
+                value, datetime.datetime) else value)
+        pushed = not residual and all(
+            columns.get(attribute, list) is not list
+            for attribute, descending in query.order)
+        clauses = ""
+        if pushed:
+            keys = []
+            for attribute, descending in query.order:
+                default = getattr(model, attribute, None)
+                if isinstance(default, datetime.datetime):
+                    default = default.isoformat()
+                keys.append("COALESCE({0}, ?) IS NULL{1}, "
+                            "COALESCE({0}, ?){1}".format(
+                                attribute, " DESC" if descending else ""))
+                parameters.extend((default, default))
+            if keys:
+                clauses += " ORDER BY " + ", ".join(keys)
+            if query.row_limit is not None:
+                clauses += " LIMIT ?"
+                parameters.append(query.row_limit)
+        return (" AND ".join(conditions), clauses, tuple(parameters),
+                residual, pushed)
+
+    def select(self, query):
+        """
+        Get the objects matching a query, filtering, sorting and
+        limiting them in SQL as far as the query allows.
+
+        Args:
+            query (Query): The query.
+
+        Returns:
+            list: The matching objects, in order and up to the limit.
+        """
+
+        where, clauses, parameters, residual, pushed = self.__compile(query)
+        objects = self.__select(query.class_name, where, parameters,
+                                clauses)
+        matches = (obj for obj in objects.values() if query.matches(obj))
+        if pushed:
+            return list(matches)
+        return query.arrange(matches)
+
+    def explain(self, query):
+        """
+        Describe how select() runs a query: the SQL statement, the plan
+        SQLite chose for it, and the steps left to do on the objects.
+
+        Args:
+            query (Query): The query.
+
+        Returns:
+            list: A line for each step of the plan.
+        """
+
+        where, clauses, parameters, residual, pushed = self.__compile(query)
+        statement = self.__statement(query.class_name, where, clauses)
+        self.__flush()
+        steps = ["sql " + statement]
+        for row in self.__connection.execute(
+                "EXPLAIN QUERY PLAN " + statement, parameters):
+            steps.append("plan " + row[-1])
+        steps.extend(Query(query.class_name, residual).describe())
+        if not pushed:
+            steps.extend(Query(query.class_name, (), query.order,
+                               query.row_limit).describe())
+        return steps
+
+    def all(self, cls=None):
+        """
+        Get all stored objects, or only those of one class.
+
+        Args:
+            cls (type or str): The class, or class name, to select.
+
+        Returns:
+            dict: A dictionary of objects.
+        """
+
+        if cls is not None:
+            return self.__select(cls if isinstance(cls, str)
+                                 else cls.__name__)
+        objects = {}
+        for class_name in self.classes():
+            objects.update(self.__select(class_name))
+        return objects
+
+    def stream(self, cls=None, offset=0, limit=None, after=None):
+        """
+        Iterate over the stored objects, or only those of one class, a
+        page at a time, ordered by class and by id.
+
+        Args:
+            cls (type or str): The class, or class name, to select.
+            offset (int): The number of objects to skip.
+            limit (int): The largest number of objects to return, or
+                None for all of them.
+            after (str): The key of an object, such as the last one of a
+                previous page, to start after.
+
+        Yields:
+            BaseModel: Each object.
+        """
+
+        if cls is None:
+            class_names = list(self.classes())
+        else:
+            class_names = [cls if isinstance(cls, str) else cls.__name__]
+        after_class, _, last = (after or "").partition(".")
+        if after_class in class_names:
+            class_names = class_names[class_names.index(after_class):]
+        for class_name in class_names:
+            where, parameters = ("id > ?", (last,)) \
+                if class_name == after_class else ("", ())
+            if offset:
+                self.__flush()
+                skipped = self.__connection.execute(
+                    "SELECT COUNT(*) FROM {}{}".format(
+                        class_name, " WHERE " + where if where else ""),
+                    parameters).fetchone()[0]
+                if skipped <= offset:
+                    offset -= skipped
+                    continue
+            while limit is None or limit > 0:
+                size = self.__page_size if limit is None \
+                    else min(limit, self.__page_size)
+                page = self.__select(class_name, where,
+                                     parameters + (size, offset),
+                                     " ORDER BY id LIMIT ? OFFSET ?")
+                offset = 0
+                yield from page.values()
+                if limit is not None:
+                    limit -= len(page)
+                if len(page) < size:
+                    break
+                where, parameters = "id > ?", (page[next(reversed(
+                    page))].id,)
+
+    def get(self, cls, id):
+        """
+        Get one stored object.
+
+        Args:
+            cls (type or str): The class, or class name, of the object.
+            id (str): The id of the object.
+
+        Returns:
+            BaseModel: The object, or None if it is not stored.
+        """
+
+        class_name = cls if isinstance(cls, str) else cls.__name__
+        if class_name not in self.classes():
+            return None
+        key = "{}.{}".format(class_name, id)
+        if key in self.__objects:
+            return self.__objects[key]
+        return self.__select(class_name, "id = ?", (id,)).get(key)
+
+    def find(self, cls, **equals):
+        """
+        Get the objects of one class whose attributes equal the given
+        values, filtering on the columns in SQL.
+
+        Args:
+            cls (type or str): The class, or class name, to select.
+            **equals: The attribute names and the values to match.
+
+        Returns:
+            dict: A dictionary of the matching objects.
+        """
+
+        class_name = cls if isinstance(cls, str) else cls.__name__
+        model = self.classes()[class_name]
+        columns = self.__columns(class_name)
+        conditions = []
+        parameters = []
+        for name, value in equals.items():
+            if name not in columns or isinstance(value, (list, dict)):
+                continue
+            if getattr(model, name, None) == value:
+                conditions.append("({0} = ? OR {0} IS NULL)".format(name))
+            else:
+                conditions.append("{} = ?".format(name))
+            parameters.append(value.isoformat() if isinstance(
+                value, datetime.datetime) else value)
+        objects = self.__select(class_name, " AND ".join(conditions),
+                                tuple(parameters))
+        return {key: obj for key, obj in objects.items()
+                if all(getattr(obj, name, None) == value
+                       for name, value in equals.items())}
+
+    def columns(self):
+        """
+        Get the dictionary of class names and their numeric attributes.
+
+        Returns:
+            dict: A dictionary mapping class names to the names of the
+            attributes between() can filter.
+        """
+
+        return FileStorage().columns()
+
+    def between(self, cls, **bounds):
+        """
+        Get the objects of one class whose numeric attributes are within
+        some bounds, filtering on the columns in SQL.
+
+        Args:
+            cls (type or str): The class, or class name, to select.
+            **bounds: The attribute names and (low, high) tuples of
+                inclusive bounds, None meaning unbounded.
+
+        Returns:
+            dict: A dictionary of the matching objects.
+
+        Raises:
+            KeyError: If an attribute is not a numeric column.
+        """
+
+        class_name = cls if isinstance(cls, str) else cls.__name__
+        model = self.classes()[class_name]
+        columns = self.columns().get(class_name, ())
+        conditions = []
+        parameters = []
+        for name, (low, high) in bounds.items():
+            if name not in columns:
+                raise KeyError(name)
+            # unset attributes are NULL and read as the class default
+            value = "COALESCE({}, ?)".format(name)
+            default = getattr(model, name, None)
+            for bound, operator in ((low, ">="), (high, "<=")):
+                if bound is not None:
+                    conditions.append("{} {} ?".format(value, operator))
+                    parameters.extend((default, bound))
+        return self.__select(class_name, " AND ".join(conditions),
+                             tuple(parameters))
+
+    def near(self, latitude, longitude, km, limit=None, cls="Place"):
+        """
+        Get the objects of one class within a distance of a point,
+        nearest first. The rows are read from the bounding box of the
+        circle through the latitude index, starting with a small circle
+        that doubles until it holds enough objects when there is a
+        limit, or passes the antipode, when the whole of km is read.
+
+        Args:
+            latitude (float): The latitude of the point, in degrees.
+            longitude (float): The longitude of the point, in degrees.
+            km (float): The largest distance, in kilometers.
+            limit (int): The largest number of objects to return, or
+                None for all of them.
+            cls (type or str): The class, or class name, to select.
+
+        Returns:
+            list: The (distance, object) tuple of each object, the
+            distance in kilometers.
+
+        Raises:
+            KeyError: If the class has no coordinates.
+            ValueError: If the point is invalid.
+        """
+
+        class_name = cls if isinstance(cls, str) else cls.__name__
+        fields = self.locations()[class_name]
+        model = self.classes()[class_name]
+        point = GeoIndex.coordinates(latitude, longitude)
+        if point is None:
+            raise ValueError("Invalid point: {}, {}".format(
+                latitude, longitude))
+        if limit is not None and limit <= 0:
+            return []
+        reach = km if limit is None else min(km, 50.0)
+        while True:
+            south, north, west, east = GeoIndex.box(point, reach)
+            # unset attributes are NULL and read as the class default
+            default = getattr(model, fields[0], None)
+            conditions = ["({0} BETWEEN ? AND ?{1})".format(
+                fields[0], " OR {} IS NULL".format(fields[0])
+                if default is not None and south <= default <= north
+                else "")]
+            parameters = [south, north]
+            if west is not None and -180 <= west and east <= 180:
+                conditions.append("COALESCE({}, ?) BETWEEN ? AND ?".format(
+                    fields[1]))
+                parameters.extend((getattr(model, fields[1], None), west,
+                                   east))
+            found = []
+            for obj in self.__select(class_name, " AND ".join(conditions),
+                                     tuple(parameters)).values():
+                other = GeoIndex.coordinates(*(getattr(obj, field, None)
+                                               for field in fields))
+                if other is not None:
+                    distance = GeoIndex.distance(point, other)
+                    if distance <= reach:
+                        found.append((distance, obj))
+            if limit is None or len(found) >= limit or reach >= km:
+                found.sort(key=lambda pair: (pair[0], pair[1].id))
+                return found[:limit]
+            reach = min(km, reach * 2) if reach * 2 < GeoIndex.farthest \
+                else km
+
+    def search(self, cls, text, limit=None):
+        """
+        Get the objects of one class whose text attributes hold the
+        words or phrases of a search, best match first, looking them up
+        in the SQLite full-text table of the class.
+
+        Args:
+            cls (type or str): The class, or class name, to select.
+            text (str): The search: words, and phrases between double
+                quotes.
+            limit (int): The largest number of objects to return, or
+                None for all of them.
+
+        Returns:
+            list: The (score, object) tuple of each object, the score
+            being its BM25 relevance as SQLite computes it.
+
+        Raises:
+            KeyError: If the class has no text attributes.
+        """
+
+        class_name = cls if isinstance(cls, str) else cls.__name__
+        if class_name not in self.texts():
+            raise KeyError(class_name)
+        terms = TextIndex.parse(text)
+        if not terms or limit == 0:
+            return []
+        self.__flush()
+        rows = self.__connection.execute(
+            "SELECT {0}.id, -bm25({0}_search) FROM {0}_search "
+            "JOIN {0} ON {0}.rowid = {0}_search.rowid "
+            "WHERE {0}_search MATCH ? ORDER BY bm25({0}_search), {0}.id "
+            "LIMIT ?".format(class_name),
+            (" OR ".join('"{}"'.format(" ".join(words)) for words in terms),
+             -1 if limit is None else limit)).fetchall()
+        objects = {}
+        for start in range(0, len(rows), 500):
+            ids = [object_id for object_id, score in rows[start:start + 500]]
+            objects.update(self.__select(class_name, "id IN ({})".format(
+                ", ".join("?" * len(ids))), tuple(ids)))
+        return [(score, objects["{}.{}".format(class_name, object_id)])
+                for object_id, score in rows]
+
+    def having(self, cls, all_of=(), any_of=(), none_of=(),
+               attribute="amenity_ids"):
+        """
+        Get the objects of one class whose list attribute holds every
+        value of all_of, one of any_of and none of none_of, reading the
+        JSON list of the column with json_each() in SQL.
+
+        Args:
+            cls (type or str): The class, or class name, to select.
+            all_of (iterable): The values that must all be held.
+            any_of (iterable): The values one of which must be held, or
+                nothing to put no such condition.
+            none_of (iterable): The values that must not be held.
+            attribute (str): The name of the list attribute.
+
+        Returns:
+            dict: A dictionary of the matching objects.
+
+        Raises:
+            KeyError: If the attribute cannot be filtered.
+        """
+
+        class_name = cls if isinstance(cls, str) else cls.__name__
+        if attribute not in self.memberships().get(class_name, ()):
+            raise KeyError(attribute)
+        # an unset list is NULL, which json_each() reads as no value
+        holds = "EXISTS (SELECT 1 FROM json_each({}) WHERE value IN ({}))"
+        conditions = []
+        parameters = []
+        for value in all_of:
+            conditions.append(holds.format(attribute, "?"))
+            parameters.append(value)
+        any_of = tuple(any_of)
+        if any_of:
+            conditions.append(holds.format(attribute,
+                                           ", ".join("?" * len(any_of))))
+            parameters.extend(any_of)
+        none_of = tuple(none_of)
+        if none_of:
+            conditions.append("NOT " + holds.format(
+                attribute, ", ".join("?" * len(none_of))))
+            parameters.extend(none_of)
+        return self.__select(class_name, " AND ".join(conditions),
+                             tuple(parameters))
+
+    def aggregate(self, cls, function, attribute=None, group_by=None):
+        """
+        Compute an aggregate of the numeric values of one attribute over
+        the stored objects of one class, or over each group of them, in
+        SQL when the attributes are text or numeric columns, and in a
+        single pass over the objects otherwise.
+
+        Args:
+            cls (type or str): The class, or class name, to aggregate.
+            function (str): One of "count", "sum", "avg", "min" or "max".
+            attribute (str): The name of the aggregated attribute, or
+                None to count the objects.
+            group_by (str): The name of the attribute whose values group
+                the objects, or None for a single group.
+
+        Returns:
+            The aggregate: an int for "count", a float otherwise, or None
+            for "avg", "min" and "max" of no value. With group_by, a
+            dictionary of each value to the aggregate of its group.
+
+        Raises:
+            ValueError: If the function is unknown, or is not "count"
+                and has no attribute.
+        """
+
+        class_name = cls if isinstance(cls, str) else cls.__name__
+        model = self.classes()[class_name]
+        columns = self.__columns(class_name)
+        names = [name for name in (attribute, group_by) if name is not None]
+        if function not in self.__aggregates or \
+                attribute is None and function != "count" or \
+                any(columns.get(name) not in (str, int, float)
+                    for name in names):
+            return Aggregate.over(self.stream(class_name), function,
+                                  attribute, group_by)
+        # unset attributes are NULL and read as the class default
+        selected = []
+        parameters = []
+        for alias, name in (("value", attribute), ("key", group_by)):
+            if name is not None:
+                selected.append("COALESCE({}, ?) AS {}".format(name, alias))
+                parameters.append(getattr(model, name, None))
+        value = "CASE WHEN typeof(value) IN ('integer', 'real') " \
+            "THEN value END" if attribute is not None else "*"
+        statement = "SELECT {}{}({}) FROM (SELECT {} FROM {}){}".format(
+            "key, " if group_by else "", self.__aggregates[function], value,
+            ", ".join(selected) or "id", class_name,
+            " GROUP BY key" if group_by else "")
+        self.__flush()
+        rows = self.__connection.execute(statement, parameters).fetchall()
+
+        def result(value):
+            if function == "count" or value is None:
+                return value
+            return float(value)
+
+        if group_by is None:
+            return result(rows[0][0])
+        return {key: result(value) for key, value in rows}
+
+    def count(self, cls=None):
+        """
+        Count the stored objects, or only those of one class.
+
+        Args:
+            cls (type or str): The class, or class name, to count.
+
+        Returns:
+            int: The number of objects.
+        """
+
+        self.__flush()
+        if cls is None:
+            class_names = list(self.classes())
+        else:
+            class_names = [cls if isinstance(cls, str) else cls.__name__]
+        return sum(self.__connection.execute(
+            "SELECT COUNT(*) FROM {}".format(class_name)).fetchone()[0]
+            for class_name in class_names)
+
+    def bulk_load(self, cls, path, format=None, workers=None):
+        """
+        Store the objects of one class read from an NDJSON or CSV file,
+        as one batch saved once at the end. The rows are converted by a
+        BulkLoader, and the instances built from the converted rows
+        without a save each. Every row is converted before the first
+        instance is stored, so that a bad row leaves the batch in
+        progress, if any, as it was.
+
+        Args:
+            cls (type or str): The class, or class name, of the objects.
+            path (str): The path of the file.
+            format (str): "ndjson" or "csv", guessed from the extension
+                of the file by default.
+            workers (int): The number of processes converting the rows,
+                by default one per CPU for large files.
+
+        Returns:
+            int: The number of objects stored.
+
+        Raises:
+            KeyError: If the class does not exist.
+            ValueError: If a row is malformed or a value has the wrong
+                type, in which case nothing is stored.
+        """
+
+        class_name = cls if isinstance(cls, str) else cls.__name__
+        model = self.classes()[class_name]
+        types = dict(self.attributes()["BaseModel"])
+        types.update(self.attributes().get(class_name, {}))
+        loader = BulkLoader(class_name, types,
+                            format or BulkLoader.format_of(path))
+        objects = []
+        for record in loader.records(path, workers):
+            obj = model.__new__(model)
+            obj.__dict__.update(record)
+            objects.append(obj)
+        with self.batch():
+            for obj in objects:
+                self.new(obj)
+        return len(objects)
@@ -1,8 +1,27 @@
 #!/usr/bin/python3
 """FileStorage class module"""
+import atexit
+import contextlib
 import json
 import os
 import datetime
+import threading
+import time
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+from models.engine.aggregate import Aggregate
+from models.engine.attribute_index import AttributeIndex
+from models.engine.bitmap_index import BitmapIndex
+from models.engine.bulk_loader import BulkLoader
+from models.engine.column_store import ColumnStore
+from models.engine.geo_index import GeoIndex
+from models.engine.lazy_record import LazyRecord
+from models.engine.object_stream import ObjectStream
+from models.engine.rw_lock import RWLock
+from models.engine.text_index import TextIndex
+from models.engine.undo_log import UndoLog
 
 
 class FileStorage:
@@ -12,10 +31,119 @@ class FileStorage:
     Attributes:
         __objects (dict): A dictionary to store serialized objects.
         __file_path (str): The path to the file used for storage.
+        __log_path (str): The path to the append-only mutation log.
+        __journal (bool): Whether save() appends to the log instead of
+            rewriting the whole file.
+        __dirty (set): Keys added or changed since the last save.
+        __deleted (set): Keys deleted since the last save.
+        __fragments (dict): The cached JSON encoding of the key and of the
+            object of each entry, valid as long as the object is not
+            dirty.
+        __fragments_of (dict): The object dictionary the cached entries
+            belong to.
+        __partitions (dict): The stored objects of each class, as a
+            dictionary of class names to dictionaries of ids to objects.
+        __partitions_of (dict): The object dictionary the partitions
+            and the indexes were built from.
+        __indexes (dict): The attribute indexes of each class name, built
+            the first time find() needs them.
+        __column_stores (dict): The column store of each class name,
+            built the first time between() or column_store() needs it.
+        __geo_indexes (dict): The geospatial index of each class name,
+            built the first time near() needs it.
+        __text_indexes (dict): The full-text index of each class name,
+            built the first time search() needs it.
+        __bitmap_indexes (dict): The bitmap indexes of each class name,
+            built the first time having() needs them.
+        __lazy (bool): Whether reload() keeps the decoded records and
+            builds the instances on first access.
+        __pending (int): The number of records not built yet.
+        __max_log_bytes (int): Log size that triggers a compaction.
+        __max_log_records (int): Log length that triggers a compaction.
+        __log_records (int): Number of records in the live log.
+        __log_lock (Lock): Serializes log appends and log rotation.
+        __compact_lock (Lock): Held while the snapshot is rewritten.
+        __compactor (Thread): The background compaction, if any.
+        __batch_depth (int): The number of nested batches in progress.
+        __undo (UndoLog): The undo log of the batch in progress, or None.
+        __write_behind (bool): Whether save() defers the write to a
+            background flusher.
+        __quiet (float): Seconds without a save before the flusher
+            writes.
+        __max_delay (float): Most seconds the flusher waits after the
+            first deferred save before it writes.
+        __requested_at (float): The time of the first deferred save not
+            written yet, or None.
+        __touched_at (float): The time of the last deferred save.
+        __wake (Condition): Signals the flusher of a deferred save, and
+            flush() of the end of a background write.
+        __flusher (Thread): The background flusher, if any.
+        __flushing (bool): Whether the flusher is writing a save.
+        __stopping (bool): Whether the flusher is stopped, at exit.
+        __exit_hook (bool): Whether the flusher is registered to be
+            stopped at exit.
+        __lock (RWLock): Held for writing while the stored objects
+            change, and for reading while they are read, including while
+            a save takes its snapshot of them.
+        __build_lock (RLock): Held by readers while they build the
+            partitions, the indexes, the column stores or the instances
+            of lazy records.
+        __save_lock (RLock): Serializes the saves, so that a snapshot is
+            never written over a later one.
+        __shared (bool): Whether other processes may use the same file,
+            in which case saves hold an advisory file lock and merge the
+            changes of the other processes first.
+        __lock_path (str): The path to the file holding the advisory
+            lock.
+        __stamp (tuple): The inode, size and modification time of the
+            storage file and the logs when they were last read or
+            written.
+        __page_size (int): The number of objects stream() collects
+            under the read lock at a time.
     """
 
     __objects = {}
     __file_path = "file.json"
+    __log_path = "file.json.log"
+    __journal = False
+    __dirty = set()
+    __deleted = set()
+    __fragments = {}
+    __fragments_of = None
+    __partitions = {}
+    __partitions_of = None
+    __indexes = {}
+    __column_stores = {}
+    __geo_indexes = {}
+    __text_indexes = {}
+    __bitmap_indexes = {}
+    __lazy = False
+    __pending = 0
+    __max_log_bytes = 4 * 1024 * 1024
+    __max_log_records = 10000
+    __log_records = 0
+    __log_lock = threading.Lock()
+    __compact_lock = threading.Lock()
+    __compactor = None
+    __batch_depth = 0
+    __undo = None
+    __write_behind = False
+    __quiet = 0.5
+    __max_delay = 2.0
+    __requested_at = None
+    __touched_at = None
+    __wake = threading.Condition()
+    __flusher = None
+    __flushing = False
+    __stopping = False
+    __exit_hook = False
+    __lock = RWLock()
+    __build_lock = threading.RLock()
+    __save_lock = threading.RLock()
+    __shared = False
+    __lock_path = "file.json.lock"
+    __stamp = None
+    __page_size = 1000
 
     def attributes(self):
         """
@@ -82,47 +210,1558 @@ class FileStorage:
         }
         return classes
 
+    def indexes(self):
+        """
+        Get the dictionary of class names and their indexed attributes.
+
+        Returns:
+            dict: A dictionary mapping class names to the names of the
+            attributes that find() looks up through a hash index.
+        """
+
+        indexes = {
+            "City": ("state_id",),
+            "Place": ("city_id", "user_id"),
+            "Review": ("place_id", "user_id")
+        }
+        return indexes
+
+    def columns(self):
+        """
+        Get the dictionary of class names and their numeric attributes.
+
+        Returns:
+            dict: A dictionary mapping class names to the names of the
+            attributes mirrored in a column store.
+        """
+
+        columns = {
+            "Place": ("price_by_night", "number_rooms", "number_bathrooms",
+                      "max_guest", "latitude", "longitude")
+        }
+        return columns
+
+    def locations(self):
+        """
+        Get the dictionary of class names and their coordinates.
+
+        Returns:
+            dict: A dictionary mapping class names to the names of their
+            latitude and longitude attributes, which near() looks up
+            through a geospatial index.
+        """
+
+        locations = {
+            "Place": ("latitude", "longitude")
+        }
+        return locations
+
+    def texts(self):
+        """
+        Get the dictionary of class names and their text attributes.
+
+        Returns:
+            dict: A dictionary mapping class names to the names of the
+            attributes that search() looks up through a full-text index.
+        """
+
+        texts = {
+            "Place": ("name", "description"),
+            "Review": ("text",)
+        }
+        return texts
+
+    def memberships(self):
+        """
+        Get the dictionary of class names and their list attributes.
+
+        Returns:
+            dict: A dictionary mapping class names to the names of the
+            list attributes that having() looks up through a bitmap
+            index.
+        """
+
+        memberships = {
+            "Place": ("amenity_ids",)
+        }
+        return memberships
+
+    def journal(self, enabled=True, max_bytes=None, max_records=None):
+        """
+        Switch the append-only log mode on or off.
+
+        In log mode every save() appends one record per changed or
+        deleted object to the log file instead of rewriting the whole
+        storage file, and reload() replays the log over the snapshot.
+        Once the log grows past max_bytes or max_records it is folded
+        into a fresh snapshot in the background.
+
+        Args:
+            enabled (bool): True to append to the log on save.
+            max_bytes (int): Log size that triggers a compaction.
+            max_records (int): Log length that triggers a compaction.
+        """
+
+        FileStorage.__journal = enabled
+        if max_bytes is not None:
+            FileStorage.__max_log_bytes = max_bytes
+        if max_records is not None:
+            FileStorage.__max_log_records = max_records
+
+    def write_behind(self, enabled=True, quiet=None, max_delay=None):
+        """
+        Switch the write-behind mode on or off.
+
+        In write-behind mode save() returns at once and a background
+        thread saves once no save was requested for quiet seconds, or
+        max_delay seconds after the first request, so that a burst of
+        saves is written once. flush() saves at once, and at exit the
+        flusher writes what is pending and is stopped.
+
+        Args:
+            enabled (bool): True to defer the saves to the flusher.
+            quiet (float): Seconds without a save before writing.
+            max_delay (float): Most seconds a save is deferred.
+        """
+
+        if quiet is not None:
+            FileStorage.__quiet = quiet
+        if max_delay is not None:
+            FileStorage.__max_delay = max_delay
+        if enabled and not self.__exit_hook:
+            atexit.register(self.__stop)
+            FileStorage.__exit_hook = True
+        FileStorage.__write_behind = enabled
+        if not enabled:
+            self.flush()
+
+    def flush(self):
+        """
+        Write the save deferred by the write-behind mode now, if there
+        is one, after the background write in progress, if any.
+        """
+
+        with self.__wake:
+            while self.__flushing:
+                self.__wake.wait()
+            pending = self.__requested_at is not None
+            FileStorage.__requested_at = None
+            FileStorage.__touched_at = None
+        if pending:
+            self.__save()
+
+    def __flush_behind(self):
+        """
+        Run the background flusher: wait for a deferred save, then for
+        the quiet period or the maximum delay, and write it. Nothing is
+        written while a batch is in progress.
+        """
+
+        while True:
+            with self.__wake:
+                while True:
+                    if self.__requested_at is None or self.__batch_depth:
+                        if self.__stopping:
+                            return
+                        self.__wake.wait()
+                        continue
+                    remaining = min(self.__touched_at + self.__quiet,
+                                    self.__requested_at + self.__max_delay) \
+                        - time.monotonic()
+                    if remaining <= 0 or self.__stopping:
+                        break
+                    self.__wake.wait(remaining)
+                FileStorage.__requested_at = None
+                FileStorage.__touched_at = None
+                FileStorage.__flushing = True
+            try:
+                self.__save()
+            finally:
+                with self.__wake:
+                    FileStorage.__flushing = False
+                    self.__wake.notify_all()
+
+    def __stop(self):
+        """
+        Stop the background flusher at exit, once it wrote the deferred
+        save, if any, so that the interpreter does not end during a
+        write. Later saves are written at once.
+        """
+
+        with self.__wake:
+            FileStorage.__stopping = True
+            self.__wake.notify_all()
+        flusher = self.__flusher
+        if flusher is not None:
+            flusher.join()
+        self.flush()
+
+    def share(self, enabled=True):
+        """
+        Switch the multi-process mode on or off.
+
+        In multi-process mode saves hold an exclusive advisory lock on
+        the lock file, and reloads and refreshes a shared one. Before
+        writing, a save checks whether another process changed the
+        files since they were last read or written, and if so merges
+        the records the other process changed, unless they were changed
+        here too: the last save of a record wins. Without fcntl, as on
+        Windows, no lock is taken.
+
+        Args:
+            enabled (bool): True to lock and merge on save.
+        """
+
+        FileStorage.__shared = enabled
+
+    def refresh(self):
+        """
+        Merge the records other processes changed since the files were
+        last read or written, in multi-process mode. Nothing is read if
+        the files did not change.
+        """
+
+        if not self.__shared or self.__disk_stamp() == self.__stamp:
+            return
+        with self.__file_lock(exclusive=False):
+            self.__sync()
+
+    @contextlib.contextmanager
+    def __file_lock(self, exclusive):
+        """
+        Hold the advisory lock shared between processes within a block,
+        in multi-process mode.
+
+        Args:
+            exclusive (bool): True to lock for writing, False to lock for
+                reading.
+        """
+
+        if not self.__shared or fcntl is None:
+            yield
+            return
+        with open(self.__lock_path, "a") as file:
+            fcntl.flock(file.fileno(),
+                        fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+    def __disk_stamp(self):
+        """
+        Get the identity, size and modification time of the storage file
+        and of the logs, which change whenever a process writes them.
+
+        Returns:
+            tuple: A (inode, size, modification time) tuple, or None, for
+            each file.
+        """
+
+        stamp = []
+        for path in (self.__file_path, self.__log_path,
+                     self.__log_path + ".compacting"):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                stamp.append(None)
+            else:
+                stamp.append((stat.st_ino, stat.st_size, stat.st_mtime_ns))
+        return tuple(stamp)
+
+    def __sync(self):
+        """
+        Merge the records changed in the files since they were last read
+        or written, if the files changed. The caller holds the advisory
+        lock.
+        """
+
+        stamp = self.__disk_stamp()
+        if stamp == self.__stamp:
+            return
+        records, _ = self.__read(lambda value: value)
+        with self.__lock.writing():
+            self.__merge(records)
+        FileStorage.__stamp = stamp
+
+    def __merge(self, records):
+        """
+        Replace the stored objects that are not changed here by the
+        records read from the files, where they differ.
+
+        Args:
+            records (dict): The decoded records of the files, by key.
+        """
+
+        partitions = self.__index()
+        classes = self.classes()
+        fragments = self.__fragments
+        for key in list(self.__objects):
+            if key not in records and key not in self.__dirty:
+                class_name, _, object_id = key.partition(".")
+                if isinstance(self.__objects.pop(key), LazyRecord):
+                    FileStorage.__pending -= 1
+                partitions[class_name].pop(object_id, None)
+                for index in self.__mirrors(class_name):
+                    index.discard(object_id)
+                fragments.pop(key, None)
+        for key, value in records.items():
+            if key in self.__dirty or key in self.__deleted:
+                continue
+            value_json = json.dumps(value)
+            if key in self.__objects and \
+                    self.__entry(key)[1] == value_json:
+                continue
+            class_name, _, object_id = key.partition(".")
+            cls = classes[value["__class__"]]
+            if self.__lazy:
+                obj = LazyRecord(cls, value)
+                FileStorage.__pending += 1
+            else:
+                obj = cls(**value)
+            if isinstance(self.__objects.get(key), LazyRecord):
+                FileStorage.__pending -= 1
+            self.__objects[key] = obj
+            partitions.setdefault(class_name, {})[object_id] = obj
+            for index in self.__mirrors(class_name):
+                index.put(object_id, obj)
+            fragments[key] = (json.dumps(key), value_json)
+
+    def lazy(self, enabled=True):
+        """
+        Switch the lazy loading mode on or off.
+
+        In lazy mode reload() keeps the decoded records, and each
+        instance is built the first time all(), find() or get() returns
+        it. count() never builds instances.
+
+        Args:
+            enabled (bool): True to build the instances on first access.
+        """
+
+        FileStorage.__lazy = enabled
+
+    def is_lazy(self):
+        """
+        Tell whether the lazy loading mode is on.
+
+        Returns:
+            bool: True if reload() keeps the decoded records.
+        """
+
+        return self.__lazy
+
+    def compact(self, wait=True):
+        """
+        Fold the mutation log into a fresh snapshot.
+
+        The live log is renamed aside so that writers keep appending to
+        a new one, then the old log is replayed over the snapshot and
+        the result atomically replaces the storage file.
+
+        Args:
+            wait (bool): True to compact in the calling thread, False to
+                compact in a background thread.
+        """
+
+        if wait:
+            self.__compact()
+            return
+        with self.__log_lock:
+            compactor = FileStorage.__compactor
+            if compactor is None or not compactor.is_alive():
+                compactor = threading.Thread(target=self.__compact,
+                                             daemon=True)
+                FileStorage.__compactor = compactor
+                compactor.start()
+
+    def __compact(self):
+        """
+        Rotate the live log and replay it over the snapshot, reading
+        the snapshot one object at a time.
+        """
+
+        compacting_path = self.__log_path + ".compacting"
+        with self.__file_lock(exclusive=True), self.__compact_lock:
+            fresh = self.__disk_stamp() == self.__stamp
+            with self.__log_lock:
+                if not os.path.isfile(compacting_path):
+                    if not os.path.isfile(self.__log_path):
+                        return
+                    os.replace(self.__log_path, compacting_path)
+                    FileStorage.__log_records = 0
+            changes = {record["key"]: record.get("value")
+                       for record in self.__records(compacting_path)}
+            temporary_path = self.__file_path + ".tmp"
+            with open(temporary_path, "w", encoding="utf-8") as file:
+                separator = "{"
+                if os.path.isfile(self.__file_path):
+                    with open(self.__file_path, "r",
+                              encoding="utf-8") as snapshot:
+                        for key, value in ObjectStream(snapshot):
+                            value = changes.pop(key, value)
+                            if value is not None:
+                                file.write("{}{}: {}".format(
+                                    separator, json.dumps(key),
+                                    json.dumps(value)))
+                                separator = ", "
+                for key, value in changes.items():
+                    if value is not None:
+                        file.write("{}{}: {}".format(
+                            separator, json.dumps(key), json.dumps(value)))
+                        separator = ", "
+                if separator == "{":
+                    file.write("{")
+                file.write("}")
+            os.replace(temporary_path, self.__file_path)
+            os.remove(compacting_path)
+            if fresh:
+                # the files hold the same records as before, so there is
+                # nothing to merge from them
+                FileStorage.__stamp = self.__disk_stamp()
+
+    @staticmethod
+    def __records(path):
+        """
+        Iterate over the records of a mutation log.
+
+        Args:
+            path (str): The path to the log.
+
+        Yields:
+            dict: The records, up to the first torn one.
+        """
+
+        if not os.path.isfile(path):
+            return
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    return  # torn write at the end of the log
+
     def reload(self):
         """
-        Reload serialized objects from the file, if it exists.
+        Reload serialized objects from the file, if it exists, then
+        replay the mutation logs on top of it.
         """
 
-        if not os.path.isfile(self.__file_path):
+        compacting_path = self.__log_path + ".compacting"
+        if not os.path.isfile(self.__file_path) and \
+                not os.path.isfile(self.__log_path) and \
+                not os.path.isfile(compacting_path):
+            FileStorage.__stamp = self.__disk_stamp()
             return
-        with open(self.__file_path, "r", encoding="utf-8") as file:
-            deserialized_dict = json.load(file)
-            deserialized_dict = {key: self.classes()[value[
-                "__class__"]](**value)
-                                 for key, value in deserialized_dict.items()}
-            self.__objects = deserialized_dict
+        classes = self.classes()
+        if self.__lazy:
+            def build(value):
+                return LazyRecord(classes[value["__class__"]], value)
+        else:
+            def build(value):
+                return classes[value["__class__"]](**value)
+        with self.__file_lock(exclusive=False):
+            objects, log_records = self.__read(build)
+            FileStorage.__stamp = self.__disk_stamp()
+        self.load(objects)
+        FileStorage.__log_records = log_records
+
+    def __read(self, build):
+        """
+        Read the storage file, then replay the mutation logs on top of
+        it.
+
+        Args:
+            build (callable): Turns a decoded record into the stored
+                object.
+
+        Returns:
+            tuple: The dictionary of the stored objects by key, and the
+            number of records in the live log.
+        """
+
+        compacting_path = self.__log_path + ".compacting"
+        objects = {}
+        log_records = 0
+        with self.__compact_lock:
+            if os.path.isfile(self.__file_path):
+                with open(self.__file_path, "r", encoding="utf-8") as file:
+                    objects = {key: build(value)
+                               for key, value in ObjectStream(file)}
+            for path in (compacting_path, self.__log_path):
+                for record in self.__records(path):
+                    if record["op"] == "put":
+                        objects[record["key"]] = build(record["value"])
+                    else:
+                        objects.pop(record["key"], None)
+                    if path == self.__log_path:
+                        log_records += 1
+        return objects, log_records
+
+    def load(self, objects):
+        """
+        Replace the stored objects, as if they had just been saved.
+
+        Args:
+            objects (dict): A dictionary of keys to instances or to
+                records not built yet.
+        """
+
+        with self.__lock.writing():
+            FileStorage.__objects = objects
+            FileStorage.__dirty = set()
+            FileStorage.__deleted = set()
+            FileStorage.__fragments = {}
+            FileStorage.__fragments_of = objects
+            self.__index()
 
     def new(self, obj):
         """
-        Add a new object to the storage.
+        Add a new object to the storage, or mark it as changed.
+
+        Args:
+            obj: The object to be added.
+        """
+
+        with self.__lock.writing():
+            object_key, previous = self.__put(obj)
+            if self.__undo is not None and previous is not obj:
+                self.__undo.entry(object_key, previous)
+            self.__dirty.add(object_key)
+            self.__deleted.discard(object_key)
+
+    def keep(self, obj):
+        """
+        Add an object read from the storage file as it was saved: it is
+        not marked as changed and a rollback does not remove it.
 
         Args:
             obj: The object to be added.
         """
 
-        object_key = "{}.{}".format(type(obj).__name__, obj.id)
+        with self.__lock.writing():
+            self.__put(obj)
+
+    def __put(self, obj):
+        """
+        Store an object under its key and in the indexes. The caller
+        holds the write lock.
+
+        Args:
+            obj: The object to be stored.
+
+        Returns:
+            tuple: The key of the object, and the object previously
+            stored under it, or None if there was none.
+        """
+
+        partitions = self.__index()
+        class_name = type(obj).__name__
+        object_key = "{}.{}".format(class_name, obj.id)
+        previous = self.__objects.get(object_key)
+        if isinstance(previous, LazyRecord):
+            FileStorage.__pending -= 1
         self.__objects[object_key] = obj
+        partitions.setdefault(class_name, {})[obj.id] = obj
+        for index in self.__mirrors(class_name):
+            index.put(obj.id, obj)
+        return object_key, previous
+
+    def changing(self, obj, name):
+        """
+        Record the value of an attribute of a stored object before it
+        changes, so that a rollback can restore it.
+
+        Nothing is recorded outside of a batch.
+
+        Args:
+            obj: The object about to change.
+            name (str): The name of the attribute about to change.
+        """
+
+        if self.__undo is None:
+            return
+        object_key = "{}.{}".format(type(obj).__name__,
+                                    obj.__dict__.get("id"))
+        if self.__objects.get(object_key) is obj:
+            self.__undo.attribute(obj, name)
+
+    def touch(self, obj, name=None):
+        """
+        Mark a stored object as changed since the last save, and update
+        the indexes that read the changed attribute.
+
+        Objects that are not in the storage, such as instances being
+        built from a dictionary, or that have no id yet, are ignored.
+
+        Args:
+            obj: The object that changed.
+            name (str): The name of the changed attribute, or None if
+                any attribute may have changed.
+        """
+
+        object_id = obj.__dict__.get("id")
+        if object_id is None:
+            return
+        class_name = type(obj).__name__
+        object_key = "{}.{}".format(class_name, object_id)
+        if self.__objects.get(object_key) is not obj:
+            return
+        with self.__lock.writing():
+            self.__dirty.add(object_key)
+            self.__index()
+            for index in self.__mirrors(class_name):
+                if name is None or name in index.fields:
+                    index.put(obj.id, obj)
+
+    def delete(self, obj=None):
+        """
+        Remove an object from the storage, if it is stored.
+
+        Args:
+            obj: The object to be removed.
+        """
+
+        if obj is None or obj.__dict__.get("id") is None:
+            return
+        with self.__lock.writing():
+            partitions = self.__index()
+            class_name = type(obj).__name__
+            object_key = "{}.{}".format(class_name, obj.id)
+            record = self.__objects.pop(object_key, None)
+            if record is None:
+                return
+            if isinstance(record, LazyRecord):
+                FileStorage.__pending -= 1
+            if self.__undo is not None:
+                self.__undo.entry(object_key, record)
+            partitions[class_name].pop(obj.id, None)
+            for index in self.__mirrors(class_name):
+                index.discard(obj.id)
+            self.__dirty.discard(object_key)
+            self.__deleted.add(object_key)
+
+    def __index(self):
+        """
+        Get the per-class partitions of the stored objects, rebuilding
+        them if the object dictionary was replaced.
+
+        Returns:
+            dict: A dictionary of class names to dictionaries of ids to
+            objects.
+        """
+
+        if FileStorage.__partitions_of is self.__objects:
+            return FileStorage.__partitions
+        with self.__build_lock:
+            if FileStorage.__partitions_of is not self.__objects:
+                partitions = {}
+                for key, obj in self.__objects.items():
+                    class_name, _, object_id = key.partition(".")
+                    partitions.setdefault(class_name, {})[object_id] = obj
+                FileStorage.__partitions = partitions
+                FileStorage.__indexes = {}
+                FileStorage.__column_stores = {}
+                FileStorage.__geo_indexes = {}
+                FileStorage.__text_indexes = {}
+                FileStorage.__bitmap_indexes = {}
+                FileStorage.__pending = sum(
+                    isinstance(record, LazyRecord)
+                    for record in self.__objects.values())
+                FileStorage.__partitions_of = self.__objects
+            return FileStorage.__partitions
+
+    def __class_indexes(self, class_name):
+        """
+        Get the attribute indexes of a class, building them the first
+        time they are needed.
+
+        Args:
+            class_name (str): The name of the class.
+
+        Returns:
+            list: The attribute indexes of the class.
+        """
+
+        partitions = self.__index()
+        if class_name in self.__indexes:
+            return self.__indexes[class_name]
+        with self.__build_lock:
+            if class_name not in self.__indexes:
+                class_indexes = [AttributeIndex(attribute) for attribute
+                                 in self.indexes().get(class_name, ())]
+                for index in class_indexes:
+                    for object_id, obj in partitions.get(class_name,
+                                                         {}).items():
+                        index.put(object_id, obj)
+                self.__indexes[class_name] = class_indexes
+            return self.__indexes[class_name]
+
+    def column_store(self, cls):
+        """
+        Get the column store of a class, building it the first time it
+        is needed.
+
+        Args:
+            cls (type or str): The class, or class name.
+
+        Returns:
+            ColumnStore: The column store of the numeric attributes of
+            the class.
+        """
+
+        class_name = self.__class_name(cls)
+        with self.__lock.reading(), self.__build_lock:
+            partitions = self.__index()
+            if class_name not in self.__column_stores:
+                store = ColumnStore(self.columns().get(class_name, ()))
+                for object_id, obj in partitions.get(class_name, {}).items():
+                    store.put(object_id, obj)
+                self.__column_stores[class_name] = store
+            return self.__column_stores[class_name]
+
+    def __geo_index(self, class_name):
+        """
+        Get the geospatial index of a class, building it the first time
+        it is needed.
+
+        Args:
+            class_name (str): The name of the class.
+
+        Returns:
+            GeoIndex: The geospatial index of the class.
+
+        Raises:
+            KeyError: If the class has no coordinates.
+        """
+
+        partitions = self.__index()
+        if class_name in self.__geo_indexes:
+            return self.__geo_indexes[class_name]
+        with self.__build_lock:
+            if class_name not in self.__geo_indexes:
+                index = GeoIndex(*self.locations()[class_name])
+                for object_id, obj in partitions.get(class_name, {}).items():
+                    index.put(object_id, obj)
+                self.__geo_indexes[class_name] = index
+            return self.__geo_indexes[class_name]
+
+    def __text_index(self, class_name):
+        """
+        Get the full-text index of a class, building it the first time
+        it is needed.
+
+        Args:
+            class_name (str): The name of the class.
+
+        Returns:
+            TextIndex: The full-text index of the class.
+
+        Raises:
+            KeyError: If the class has no text attributes.
+        """
+
+        partitions = self.__index()
+        if class_name in self.__text_indexes:
+            return self.__text_indexes[class_name]
+        with self.__build_lock:
+            if class_name not in self.__text_indexes:
+                index = TextIndex(self.texts()[class_name])
+                for object_id, obj in partitions.get(class_name, {}).items():
+                    index.put(object_id, obj)
+                self.__text_indexes[class_name] = index
+            return self.__text_indexes[class_name]
 
-    def all(self):
+    def __bitmap_index(self, class_name, attribute):
         """
-        Get all serialized objects.
+        Get the bitmap index of a list attribute of a class, building
+        the indexes of the class the first time they are needed.
+
+        Args:
+            class_name (str): The name of the class.
+            attribute (str): The name of the list attribute.
+
+        Returns:
+            BitmapIndex: The bitmap index of the attribute.
+
+        Raises:
+            KeyError: If the attribute has no bitmap index.
+        """
+
+        partitions = self.__index()
+        if class_name not in self.__bitmap_indexes:
+            with self.__build_lock:
+                if class_name not in self.__bitmap_indexes:
+                    class_indexes = [BitmapIndex(name) for name in
+                                     self.memberships().get(class_name, ())]
+                    for index in class_indexes:
+                        for object_id, obj in partitions.get(class_name,
+                                                             {}).items():
+                            index.put(object_id, obj)
+                    self.__bitmap_indexes[class_name] = class_indexes
+        for index in self.__bitmap_indexes[class_name]:
+            if index.fields[0] == attribute:
+                return index
+        raise KeyError(attribute)
+
+    def __mirrors(self, class_name):
+        """
+        Get the indexes and the column store of a class that are built,
+        which are updated as the stored objects change.
+
+        Args:
+            class_name (str): The name of the class.
+
+        Returns:
+            list: The built indexes and column store of the class.
+        """
+
+        mirrors = list(self.__indexes.get(class_name, ()))
+        if class_name in self.__column_stores:
+            mirrors.append(self.__column_stores[class_name])
+        if class_name in self.__geo_indexes:
+            mirrors.append(self.__geo_indexes[class_name])
+        if class_name in self.__text_indexes:
+            mirrors.append(self.__text_indexes[class_name])
+        mirrors.extend(self.__bitmap_indexes.get(class_name, ()))
+        return mirrors
+
+    def __materialize(self, class_name, object_id, record):
+        """
+        Build the instance of a stored record and store it in place of
+        the record, unless another reader built it first.
+
+        Args:
+            class_name (str): The class name of the record.
+            object_id (str): The id of the record.
+            record (LazyRecord): The record.
+
+        Returns:
+            BaseModel: The instance.
+        """
+
+        with self.__build_lock:
+            stored = self.__partitions[class_name].get(object_id)
+            if stored is not record:
+                return stored
+            obj = record.materialize()
+            self.__objects["{}.{}".format(class_name, object_id)] = obj
+            self.__partitions[class_name][object_id] = obj
+            for index in self.__mirrors(class_name):
+                index.put(object_id, obj)
+            FileStorage.__pending -= 1
+            return obj
+
+    def __materialize_all(self, class_name, records):
+        """
+        Build the instances of the stored records among some objects.
+
+        Args:
+            class_name (str): The class name of the objects.
+            records (dict): A dictionary of ids to objects or records.
+
+        Returns:
+            dict: A dictionary of the objects, keyed like in all().
+        """
+
+        objects = {}
+        for object_id, obj in list(records.items()):
+            if isinstance(obj, LazyRecord):
+                obj = self.__materialize(class_name, object_id, obj)
+            objects["{}.{}".format(class_name, object_id)] = obj
+        return objects
+
+    @staticmethod
+    def __class_name(cls):
+        """
+        Get the name of a class given as a class or as a name.
+
+        Args:
+            cls (type or str): The class or its name.
+
+        Returns:
+            str: The name of the class.
+        """
+
+        return cls if isinstance(cls, str) else cls.__name__
+
+    def all(self, cls=None):
+        """
+        Get a snapshot of all serialized objects, or only those of one
+        class, which later changes of the storage do not affect.
+
+        Args:
+            cls (type or str): The class, or class name, to select.
 
         Returns:
             dict: A dictionary of serialized objects.
         """
 
-        return self.__objects
+        with self.__lock.reading():
+            partitions = self.__index()
+            if cls is None:
+                if self.__pending:
+                    for class_name, partition in partitions.items():
+                        self.__materialize_all(class_name, partition)
+                return dict(self.__objects)
+            class_name = self.__class_name(cls)
+            return self.__materialize_all(class_name,
+                                          partitions.get(class_name, {}))
+
+    def stream(self, cls=None, offset=0, limit=None, after=None):
+        """
+        Iterate over the stored objects, or only those of one class, in
+        storage order, without copying them.
+
+        The objects are collected a page at a time under the read lock,
+        which is released while they are handed out. If objects are
+        added or removed meanwhile, the iteration resumes after the last
+        object it went past, and ends if that object was removed.
+
+        Args:
+            cls (type or str): The class, or class name, to select.
+            offset (int): The number of objects to skip.
+            limit (int): The largest number of objects to return, or
+                None for all of them.
+            after (str): The key of an object, such as the last one of a
+                previous page, to start after.
+
+        Yields:
+            BaseModel: Each object.
+        """
+
+        class_name = None if cls is None else self.__class_name(cls)
+        if class_name is not None and after is not None:
+            # the partition of the class is keyed by id
+            prefix, _, after = after.partition(".")
+            if prefix != class_name:
+                after = object()
+        source = items = None
+        done = False
+        while not done and (limit is None or limit > 0):
+            page = []
+            size = self.__page_size if limit is None \
+                else min(limit, self.__page_size)
+            with self.__lock.reading():
+                if class_name is None:
+                    entries = self.__objects
+                else:
+                    entries = self.__index().get(class_name, {})
+                if entries is not source:
+                    source, items = entries, iter(entries.items())
+                    skipping = after is not None
+                done = True
+                try:
+                    for name, obj in items:
+                        if skipping:
+                            skipping = name != after
+                            continue
+                        after = name
+                        if offset:
+                            offset -= 1
+                            continue
+                        if isinstance(obj, LazyRecord):
+                            obj = self.__materialize(
+                                *(name.split(".", 1) if class_name is None
+                                  else (class_name, name)), obj)
+                        page.append(obj)
+                        if len(page) == size:
+                            done = False
+                            break
+                except RuntimeError:
+                    # the dictionary changed size: start again after the
+                    # last object gone past
+                    source = None
+                    done = False
+            yield from page
+            if limit is not None:
+                limit -= len(page)
+
+    def get(self, cls, id):
+        """
+        Get one stored object.
+
+        Args:
+            cls (type or str): The class, or class name, of the object.
+            id (str): The id of the object.
+
+        Returns:
+            BaseModel: The object, or None if it is not stored.
+        """
+
+        class_name = self.__class_name(cls)
+        with self.__lock.reading():
+            obj = self.__index().get(class_name, {}).get(id)
+            if isinstance(obj, LazyRecord):
+                obj = self.__materialize(class_name, id, obj)
+            return obj
+
+    def find(self, cls, **equals):
+        """
+        Get the objects of one class whose attributes equal the given
+        values, looking them up through an attribute index when one
+        exists.
+
+        Args:
+            cls (type or str): The class, or class name, to select.
+            **equals: The attribute names and the values to match.
+
+        Returns:
+            dict: A dictionary of the matching objects.
+        """
+
+        class_name = self.__class_name(cls)
+        with self.__lock.reading():
+            candidates = self.__index().get(class_name, {})
+            for index in self.__class_indexes(class_name):
+                attribute = index.fields[0]
+                if attribute in equals:
+                    entries = index.lookup(equals[attribute])
+                    if len(entries) < len(candidates):
+                        candidates = entries
+            matches = {object_id: obj
+                       for object_id, obj in candidates.items()
+                       if all(getattr(obj, attribute, None) == value
+                              for attribute, value in equals.items())}
+            return self.__materialize_all(class_name, matches)
+
+    def between(self, cls, **bounds):
+        """
+        Get the objects of one class whose numeric attributes are within
+        some bounds, filtering the column store of the class.
+
+        Args:
+            cls (type or str): The class, or class name, to select.
+            **bounds: The attribute names and (low, high) tuples of
+                inclusive bounds, None meaning unbounded.
+
+        Returns:
+            dict: A dictionary of the matching objects.
+
+        Raises:
+            KeyError: If an attribute is not in the column store.
+        """
+
+        class_name = self.__class_name(cls)
+        with self.__lock.reading():
+            ids = self.column_store(class_name).select(**bounds)
+            partition = self.__index().get(class_name, {})
+            return self.__materialize_all(
+                class_name,
+                {object_id: partition[object_id] for object_id in ids})
+
+    def near(self, latitude, longitude, km, limit=None, cls="Place"):
+        """
+        Get the objects of one class within a distance of a point,
+        nearest first, looking them up through the geospatial index of
+        the class.
+
+        Args:
+            latitude (float): The latitude of the point, in degrees.
+            longitude (float): The longitude of the point, in degrees.
+            km (float): The largest distance, in kilometers.
+            limit (int): The largest number of objects to return, or
+                None for all of them.
+            cls (type or str): The class, or class name, to select.
+
+        Returns:
+            list: The (distance, object) tuple of each object, the
+            distance in kilometers.
+
+        Raises:
+            KeyError: If the class has no coordinates.
+            ValueError: If the point is invalid.
+        """
+
+        class_name = self.__class_name(cls)
+        with self.__lock.reading():
+            found = self.__geo_index(class_name).nearest(
+                latitude, longitude, km, limit)
+            partition = self.__index().get(class_name, {})
+            nearest = []
+            for distance, object_id in found:
+                obj = partition[object_id]
+                if isinstance(obj, LazyRecord):
+                    obj = self.__materialize(class_name, object_id, obj)
+                nearest.append((distance, obj))
+            return nearest
+
+    def search(self, cls, text, limit=None):
+        """
+        Get the objects of one class whose text attributes hold the
+        words or phrases of a search, best match first, looking them up
+        through the full-text index of the class.
+
+        Args:
+            cls (type or str): The class, or class name, to select.
+            text (str): The search: words, and phrases between double
+                quotes.
+            limit (int): The largest number of objects to return, or
+                None for all of them.
+
+        Returns:
+            list: The (score, object) tuple of each object, the score
+            being its BM25 relevance.
+
+        Raises:
+            KeyError: If the class has no text attributes.
+        """
+
+        class_name = self.__class_name(cls)
+        with self.__lock.reading():
+            found = self.__text_index(class_name).search(text, limit)
+            partition = self.__index().get(class_name, {})
+            ranked = []
+            for score, object_id in found:
+                obj = partition[object_id]
+                if isinstance(obj, LazyRecord):
+                    obj = self.__materialize(class_name, object_id, obj)
+                ranked.append((score, obj))
+            return ranked
+
+    def having(self, cls, all_of=(), any_of=(), none_of=(),
+               attribute="amenity_ids"):
+        """
+        Get the objects of one class whose list attribute holds every
+        value of all_of, one of any_of and none of none_of, evaluating
+        the conditions on the bitsets of the bitmap index of the
+        attribute.
+
+        Args:
+            cls (type or str): The class, or class name, to select.
+            all_of (iterable): The values that must all be held.
+            any_of (iterable): The values one of which must be held, or
+                nothing to put no such condition.
+            none_of (iterable): The values that must not be held.
+            attribute (str): The name of the list attribute.
+
+        Returns:
+            dict: A dictionary of the matching objects.
+
+        Raises:
+            KeyError: If the attribute has no bitmap index.
+        """
+
+        class_name = self.__class_name(cls)
+        with self.__lock.reading():
+            ids = self.__bitmap_index(class_name, attribute).match(
+                all_of, any_of, none_of)
+            partition = self.__index().get(class_name, {})
+            return self.__materialize_all(
+                class_name,
+                {object_id: partition[object_id] for object_id in ids})
+
+    def select(self, query):
+        """
+        Get the objects matching a query, reading them through the
+        access path explain() describes.
+
+        Args:
+            query (Query): The query.
+
+        Returns:
+            list: The matching objects, in order and up to the limit.
+        """
+
+        return self.__plan(query)[1]()
+
+    def explain(self, query):
+        """
+        Describe how select() runs a query.
+
+        Args:
+            query (Query): The query.
+
+        Returns:
+            list: A line for each step of the plan, the access path
+            first.
+        """
+
+        return self.__plan(query)[0]
+
+    def __plan(self, query):
+        """
+        Choose the access path of a query: the hash index giving the
+        fewest objects for an equality, or else the column store for
+        numeric bounds, or else a scan of the class. Every condition is
+        then checked on the objects the path gives.
+
+        Args:
+            query (Query): The query.
+
+        Returns:
+            tuple: The description of the plan, and a function running
+            it.
+        """
+
+        class_name = query.class_name
+        with self.__lock.reading():
+            total = len(self.__index().get(class_name, {}))
+            lookup = None
+            for index in self.__class_indexes(class_name):
+                attribute = index.fields[0]
+                for value in query.equals(attribute):
+                    size = len(index.lookup(value))
+                    if lookup is None or size < lookup[0]:
+                        lookup = (size, attribute, value)
+        bounds = query.bounds(self.columns().get(class_name, ()))
+        if lookup is not None:
+            size, attribute, value = lookup
+            access = "index lookup {}.{} = {!r} ({} of {} rows)".format(
+                class_name, attribute, value, size, total)
+
+            def candidates():
+                return self.find(class_name, **{attribute: value}).values()
+        elif bounds:
+            access = "column store range {} ({} rows)".format(
+                " AND ".join("{} in [{}, {}]".format(name, *bound)
+                             for name, bound in bounds.items()), total)
+
+            def candidates():
+                return self.between(class_name, **bounds).values()
+        else:
+            access = "scan {} ({} rows)".format(class_name, total)
+
+            def candidates():
+                return self.stream(class_name)
+
+        def run():
+            return query.arrange(obj for obj in candidates()
+                                 if query.matches(obj))
+
+        return [access] + query.describe(), run
+
+    def aggregate(self, cls, function, attribute=None, group_by=None):
+        """
+        Compute an aggregate of the numeric values of one attribute over
+        the stored objects of one class, or over each group of them.
+        Ungrouped aggregates of an attribute of the column store run
+        over its array; the others take a single pass over the objects.
+
+        Args:
+            cls (type or str): The class, or class name, to aggregate.
+            function (str): One of "count", "sum", "avg", "min" or "max".
+            attribute (str): The name of the aggregated attribute, or
+                None to count the objects.
+            group_by (str): The name of the attribute whose values group
+                the objects, or None for a single group.
+
+        Returns:
+            The aggregate: an int for "count", a float otherwise, or None
+            for "avg", "min" and "max" of no value. With group_by, a
+            dictionary of each value to the aggregate of its group.
+
+        Raises:
+            ValueError: If the function is unknown, or is not "count"
+                and has no attribute.
+        """
+
+        class_name = self.__class_name(cls)
+        if group_by is None and function in Aggregate.functions:
+            if attribute is None and function == "count":
+                return self.count(class_name)
+            if attribute in self.columns().get(class_name, ()):
+                with self.__lock.reading():
+                    return self.column_store(class_name).aggregate(
+                        attribute, "mean" if function == "avg" else function)
+        return Aggregate.over(self.stream(class_name), function, attribute,
+                              group_by)
+
+    def count(self, cls=None):
+        """
+        Count the stored objects, or only those of one class.
+
+        Args:
+            cls (type or str): The class, or class name, to count.
+
+        Returns:
+            int: The number of objects.
+        """
+
+        with self.__lock.reading():
+            if cls is None:
+                return len(self.__objects)
+            return len(self.__index().get(self.__class_name(cls), {}))
+
+    def bulk_load(self, cls, path, format=None, workers=None):
+        """
+        Store the objects of one class read from an NDJSON or CSV file,
+        as one batch saved once at the end. The rows are converted by a
+        BulkLoader, and the instances built from the converted rows
+        without a save each. Every row is converted before the first
+        instance is stored, so that a bad row leaves the batch in
+        progress, if any, as it was.
+
+        Args:
+            cls (type or str): The class, or class name, of the objects.
+            path (str): The path of the file.
+            format (str): "ndjson" or "csv", guessed from the extension
+                of the file by default.
+            workers (int): The number of processes converting the rows,
+                by default one per CPU for large files.
+
+        Returns:
+            int: The number of objects stored.
+
+        Raises:
+            KeyError: If the class does not exist.
+            ValueError: If a row is malformed or a value has the wrong
+                type, in which case nothing is stored.
+        """
+
+        class_name = self.__class_name(cls)
+        model = self.classes()[class_name]
+        types = dict(self.attributes()["BaseModel"])
+        types.update(self.attributes().get(class_name, {}))
+        loader = BulkLoader(class_name, types,
+                            format or BulkLoader.format_of(path))
+        objects = []
+        for record in loader.records(path, workers):
+            obj = model.__new__(model)
+            obj.__dict__.update(record)
+            objects.append(obj)
+        with self.batch():
+            for obj in objects:
+                self.new(obj)
+        return len(objects)
+
+    def __encode(self):
+        """
+        Re-encode the JSON entries of the objects changed since the
+        last save and drop the entries of the deleted ones.
+
+        Returns:
+            dict: The cached entries, keyed like the stored objects.
+        """
+
+        fragments = self.__fragments
+        if FileStorage.__fragments_of is not self.__objects:
+            fragments.clear()
+            FileStorage.__fragments_of = self.__objects
+        for key in self.__deleted:
+            fragments.pop(key, None)
+        for key in self.__dirty:
+            if key in self.__objects:
+                self.__entry(key)
+        return fragments
+
+    def __entry(self, key):
+        """
+        Encode and cache the JSON entry of a stored object.
+
+        Args:
+            key (str): The key of the object.
+
+        Returns:
+            tuple: The JSON encodings of the key and of the object.
+        """
+
+        obj = self.__objects[key]
+        entry = (json.dumps(key), obj.encode() if isinstance(
+            obj, LazyRecord) else json.dumps(obj.to_dict()))
+        self.__fragments[key] = entry
+        return entry
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Run a block as one batch: the saves within it are deferred to a
+        single save at the end, and an exception rolls the batch back.
+
+        Yields:
+            FileStorage: The storage.
+        """
+
+        self.begin()
+        try:
+            yield self
+        except BaseException:
+            if self.in_batch():
+                self.rollback()
+            raise
+        self.commit()
+
+    def in_batch(self):
+        """
+        Tell whether a batch is in progress.
+
+        Returns:
+            bool: True if a batch is in progress.
+        """
+
+        return self.__batch_depth > 0
+
+    def begin(self):
+        """
+        Start a batch, or a nested batch within the one in progress.
+
+        The changes made before the batch are saved first, at once in
+        write-behind mode too. Until the outermost batch is committed,
+        save() does nothing and the previous value of each changed
+        attribute and stored object is kept in an undo log.
+        """
+
+        if not self.__batch_depth:
+            if self.__dirty or self.__deleted:
+                self.save()
+            self.flush()
+            FileStorage.__undo = UndoLog()
+        FileStorage.__batch_depth += 1
+
+    def commit(self):
+        """
+        End the innermost batch, and save the changes of the batch once
+        the outermost batch ends.
+
+        Raises:
+            RuntimeError: If no batch is in progress.
+        """
+
+        if not self.__batch_depth:
+            raise RuntimeError("No batch in progress")
+        FileStorage.__batch_depth -= 1
+        if not self.__batch_depth:
+            FileStorage.__undo = None
+            if self.__dirty or self.__deleted:
+                self.save()
+
+    def rollback(self):
+        """
+        End every batch in progress, restoring the attributes and the
+        stored objects they changed. Changes made in place, such as
+        appending to a list attribute, are not restored.
+
+        Raises:
+            RuntimeError: If no batch is in progress.
+        """
+
+        if not self.__batch_depth:
+            raise RuntimeError("No batch in progress")
+        undo = self.__undo
+        FileStorage.__batch_depth = 0
+        FileStorage.__undo = None
+        objects = dict(self.__objects)
+        fragments = self.__fragments
+
+        def restore(key, previous):
+            if previous is None:
+                objects.pop(key, None)
+            else:
+                objects[key] = previous
+
+        undo.undo(restore)
+        # nothing was saved during the batch, so the cached encodings
+        # still describe the restored objects
+        self.load(objects)
+        FileStorage.__fragments = fragments
 
     def save(self):
         """
-        Save the serialized objects to the file.
+        Save the serialized objects to the file, or append the changes
+        since the last save to the log in log mode. Within a batch the
+        save is deferred to the end of the batch, and in write-behind
+        mode to the background flusher.
+
+        Only the objects changed since the last save are serialized
+        again, the others are written from their cached JSON encoding.
+        """
+
+        if self.__batch_depth:
+            return
+        if not self.__write_behind or self.__stopping:
+            self.__save()
+            return
+        with self.__wake:
+            now = time.monotonic()
+            if self.__requested_at is None:
+                FileStorage.__requested_at = now
+            FileStorage.__touched_at = now
+            flusher = FileStorage.__flusher
+            if flusher is None or not flusher.is_alive():
+                flusher = threading.Thread(target=self.__flush_behind,
+                                           daemon=True)
+                FileStorage.__flusher = flusher
+                flusher.start()
+            self.__wake.notify_all()
+
+    def __save(self):
+        """
+        Take a snapshot of the changes under the state lock, then write
+        it to the file or to the log. In multi-process mode the changes
+        of the other processes are merged first, under the file lock.
+        """
+
+        with self.__save_lock, self.__file_lock(exclusive=True):
+            if self.__shared:
+                self.__sync()
+            with self.__lock.reading():
+                fragments = self.__encode()
+                if self.__journal:
+                    records = ['{{"op": "delete", "key": {}}}\n'.format(
+                        json.dumps(key)) for key in self.__deleted]
+                    records.extend(
+                        '{{"op": "put", "key": {}, "value": {}}}\n'.format(
+                            *fragments[key]) for key in self.__dirty
+                        if key in self.__objects)
+                else:
+                    entries = [(key, *(fragments[key] if key in fragments
+                                       else self.__entry(key)))
+                               for key in self.rewritten(
+                                   self.__dirty | self.__deleted)]
+                self.__dirty.clear()
+                self.__deleted.clear()
+            if not self.__journal:
+                with self.__compact_lock:
+                    self.write(entries)
+            elif records:
+                with self.__log_lock:
+                    with open(self.__log_path, "a",
+                              encoding="utf-8") as file:
+                        file.write("".join(records))
+                        log_bytes = file.tell()
+                    FileStorage.__log_records += len(records)
+                    log_records = FileStorage.__log_records
+                if log_bytes >= self.__max_log_bytes or \
+                        log_records >= self.__max_log_records:
+                    self.compact(wait=False)
+            FileStorage.__stamp = self.__disk_stamp()
+
+    def rewritten(self, changed):
+        """
+        Get the keys of the stored objects a save writes, which are all
+        of them since the storage file is rewritten whole. The caller
+        holds the read lock.
+
+        Args:
+            changed (set): The keys of the objects changed or deleted
+                since the last save.
+
+        Returns:
+            dict: The stored objects, whose keys are written in order.
+        """
+
+        return self.__objects
+
+    def write(self, entries):
+        """
+        Write a snapshot of the stored objects to a temporary file that
+        then replaces the storage file, and drop the mutation logs the
+        snapshot includes.
+
+        Args:
+            entries (iterable): The key, the JSON encoding of the key and
+                the JSON encoding of the object of each key rewritten()
+                returned.
         """
 
-        with open(self.__file_path, "w", encoding="utf-8") as file:
-            objects_to_serialize = {
-                key: value.to_dict() for key, value in self.__objects.items()}
-            json.dump(objects_to_serialize, file)
+        temporary_path = "{}.{}.tmp".format(self.__file_path, os.getpid())
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            file.write("{")
+            file.write(", ".join("{}: {}".format(key_json, value_json)
+                                 for key, key_json, value_json in entries))
+            file.write("}")
+        os.replace(temporary_path, self.__file_path)
+        for path in (self.__log_path, self.__log_path + ".compacting"):
+            if os.path.isfile(path):
+                os.remove(path)
+        FileStorage.__log_records = 0
@@ -0,0 +1,258 @@
+#!/usr/bin/python3
+"""GeoIndex class module"""
+import heapq
+import math
+
+
+class GeoIndex:
+    """
+    A grid index of the stored objects of one class by their latitude
+    and longitude, for radius and nearest neighbour searches that only
+    read the cells around a point.
+
+    The grid splits the globe into cells of a fixed number of degrees,
+    which divides 180. A search reads the cells of the bounding box of a
+    small radius, doubling it until enough objects are found within it
+    or the largest radius is reached, or half the circumference of the
+    Earth, beyond which the whole globe is within it. Objects whose
+    coordinates are not numbers, or are out of range, are not indexed.
+
+    Attributes:
+        radius (float): The mean radius of the Earth, in kilometers.
+        farthest (float): The distance to the antipode, in kilometers.
+        fields (tuple): The names of the latitude and longitude
+            attributes.
+        __degrees (float): The size of a cell in degrees.
+        __cells (dict): A dictionary of (row, column) cells to
+            dictionaries of ids to (latitude, longitude) tuples.
+        __cell_of (dict): The cell of each object id.
+    """
+
+    radius = 6371.0088
+    farthest = math.pi * radius
+
+    def __init__(self, latitude="latitude", longitude="longitude",
+                 degrees=0.5):
+        """
+        Initialize an empty index.
+
+        Args:
+            latitude (str): The name of the latitude attribute.
+            longitude (str): The name of the longitude attribute.
+            degrees (float): The size of a cell in degrees, a divisor of
+                180.
+        """
+
+        self.fields = (latitude, longitude)
+        self.__degrees = degrees
+        self.__cells = {}
+        self.__cell_of = {}
+
+    def __len__(self):
+        """
+        Get the number of indexed objects.
+
+        Returns:
+            int: The number of objects in the index.
+        """
+
+        return len(self.__cell_of)
+
+    @staticmethod
+    def coordinates(latitude, longitude):
+        """
+        Check a point.
+
+        Args:
+            latitude: The latitude, in degrees.
+            longitude: The longitude, in degrees.
+
+        Returns:
+            tuple: The (latitude, longitude) floats, or None if they are
+            not numbers within [-90, 90] and [-180, 180].
+        """
+
+        point = []
+        for value, limit in ((latitude, 90), (longitude, 180)):
+            if isinstance(value, bool) or \
+                    not isinstance(value, (int, float)) or \
+                    not -limit <= value <= limit:
+                return None
+            point.append(float(value))
+        return tuple(point)
+
+    @classmethod
+    def distance(cls, first, second):
+        """
+        Get the great-circle distance between two points.
+
+        Args:
+            first (tuple): The (latitude, longitude) of a point.
+            second (tuple): The (latitude, longitude) of the other one.
+
+        Returns:
+            float: The distance in kilometers.
+        """
+
+        latitude1, longitude1 = map(math.radians, first)
+        latitude2, longitude2 = map(math.radians, second)
+        half = math.sin((latitude2 - latitude1) / 2) ** 2 + \
+            math.cos(latitude1) * math.cos(latitude2) * \
+            math.sin((longitude2 - longitude1) / 2) ** 2
+        return 2 * cls.radius * math.asin(min(1.0, math.sqrt(half)))
+
+    @classmethod
+    def box(cls, point, km):
+        """
+        Get the bounding box of the points within a distance of a point.
+
+        Args:
+            point (tuple): The (latitude, longitude) of the point.
+            km (float): The distance in kilometers.
+
+        Returns:
+            tuple: The south and north latitudes, then the west and east
+            longitudes, which are None when the circle holds a pole, and
+            go past -180 or 180 when the box crosses the antimeridian.
+        """
+
+        angle = km / cls.radius
+        degrees = math.degrees(angle)
+        latitude, longitude = point
+        south = max(latitude - degrees, -90.0)
+        north = min(latitude + degrees, 90.0)
+        if abs(latitude) + degrees >= 90:
+            return south, north, None, None
+        width = math.degrees(math.asin(
+            math.sin(angle) / math.cos(math.radians(latitude))))
+        return south, north, longitude - width, longitude + width
+
+    def __cell(self, point):
+        """
+        Get the cell of a point.
+
+        Args:
+            point (tuple): The (latitude, longitude) of the point.
+
+        Returns:
+            tuple: The (row, column) of the cell, counted from the south
+            pole and from the antimeridian.
+        """
+
+        return (math.floor((point[0] + 90) / self.__degrees),
+                math.floor((point[1] + 180) % 360 / self.__degrees))
+
+    def put(self, object_id, obj):
+        """
+        Add an object to the index, or move it if it moved.
+
+        Args:
+            object_id (str): The id of the object.
+            obj: The object.
+        """
+
+        point = self.coordinates(*(getattr(obj, field, None)
+                                   for field in self.fields))
+        if point is None:
+            self.discard(object_id)
+            return
+        cell = self.__cell(point)
+        if self.__cell_of.get(object_id, cell) != cell:
+            self.discard(object_id)
+        self.__cells.setdefault(cell, {})[object_id] = point
+        self.__cell_of[object_id] = cell
+
+    def discard(self, object_id):
+        """
+        Remove an object from the index, if it is indexed.
+
+        Args:
+            object_id (str): The id of the object.
+        """
+
+        cell = self.__cell_of.pop(object_id, None)
+        if cell is None:
+            return
+        entry = self.__cells[cell]
+        del entry[object_id]
+        if not entry:
+            del self.__cells[cell]
+
+    def __within(self, point, km):
+        """
+        Get the objects within a distance of a point, reading the cells
+        of the bounding box of the circle, or the cells that hold objects
+        when there are fewer of them.
+
+        Args:
+            point (tuple): The (latitude, longitude) of the point.
+            km (float): The distance in kilometers.
+
+        Returns:
+            list: The (distance, object id) tuple of each object.
+        """
+
+        south, north, west, east = self.box(point, km)
+        rows = range(math.floor((south + 90) / self.__degrees),
+                     math.floor((north + 90) / self.__degrees) + 1)
+        count = round(360 / self.__degrees)
+        columns = range(count)
+        if west is not None:
+            first = math.floor((west + 180) / self.__degrees)
+            last = math.floor((east + 180) / self.__degrees)
+            if last - first + 1 < count:
+                columns = [column % count
+                           for column in range(first, last + 1)]
+        if len(rows) * len(columns) <= len(self.__cells):
+            entries = (self.__cells.get((row, column))
+                       for row in rows for column in columns)
+        else:
+            columns = set(columns)
+            entries = (entry for (row, column), entry in self.__cells.items()
+                       if row in rows and column in columns)
+        found = []
+        for entry in entries:
+            for object_id, other in (entry or {}).items():
+                distance = self.distance(point, other)
+                if distance <= km:
+                    found.append((distance, object_id))
+        return found
+
+    def nearest(self, latitude, longitude, km, limit=None):
+        """
+        Get the objects within a distance of a point, nearest first.
+
+        With a limit the search starts within the size of a cell and
+        doubles its radius until it finds enough objects, so that it
+        reads few cells when objects are near. Once the radius passes
+        the antipode the next search reads the whole of km.
+
+        Args:
+            latitude (float): The latitude of the point, in degrees.
+            longitude (float): The longitude of the point, in degrees.
+            km (float): The largest distance, in kilometers.
+            limit (int): The largest number of objects to return, or
+                None for all of them.
+
+        Returns:
+            list: The (distance, object id) tuple of each object, the
+            distance in kilometers.
+
+        Raises:
+            ValueError: If the point is invalid.
+        """
+
+        point = self.coordinates(latitude, longitude)
+        if point is None:
+            raise ValueError("Invalid point: {}, {}".format(
+                latitude, longitude))
+        if limit is None:
+            return sorted(self.__within(point, km))
+        if limit <= 0:
+            return []
+        reach = min(km, math.radians(self.__degrees) * self.radius)
+        while True:
+            found = self.__within(point, reach)
+            if len(found) >= limit or reach >= km:
+                return heapq.nsmallest(limit, found)
+            reach = min(km, reach * 2) if reach * 2 < self.farthest else km
@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""LazyRecord class module"""
+import datetime
+import json
+
+
+class LazyRecord:
+    """
+    A decoded storage record that has not been turned into an instance
+    yet.
+
+    Attribute access reads the decoded values, then the class defaults,
+    so indexes and filters can read a record like an instance. The dates
+    are read as datetimes, as the instance holds them.
+
+    Attributes:
+        cls (type): The class of the instance the record describes.
+        values (dict): The decoded dictionary of the instance.
+        dates (tuple): The names of the attributes holding dates.
+    """
+
+    __slots__ = ("cls", "values")
+    dates = ("created_at", "updated_at")
+
+    def __init__(self, cls, values):
+        """
+        Initialize a record.
+
+        Args:
+            cls (type): The class of the instance.
+            values (dict): The decoded dictionary of the instance.
+        """
+
+        self.cls = cls
+        self.values = values
+
+    def __getattr__(self, name):
+        """
+        Get a value of the record, or the class default.
+
+        Args:
+            name (str): The name of the attribute.
+
+        Returns:
+            The value of the attribute, as a datetime for the dates.
+        """
+
+        try:
+            value = self.values[name]
+        except KeyError:
+            return getattr(self.cls, name)
+        if name in self.dates and isinstance(value, str):
+            # reads the isoformat() of BaseModel.to_dict() many times
+            # faster than strptime()
+            return datetime.datetime.fromisoformat(value)
+        return value
+
+    def encode(self):
+        """
+        Get the JSON encoding of the record.
+
+        Returns:
+            str: The JSON encoding of the decoded values.
+        """
+
+        return json.dumps(self.values)
+
+    def materialize(self):
+        """
+        Build the instance the record describes.
+
+        Returns:
+            BaseModel: The instance.
+        """
+
+        return self.cls(**self.values)
@@ -0,0 +1,60 @@
+#!/usr/bin/python3
+"""MappedRecord class module"""
+import json
+from models.engine.lazy_record import LazyRecord
+
+
+class MappedRecord(LazyRecord):
+    """
+    A storage record that stays encoded in a memory-mapped file until
+    one of its values is read.
+
+    Attributes:
+        map (mmap): The mapped file holding the record.
+        offset (int): The position of the encoded record in the map.
+        length (int): The length of the encoded record.
+        decoded (dict): The decoded values, once read.
+    """
+
+    __slots__ = ("map", "offset", "length", "decoded")
+
+    def __init__(self, cls, map, offset, length):
+        """
+        Initialize a record.
+
+        Args:
+            cls (type): The class of the instance.
+            map (mmap): The mapped file holding the record.
+            offset (int): The position of the encoded record in the map.
+            length (int): The length of the encoded record.
+        """
+
+        self.cls = cls
+        self.map = map
+        self.offset = offset
+        self.length = length
+        self.decoded = None
+
+    @property
+    def values(self):
+        """
+        Get the decoded values of the record, decoding them once.
+
+        Returns:
+            dict: The decoded dictionary of the instance.
+        """
+
+        if self.decoded is None:
+            self.decoded = json.loads(self.encode())
+        return self.decoded
+
+    def encode(self):
+        """
+        Get the JSON encoding of the record without decoding it.
+
+        Returns:
+            str: The JSON encoding read from the map.
+        """
+
+        return self.map[self.offset:self.offset + self.length].decode(
+            "utf-8")
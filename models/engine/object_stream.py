@@ -0,0 +1,132 @@
+#!/usr/bin/python3
+"""ObjectStream class module"""
+import json
+
+
+class ObjectStream:
+    """
+    An incremental reader of a JSON object from a text file, which
+    decodes one key/value pair at a time instead of the whole object.
+
+    Attributes:
+        __file: The text file to read.
+        __chunk_size (int): The number of characters read at a time.
+        __decoder (JSONDecoder): The decoder of the keys and values.
+        __buffer (str): The characters read but not consumed yet.
+        __position (int): The position of the next character to
+            consume in the buffer.
+        __eof (bool): Whether the whole file has been read.
+    """
+
+    __whitespace = " \t\n\r"
+
+    def __init__(self, file, chunk_size=1 << 16):
+        """
+        Initialize a reader.
+
+        Args:
+            file: The text file to read, positioned at the object.
+            chunk_size (int): The number of characters read at a time.
+        """
+
+        self.__file = file
+        self.__chunk_size = chunk_size
+        self.__decoder = json.JSONDecoder()
+        self.__buffer = ""
+        self.__position = 0
+        self.__eof = False
+
+    def __iter__(self):
+        """
+        Iterate over the members of the object.
+
+        Yields:
+            tuple: The key and the decoded value of each member.
+
+        Raises:
+            ValueError: If the file does not hold a JSON object.
+        """
+
+        if self.__next() != "{":
+            raise ValueError("Expecting '{' at the start of the file")
+        self.__position += 1
+        first = True
+        while True:
+            character = self.__next()
+            if character == "}":
+                return
+            if not first:
+                if character != ",":
+                    raise ValueError(
+                        "Expecting ',' or '}}', got {!r}".format(character))
+                self.__position += 1
+                self.__next()
+            first = False
+            key = self.__decode()
+            if not isinstance(key, str):
+                raise ValueError("Expecting a string key, got {!r}".format(
+                    key))
+            if self.__next() != ":":
+                raise ValueError("Expecting ':' after {!r}".format(key))
+            self.__position += 1
+            self.__next()
+            yield key, self.__decode()
+
+    def __read(self):
+        """
+        Read the next chunk of the file into the buffer.
+
+        Returns:
+            bool: False if the end of the file was reached.
+        """
+
+        if self.__eof:
+            return False
+        chunk = self.__file.read(self.__chunk_size)
+        if not chunk:
+            self.__eof = True
+            return False
+        self.__buffer = self.__buffer[self.__position:] + chunk
+        self.__position = 0
+        return True
+
+    def __next(self):
+        """
+        Skip whitespace and peek at the next character.
+
+        Returns:
+            str: The next character, or "" at the end of the file.
+        """
+
+        while True:
+            buffer = self.__buffer
+            position = self.__position
+            while position < len(buffer) and \
+                    buffer[position] in self.__whitespace:
+                position += 1
+            self.__position = position
+            if position < len(buffer):
+                return buffer[position]
+            if not self.__read():
+                return ""
+
+    def __decode(self):
+        """
+        Decode the JSON value at the current position, reading more of
+        the file until the value is complete.
+
+        Returns:
+            The decoded value.
+        """
+
+        while True:
+            try:
+                value, end = self.__decoder.raw_decode(self.__buffer,
+                                                       self.__position)
+            except json.JSONDecodeError:
+                if not self.__read():
+                    raise
+                continue
+            if end < len(self.__buffer) or not self.__read():
+                self.__position = end
+                return value
@@ -0,0 +1,208 @@
+#!/usr/bin/python3
+"""Query class module"""
+import itertools
+import operator
+
+
+class Query:
+    """
+    A query over the stored objects of one class: conditions that must
+    all hold, an order and a limit. A query is immutable; where(),
+    order_by() and limit() return a new one.
+
+    Attributes:
+        class_name (str): The name of the class to select.
+        conditions (tuple): The (attribute, operator, value) tuple of
+            each condition, the operator being one of "=", "!=", "<",
+            "<=", ">" and ">=".
+        order (tuple): The (attribute, descending) tuple of each sort
+            key, the first one being the primary key.
+        row_limit (int): The largest number of objects to return, or
+            None for all of them.
+    """
+
+    operators = {"=": operator.eq, "!=": operator.ne, "<": operator.lt,
+                 "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+
+    def __init__(self, cls, conditions=(), order=(), row_limit=None):
+        """
+        Initialize a query.
+
+        Args:
+            cls (type or str): The class, or class name, to select.
+            conditions (iterable): The (attribute, operator, value)
+                tuple of each condition.
+            order (iterable): The (attribute, descending) tuple of each
+                sort key.
+            row_limit (int): The largest number of objects to return.
+
+        Raises:
+            ValueError: If an operator is unknown or the limit is
+                negative.
+        """
+
+        self.class_name = cls if isinstance(cls, str) else cls.__name__
+        self.conditions = tuple(conditions)
+        self.order = tuple(order)
+        self.row_limit = row_limit
+        for attribute, name, value in self.conditions:
+            if name not in self.operators:
+                raise ValueError("Unknown operator {!r}".format(name))
+        if row_limit is not None and row_limit < 0:
+            raise ValueError("The limit must not be negative")
+
+    def where(self, *conditions, **equals):
+        """
+        Add conditions.
+
+        Args:
+            *conditions: (attribute, operator, value) tuples.
+            **equals: The attribute names and the values they must
+                equal.
+
+        Returns:
+            Query: The query with the conditions added.
+        """
+
+        return Query(self.class_name, self.conditions + conditions + tuple(
+            (attribute, "=", value) for attribute, value in equals.items()),
+            self.order, self.row_limit)
+
+    def order_by(self, *attributes):
+        """
+        Add sort keys.
+
+        Args:
+            *attributes: The name of each attribute to sort by, prefixed
+                with "-" to sort in descending order.
+
+        Returns:
+            Query: The query with the sort keys added.
+        """
+
+        return Query(self.class_name, self.conditions, self.order + tuple(
+            (attribute.lstrip("-"), attribute.startswith("-"))
+            for attribute in attributes), self.row_limit)
+
+    def limit(self, row_limit):
+        """
+        Set the largest number of objects to return.
+
+        Args:
+            row_limit (int): The limit.
+
+        Returns:
+            Query: The query with the limit set.
+        """
+
+        return Query(self.class_name, self.conditions, self.order,
+                     row_limit)
+
+    def equals(self, attribute):
+        """
+        Get the values an attribute must equal.
+
+        Args:
+            attribute (str): The name of the attribute.
+
+        Returns:
+            list: The value of each "=" condition on the attribute.
+        """
+
+        return [value for name, op, value in self.conditions
+                if name == attribute and op == "="]
+
+    def bounds(self, attributes):
+        """
+        Get the inclusive numeric bounds the conditions set on some
+        attributes. Strict bounds are returned as inclusive ones, which
+        matches() then narrows.
+
+        Args:
+            attributes (iterable): The names of the attributes.
+
+        Returns:
+            dict: The attribute names and (low, high) tuples, None
+            meaning unbounded, of the attributes with bounds.
+        """
+
+        bounds = {}
+        for attribute, op, value in self.conditions:
+            if attribute not in attributes or op == "!=" or isinstance(
+                    value, bool) or not isinstance(value, (int, float)):
+                continue
+            low, high = bounds.get(attribute, (None, None))
+            if op in ("=", ">", ">=") and (low is None or value > low):
+                low = value
+            if op in ("=", "<", "<=") and (high is None or value < high):
+                high = value
+            bounds[attribute] = (low, high)
+        return bounds
+
+    def matches(self, obj):
+        """
+        Tell whether an object meets every condition. A condition
+        comparing values that cannot be compared does not hold.
+
+        Args:
+            obj: The object.
+
+        Returns:
+            bool: True if the object meets the conditions.
+        """
+
+        for attribute, op, value in self.conditions:
+            try:
+                if not self.operators[op](getattr(obj, attribute, None),
+                                          value):
+                    return False
+            except TypeError:
+                return False
+        return True
+
+    def arrange(self, objects):
+        """
+        Sort and limit the objects meeting the conditions.
+
+        Args:
+            objects (iterable): The objects meeting the conditions.
+
+        Returns:
+            list: The objects in order, up to the limit.
+
+        Raises:
+            TypeError: If the values of a sort key cannot be compared.
+        """
+
+        if not self.order:
+            if self.row_limit is None:
+                return list(objects)
+            return list(itertools.islice(objects, self.row_limit))
+        objects = list(objects)
+        for attribute, descending in reversed(self.order):
+            objects.sort(key=lambda obj: (
+                getattr(obj, attribute, None) is None,
+                getattr(obj, attribute, None)), reverse=descending)
+        return objects[:self.row_limit]
+
+    def describe(self):
+        """
+        Describe the steps that follow the access to the objects.
+
+        Returns:
+            list: A line for the filter, the sort and the limit, as far
+            as the query has them.
+        """
+
+        steps = []
+        if self.conditions:
+            steps.append("filter " + " AND ".join(
+                "{} {} {!r}".format(*condition)
+                for condition in self.conditions))
+        if self.order:
+            steps.append("sort by " + ", ".join(
+                attribute + (" DESC" if descending else "")
+                for attribute, descending in self.order))
+        if self.row_limit is not None:
+            steps.append("limit {}".format(self.row_limit))
+        return steps
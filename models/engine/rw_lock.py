@@ -0,0 +1,127 @@
+#!/usr/bin/python3
+"""RWLock class module"""
+import contextlib
+import threading
+
+
+class RWLock:
+    """
+    A readers-writer lock: any number of threads may read at once, or a
+    single thread may write.
+
+    Waiting writers go before new readers, so that a steady stream of
+    readers cannot starve them. Both sides are reentrant, and the writer
+    may also read; a reader may not become the writer, which would
+    deadlock against another reader doing the same.
+
+    Attributes:
+        __condition (Condition): Guards the counts and signals releases.
+        __readers (int): The number of read acquisitions held.
+        __writer (int): The identifier of the writing thread, or None.
+        __writes (int): The number of write acquisitions the writer
+            holds.
+        __waiting (int): The number of threads waiting to write.
+        __local (local): The number of read acquisitions each thread
+            holds.
+    """
+
+    def __init__(self):
+        """
+        Initialize an unlocked lock.
+        """
+
+        self.__condition = threading.Condition(threading.Lock())
+        self.__readers = 0
+        self.__writer = None
+        self.__writes = 0
+        self.__waiting = 0
+        self.__local = threading.local()
+
+    def acquire_read(self):
+        """
+        Acquire the lock for reading, waiting while a thread writes or
+        waits to write, unless this thread already holds the lock.
+        """
+
+        depth = getattr(self.__local, "depth", 0)
+        with self.__condition:
+            if not depth and self.__writer != threading.get_ident():
+                while self.__writer is not None or self.__waiting:
+                    self.__condition.wait()
+            self.__readers += 1
+        self.__local.depth = depth + 1
+
+    def release_read(self):
+        """
+        Release one read acquisition.
+        """
+
+        self.__local.depth -= 1
+        with self.__condition:
+            self.__readers -= 1
+            if not self.__readers:
+                self.__condition.notify_all()
+
+    def acquire_write(self):
+        """
+        Acquire the lock for writing, waiting until no other thread
+        holds it.
+
+        Raises:
+            RuntimeError: If this thread holds the lock for reading only.
+        """
+
+        thread = threading.get_ident()
+        with self.__condition:
+            if self.__writer == thread:
+                self.__writes += 1
+                return
+            if getattr(self.__local, "depth", 0):
+                raise RuntimeError("Cannot upgrade a read lock")
+            self.__waiting += 1
+            while self.__writer is not None or self.__readers:
+                self.__condition.wait()
+            self.__waiting -= 1
+            self.__writer = thread
+            self.__writes = 1
+
+    def release_write(self):
+        """
+        Release one write acquisition.
+        """
+
+        with self.__condition:
+            self.__writes -= 1
+            if not self.__writes:
+                self.__writer = None
+                self.__condition.notify_all()
+
+    @contextlib.contextmanager
+    def reading(self):
+        """
+        Hold the lock for reading within a block.
+
+        Yields:
+            RWLock: The lock.
+        """
+
+        self.acquire_read()
+        try:
+            yield self
+        finally:
+            self.release_read()
+
+    @contextlib.contextmanager
+    def writing(self):
+        """
+        Hold the lock for writing within a block.
+
+        Yields:
+            RWLock: The lock.
+        """
+
+        self.acquire_write()
+        try:
+            yield self
+        finally:
+            self.release_write()
@@ -0,0 +1,348 @@
+#!/usr/bin/python3
+"""ShardedStorage class module"""
+import concurrent.futures
+import itertools
+import json
+import multiprocessing
+import os
+import zlib
+from models.engine.file_storage import FileStorage
+from models.engine.lazy_record import LazyRecord
+from models.engine.object_stream import ObjectStream
+
+
+class ShardedStorage(FileStorage):
+    """
+    A storage engine keeping the objects in a directory of JSON shard
+    files, so that a reload decodes the shards in parallel and a save
+    rewrites only the shards holding changed objects.
+
+    Each object belongs to the shard given by the CRC-32 of its key,
+    modulo the number of shards. A shard file holds a JSON object like
+    the storage file of FileStorage. The manifest names the file of each
+    shard, or null for an empty one, and is replaced atomically once
+    the new shard files are written, under new names, so that a reader
+    always finds a complete generation of the shards.
+
+    Attributes:
+        __directory (str): The path to the shard directory.
+        __shards (int): The number of shards of a new directory.
+        __files (list): The file name of each shard, or None.
+        __generation (int): The number of saves of the directory.
+        __members (list): The keys of each shard as of the next write.
+        __members_of (dict): The object dictionary the members describe.
+        __stale (set): The shards to rewrite at the next write.
+    """
+
+    __directory = "file.shards"
+    __shards = 16
+    __files = []
+    __generation = 0
+    __members = []
+    __members_of = None
+    __stale = set()
+    __pool_bytes = 1 << 20
+
+    def journal(self, enabled=True, max_bytes=None, max_records=None):
+        """
+        Refuse the append-only log mode, which the shards do not
+        support.
+
+        Args:
+            enabled (bool): True to append to the log on save.
+            max_bytes (int): Log size that triggers a compaction.
+            max_records (int): Log length that triggers a compaction.
+
+        Raises:
+            ValueError: If enabled is True.
+        """
+
+        if enabled:
+            raise ValueError("ShardedStorage has no log mode")
+
+    def share(self, enabled=True):
+        """
+        Refuse the multi-process mode, which the shards do not support.
+
+        Args:
+            enabled (bool): True to lock and merge on save.
+
+        Raises:
+            ValueError: If enabled is True.
+        """
+
+        if enabled:
+            raise ValueError("ShardedStorage has no multi-process mode")
+
+    @staticmethod
+    def shard_of(key, shards):
+        """
+        Get the shard of a key.
+
+        Args:
+            key (str): The key of an object.
+            shards (int): The number of shards.
+
+        Returns:
+            int: The shard, from 0 to shards - 1.
+        """
+
+        return zlib.crc32(key.encode("utf-8")) % shards
+
+    @staticmethod
+    def __read_manifest(directory):
+        """
+        Read the manifest of a shard directory.
+
+        Args:
+            directory (str): The path to the shard directory.
+
+        Returns:
+            tuple: The file name of each shard, or None, and the
+            generation, or None if the directory has no manifest.
+        """
+
+        try:
+            with open(os.path.join(directory, "manifest.json"), "r",
+                      encoding="utf-8") as file:
+                manifest = json.load(file)
+        except FileNotFoundError:
+            return None
+        return manifest["shards"], manifest["generation"]
+
+    @staticmethod
+    def __write_manifest(directory, files, generation):
+        """
+        Replace the manifest of a shard directory, then remove the shard
+        files it does not name.
+
+        Args:
+            directory (str): The path to the shard directory.
+            files (list): The file name of each shard, or None.
+            generation (int): The number of saves of the directory.
+        """
+
+        temporary_path = os.path.join(directory, "manifest.json.tmp")
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump({"version": 1, "generation": generation,
+                       "shards": files}, file)
+        os.replace(temporary_path, os.path.join(directory, "manifest.json"))
+        for name in os.listdir(directory):
+            if name.startswith("shard-") and name not in files:
+                os.remove(os.path.join(directory, name))
+
+    @classmethod
+    def decode(cls, path, lazy=False):
+        """
+        Decode a shard file, in a worker process of reload().
+
+        Args:
+            path (str): The path to the shard file.
+            lazy (bool): True to return the decoded records rather than
+                the instances.
+
+        Returns:
+            dict: The instances, or the records, of the shard by key.
+        """
+
+        with open(path, "r", encoding="utf-8") as file:
+            values = json.load(file)
+        if lazy:
+            return values
+        classes = cls().classes()
+        return {key: classes[value["__class__"]](**value)
+                for key, value in values.items()}
+
+    def reload(self, workers=None):
+        """
+        Decode the shards named by the manifest, if there is one, across
+        a process pool, and store their objects.
+
+        The instances are built in the worker processes, which is most
+        of the cost of a reload, and handed back pickled. In lazy mode
+        the workers only decode the JSON. The workers inherit
+        HBNB_RELOAD_WORKER=1, so that importing the models package does
+        not reload the storage in them, which the spawn and forkserver
+        start methods would do before they decode their shards.
+
+        Args:
+            workers (int): The number of processes decoding the shards,
+                by default one per CPU, up to one per shard, when they
+                hold 1 MiB or more. 0 or 1 decodes them in this process.
+        """
+
+        manifest = self.__read_manifest(self.__directory)
+        if manifest is None:
+            ShardedStorage.__files = [None] * self.__shards
+            ShardedStorage.__generation = 0
+            ShardedStorage.__members = [set() for i in range(self.__shards)]
+            ShardedStorage.__stale = set()
+            self.load({})
+            ShardedStorage.__members_of = super().rewritten(set())
+            return
+        files, generation = manifest
+        paths = [os.path.join(self.__directory, name)
+                 for name in files if name is not None]
+        if workers is None:
+            workers = min(os.cpu_count() or 1, len(paths)) if sum(
+                map(os.path.getsize, paths)) >= self.__pool_bytes else 0
+        if multiprocessing.parent_process() is not None:
+            workers = 0  # no pool within the workers of another pool
+        lazy = self.is_lazy()
+        if workers <= 1:
+            decoded = map(self.decode, paths, itertools.repeat(lazy))
+        else:
+            os.environ["HBNB_RELOAD_WORKER"] = "1"
+            try:
+                with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+                    decoded = iter(list(pool.map(self.decode, paths,
+                                                 itertools.repeat(lazy))))
+            finally:
+                del os.environ["HBNB_RELOAD_WORKER"]
+        classes = self.classes()
+        objects = {}
+        members = []
+        for name in files:
+            shard = next(decoded) if name is not None else {}
+            if lazy:
+                shard = {key: LazyRecord(classes[value["__class__"]], value)
+                         for key, value in shard.items()}
+            objects.update(shard)
+            members.append(set(shard))
+        ShardedStorage.__files = files
+        ShardedStorage.__generation = generation
+        ShardedStorage.__members = members
+        ShardedStorage.__stale = set()
+        self.load(objects)
+        ShardedStorage.__members_of = super().rewritten(set())
+
+    def rewritten(self, changed):
+        """
+        Get the keys of the stored objects a save writes, which are those
+        of the shards holding changed objects, or all of them if the
+        object dictionary was replaced. The caller holds the read lock.
+
+        Args:
+            changed (set): The keys of the objects changed or deleted
+                since the last save.
+
+        Returns:
+            list: The keys of the shards to rewrite.
+        """
+
+        stored = super().rewritten(changed)
+        members = self.__members
+        if stored is not self.__members_of:
+            for shard, keys in enumerate(members):
+                keys.clear()
+                self.__stale.add(shard)
+            for key in stored:
+                members[self.shard_of(key, len(members))].add(key)
+            ShardedStorage.__members_of = stored
+        for key in changed:
+            shard = self.shard_of(key, len(members))
+            self.__stale.add(shard)
+            if key in stored:
+                members[shard].add(key)
+            else:
+                members[shard].discard(key)
+        return [key for shard in sorted(self.__stale)
+                for key in members[shard]]
+
+    def write(self, entries):
+        """
+        Write the shards to rewrite to new files, then the manifest that
+        names them. Nothing is written if no object changed.
+
+        Args:
+            entries (iterable): The key, the JSON encoding of the key and
+                the JSON encoding of the object of each key rewritten()
+                returned.
+        """
+
+        if not self.__stale:
+            return
+        count = len(self.__members)
+        generation = self.__generation + 1
+        files = list(self.__files)
+        os.makedirs(self.__directory, exist_ok=True)
+        shards = {shard: [] for shard in self.__stale}
+        for key, key_json, value_json in entries:
+            shards[self.shard_of(key, count)].append(
+                "{}: {}".format(key_json, value_json))
+        for shard, lines in shards.items():
+            if not lines:
+                files[shard] = None
+                continue
+            files[shard] = "shard-{:03d}.{}.json".format(shard, generation)
+            with open(os.path.join(self.__directory, files[shard]), "w",
+                      encoding="utf-8") as file:
+                file.write("{")
+                file.write(", ".join(lines))
+                file.write("}")
+        self.__write_manifest(self.__directory, files, generation)
+        ShardedStorage.__files = files
+        ShardedStorage.__generation = generation
+        self.__stale.clear()
+
+    @classmethod
+    def from_json(cls, json_path, directory, shards=16):
+        """
+        Convert a JSON storage file to a shard directory, reading one
+        object at a time.
+
+        Args:
+            json_path (str): The path to the JSON file.
+            directory (str): The path to the shard directory.
+            shards (int): The number of shards.
+        """
+
+        os.makedirs(directory, exist_ok=True)
+        files = ["shard-{:03d}.1.json".format(shard)
+                 for shard in range(shards)]
+        outputs = [open(os.path.join(directory, name), "w",
+                        encoding="utf-8") for name in files]
+        empty = [True] * shards
+        try:
+            with open(json_path, "r", encoding="utf-8") as file:
+                for key, value in ObjectStream(file):
+                    shard = cls.shard_of(key, shards)
+                    outputs[shard].write("{}{}: {}".format(
+                        "{" if empty[shard] else ", ", json.dumps(key),
+                        json.dumps(value)))
+                    empty[shard] = False
+        finally:
+            for output, is_empty in zip(outputs, empty):
+                output.write("{}" if is_empty else "}")
+                output.close()
+        cls.__write_manifest(directory, [
+            None if is_empty else name
+            for name, is_empty in zip(files, empty)], 1)
+
+    @classmethod
+    def to_json(cls, directory, json_path):
+        """
+        Convert a shard directory to a JSON storage file, one shard at a
+        time.
+
+        Args:
+            directory (str): The path to the shard directory.
+            json_path (str): The path to the JSON file.
+        """
+
+        manifest = cls.__read_manifest(directory)
+        files = manifest[0] if manifest is not None else []
+        with open(json_path, "w", encoding="utf-8") as file:
+            separator = "{"
+            for name in files:
+                if name is None:
+                    continue
+                with open(os.path.join(directory, name), "r",
+                          encoding="utf-8") as shard:
+                    for key, value in ObjectStream(shard):
+                        file.write("{}{}: {}".format(
+                            separator, json.dumps(key), json.dumps(value)))
+                        separator = ", "
+            if separator == "{":
+                file.write("{")
+            file.write("}")
@@ -0,0 +1,307 @@
+#!/usr/bin/python3
+"""TextIndex class module"""
+import array
+import heapq
+import math
+import re
+
+
+class TextIndex:
+    """
+    An inverted index of the words of the text attributes of the stored
+    objects of one class, ranking the matches of a search with BM25.
+
+    Each object is a document numbered by an ordinal. The postings of a
+    word are kept in a bytearray of variable-length integers: for each
+    document, the gap from the previous ordinal, the number of
+    occurrences, then the gaps between the positions of the word. The
+    attributes of a document follow one another, a position apart so
+    that a phrase never spans two of them.
+
+    Changing an object gives it a new ordinal, and removing it leaves
+    its postings behind as dead entries, which searches skip. Once the
+    dead documents outnumber the live ones, the postings are rewritten
+    without them.
+
+    Attributes:
+        fields (tuple): The names of the text attributes.
+        __ordinal_of (dict): The ordinal of each object id.
+        __ids (list): The object id of each ordinal, or None once the
+            document is removed.
+        __lengths (array): The number of words of each document, 0 once
+            it is removed.
+        __postings (dict): The postings of each word.
+        __last (dict): The last ordinal in the postings of each word.
+        __total (int): The number of words of the live documents.
+        __dead (int): The number of removed documents.
+    """
+
+    k1 = 1.2
+    b = 0.75
+    words = re.compile(r"\w+")
+    phrases = re.compile(r'"([^"]*)"|(\w+)')
+
+    def __init__(self, fields):
+        """
+        Initialize an empty index.
+
+        Args:
+            fields (iterable): The names of the text attributes.
+        """
+
+        self.fields = tuple(fields)
+        self.__ordinal_of = {}
+        self.__ids = []
+        self.__lengths = array.array("I")
+        self.__postings = {}
+        self.__last = {}
+        self.__total = 0
+        self.__dead = 0
+
+    def __len__(self):
+        """
+        Get the number of documents.
+
+        Returns:
+            int: The number of objects in the index.
+        """
+
+        return len(self.__ordinal_of)
+
+    @classmethod
+    def tokens(cls, text):
+        """
+        Split a text into lowercase words.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            list: The words, in order.
+        """
+
+        return cls.words.findall(text.lower())
+
+    @classmethod
+    def parse(cls, text):
+        """
+        Split a search into phrases, which are the quoted parts, and
+        single words.
+
+        Args:
+            text (str): The search.
+
+        Returns:
+            list: The list of the words of each phrase or single word.
+        """
+
+        terms = []
+        for phrase, word in cls.phrases.findall(text):
+            words = cls.tokens(phrase or word)
+            if words:
+                terms.append(words)
+        return terms
+
+    @staticmethod
+    def __encode(data, number):
+        """
+        Append a variable-length integer to a bytearray.
+
+        Args:
+            data (bytearray): The bytes.
+            number (int): The non-negative integer.
+        """
+
+        while number >= 0x80:
+            data.append(number & 0x7F | 0x80)
+            number >>= 7
+        data.append(number)
+
+    @staticmethod
+    def __decode(data):
+        """
+        Iterate over the variable-length integers of a bytearray.
+
+        Args:
+            data (bytearray): The bytes.
+
+        Yields:
+            int: Each integer.
+        """
+
+        number = shift = 0
+        for byte in data:
+            number |= (byte & 0x7F) << shift
+            if byte & 0x80:
+                shift += 7
+            else:
+                yield number
+                number = shift = 0
+
+    def __entries(self, word):
+        """
+        Iterate over the live documents holding a word.
+
+        Args:
+            word (str): The word.
+
+        Yields:
+            tuple: The ordinal of each document and the positions of the
+            word in it.
+        """
+
+        numbers = self.__decode(self.__postings.get(word, b""))
+        ordinal = 0
+        for gap in numbers:
+            ordinal += gap
+            position = 0
+            positions = []
+            for index in range(next(numbers)):
+                position += next(numbers)
+                positions.append(position)
+            if self.__ids[ordinal] is not None:
+                yield ordinal, positions
+
+    def put(self, object_id, obj):
+        """
+        Add an object to the index, or index it again.
+
+        Args:
+            object_id (str): The id of the object.
+            obj: The object.
+        """
+
+        self.discard(object_id)
+        positions = {}
+        position = 0
+        for field in self.fields:
+            value = getattr(obj, field, None)
+            if not isinstance(value, str):
+                continue
+            for word in self.tokens(value):
+                positions.setdefault(word, []).append(position)
+                position += 1
+            position += 1
+        if not positions:
+            return
+        ordinal = len(self.__ids)
+        self.__ids.append(object_id)
+        self.__ordinal_of[object_id] = ordinal
+        length = sum(map(len, positions.values()))
+        self.__lengths.append(length)
+        self.__total += length
+        for word, places in positions.items():
+            data = self.__postings.get(word)
+            if data is None:
+                data = self.__postings[word] = bytearray()
+            self.__encode(data, ordinal - self.__last.get(word, 0))
+            self.__encode(data, len(places))
+            previous = 0
+            for place in places:
+                self.__encode(data, place - previous)
+                previous = place
+            self.__last[word] = ordinal
+
+    def discard(self, object_id):
+        """
+        Remove an object from the index, if it is indexed.
+
+        Args:
+            object_id (str): The id of the object.
+        """
+
+        ordinal = self.__ordinal_of.pop(object_id, None)
+        if ordinal is None:
+            return
+        self.__ids[ordinal] = None
+        self.__total -= self.__lengths[ordinal]
+        self.__lengths[ordinal] = 0
+        self.__dead += 1
+        if self.__dead > 1000 and self.__dead > len(self.__ordinal_of):
+            self.__compact()
+
+    def __compact(self):
+        """
+        Rewrite the postings without the removed documents, numbering
+        the live ones from 0.
+        """
+
+        renumbered = {}
+        ids = []
+        lengths = array.array("I")
+        for ordinal, object_id in enumerate(self.__ids):
+            if object_id is not None:
+                renumbered[ordinal] = len(ids)
+                self.__ordinal_of[object_id] = len(ids)
+                ids.append(object_id)
+                lengths.append(self.__lengths[ordinal])
+        postings = {}
+        last = {}
+        for word in self.__postings:
+            data = bytearray()
+            previous_ordinal = 0
+            for ordinal, positions in self.__entries(word):
+                ordinal = renumbered[ordinal]
+                self.__encode(data, ordinal - previous_ordinal)
+                self.__encode(data, len(positions))
+                previous = 0
+                for position in positions:
+                    self.__encode(data, position - previous)
+                    previous = position
+                previous_ordinal = ordinal
+            if data:
+                postings[word] = data
+                last[word] = previous_ordinal
+        self.__ids = ids
+        self.__lengths = lengths
+        self.__postings = postings
+        self.__last = last
+        self.__dead = 0
+
+    def search(self, text, limit=None):
+        """
+        Rank the documents holding any word or phrase of a search with
+        BM25. A phrase counts where its words follow one another.
+
+        Args:
+            text (str): The search: words, and phrases between double
+                quotes.
+            limit (int): The largest number of objects to return, or
+                None for all of them.
+
+        Returns:
+            list: The (score, object id) tuple of each matching object,
+            best first.
+        """
+
+        count = len(self.__ordinal_of)
+        if not count:
+            return []
+        average = self.__total / count
+        scores = {}
+        for words in self.parse(text):
+            matches = dict(self.__entries(words[0]))
+            for offset, word in enumerate(words[1:], 1):
+                following = dict(self.__entries(word))
+                narrowed = {}
+                for ordinal, positions in matches.items():
+                    after = set(following.get(ordinal, ()))
+                    positions = [position for position in positions
+                                 if position + offset in after]
+                    if positions:
+                        narrowed[ordinal] = positions
+                matches = narrowed
+            idf = math.log(1 + (count - len(matches) + 0.5) /
+                           (len(matches) + 0.5))
+            for ordinal, positions in matches.items():
+                frequency = len(positions)
+                norm = self.k1 * (1 - self.b + self.b *
+                                  self.__lengths[ordinal] / average)
+                scores[ordinal] = scores.get(ordinal, 0.0) + idf * \
+                    frequency * (self.k1 + 1) / (frequency + norm)
+        ranked = ((score, self.__ids[ordinal])
+                  for ordinal, score in scores.items())
+        if limit is None:
+            return sorted(ranked, key=lambda pair: (-pair[0], pair[1]))
+        return heapq.nsmallest(limit, ranked,
+                               key=lambda pair: (-pair[0], pair[1]))
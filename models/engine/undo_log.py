@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+"""UndoLog class module"""
+
+
+class UndoLog:
+    """
+    A log of the previous state of what a batch changes, replayed
+    backwards to roll the batch back.
+
+    The log holds two kinds of entries: the previous value of an
+    attribute of an object, and the previous storage entry of a key.
+
+    Attributes:
+        __entries (list): The entries, oldest first, as (object, name,
+            value) tuples, where object is None for storage entries.
+    """
+
+    __missing = object()
+
+    def __init__(self):
+        """
+        Initialize an empty log.
+        """
+
+        self.__entries = []
+
+    def __len__(self):
+        """
+        Get the number of entries.
+
+        Returns:
+            int: The number of entries in the log.
+        """
+
+        return len(self.__entries)
+
+    def attribute(self, obj, name):
+        """
+        Record the value of an attribute before it changes.
+
+        Args:
+            obj: The object.
+            name (str): The name of the attribute.
+        """
+
+        self.__entries.append((obj, name,
+                               obj.__dict__.get(name, self.__missing)))
+
+    def entry(self, key, previous):
+        """
+        Record the storage entry of a key before it changes.
+
+        Args:
+            key (str): The key of the entry.
+            previous: The object stored under the key, or None if there
+                was none.
+        """
+
+        self.__entries.append((None, key, previous))
+
+    def undo(self, restore):
+        """
+        Restore the recorded state, newest entry first. Attributes are
+        set directly so that restoring them records no change.
+
+        Args:
+            restore (callable): Called with the key and the previous
+                object, or None, of each storage entry.
+        """
+
+        for obj, name, value in reversed(self.__entries):
+            if obj is None:
+                restore(name, value)
+            elif value is self.__missing:
+                obj.__dict__.pop(name, None)
+            else:
+                obj.__dict__[name] = value
+        self.__entries = []
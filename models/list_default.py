@@ -0,0 +1,46 @@
+#!/usr/bin/python3
+"""ListDefault class module"""
+from models.pending_list import PendingList
+
+
+class ListDefault:
+    """
+    The class default of a list attribute, which gives each instance its
+    own empty list instead of a list shared by every instance.
+
+    The list is set on the instance the first time it is changed, so
+    that appending to it changes that instance only while reading it
+    leaves the instance as it was. A value set on the instance hides the
+    default.
+
+    Attributes:
+        name (str): The name of the attribute.
+    """
+
+    def __set_name__(self, owner, name):
+        """
+        Record the name of the attribute.
+
+        Args:
+            owner (type): The class.
+            name (str): The name of the attribute.
+        """
+
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        """
+        Get a new empty list, set on the instance, if there is one, once
+        it is changed.
+
+        Args:
+            obj: The instance, or None when read on the class.
+            owner (type): The class.
+
+        Returns:
+            list: The empty list.
+        """
+
+        if obj is None:
+            return []
+        return PendingList(obj, self.name)
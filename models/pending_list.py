@@ -0,0 +1,64 @@
+#!/usr/bin/python3
+"""PendingList class module"""
+import functools
+
+
+class PendingList(list):
+    """
+    The list ListDefault returns for an instance that has no value of
+    its own, which sets itself on the instance the first time it is
+    changed, so that reading the attribute does not change the instance.
+
+    Attributes:
+        __obj: The instance, or None once the list is set on it.
+        __name (str): The name of the attribute.
+    """
+
+    def __init__(self, obj, name):
+        """
+        Initialize an empty list for an attribute of an instance.
+
+        Args:
+            obj: The instance.
+            name (str): The name of the attribute.
+        """
+
+        super().__init__()
+        self.__obj = obj
+        self.__name = name
+
+    def attach(self):
+        """
+        Set the list on its instance, unless it is set already or the
+        instance got a value of its own since.
+        """
+
+        obj, self.__obj = self.__obj, None
+        if obj is not None and self.__name not in vars(obj):
+            setattr(obj, self.__name, self)
+
+    @staticmethod
+    def attaching(method):
+        """
+        Wrap a list method that changes the list so that the list is set
+        on its instance after the change.
+
+        Args:
+            method (callable): The list method.
+
+        Returns:
+            callable: The wrapped method.
+        """
+
+        @functools.wraps(method)
+        def wrapper(self, *args):
+            result = method(self, *args)
+            self.attach()
+            return result
+        return wrapper
+
+
+for name in ("append", "extend", "insert", "remove", "pop", "clear", "sort",
+             "reverse", "__setitem__", "__delitem__", "__iadd__",
+             "__imul__"):
+    setattr(PendingList, name, PendingList.attaching(getattr(list, name)))
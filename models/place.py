@@ -1,6 +1,10 @@
 #!/usr/bin/python3
 """Place class module"""
+from models import storage
+from models.amenity import Amenity
 from models.base_model import BaseModel
+from models.list_default import ListDefault
+from models.review import Review
 
 
 class Place(BaseModel):
@@ -9,4 +13,31 @@ class Place(BaseModel):
     number_rooms = number_bathrooms = max_guest = price_by_night = 0
     latitude = longitude = 0.0
     city_id = user_id = name = description = ""
-    amenity_ids = []
+    amenity_ids = ListDefault()
+
+    @property
+    def reviews(self):
+        """
+        Get the reviews of the place, through the storage index of
+        Review.place_id.
+
+        Returns:
+            list: The Review instances whose place_id is the place's id.
+        """
+
+        return list(storage.find(Review, place_id=self.id).values())
+
+    @property
+    def amenities(self):
+        """
+        Get the amenities of the place, looking up each id of
+        amenity_ids.
+
+        Returns:
+            list: The stored Amenity instances listed in amenity_ids, in
+            order.
+        """
+
+        amenities = (storage.get(Amenity, amenity_id)
+                     for amenity_id in self.__dict__.get("amenity_ids", ()))
+        return [amenity for amenity in amenities if amenity is not None]
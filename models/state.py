@@ -1,9 +1,23 @@
 #!/usr/bin/python3
 """State class module"""
+from models import storage
 from models.base_model import BaseModel
+from models.city import City
 
 
 class State(BaseModel):
     """State class objects"""
 
     name = ""
+
+    @property
+    def cities(self):
+        """
+        Get the cities of the state, through the storage index of
+        City.state_id.
+
+        Returns:
+            list: The City instances whose state_id is the state's id.
+        """
+
+        return list(storage.find(City, state_id=self.id).values())
@@ -1,9 +1,36 @@
 #!/usr/bin/python3
 """User class module"""
+from models import storage
 from models.base_model import BaseModel
+from models.place import Place
+from models.review import Review
 
 
 class User(BaseModel):
     """User class objects"""
 
     email = password = first_name = last_name = ""
+
+    @property
+    def places(self):
+        """
+        Get the places the user owns, through the storage index of
+        Place.user_id.
+
+        Returns:
+            list: The Place instances whose user_id is the user's id.
+        """
+
+        return list(storage.find(Place, user_id=self.id).values())
+
+    @property
+    def reviews(self):
+        """
+        Get the reviews the user wrote, through the storage index of
+        Review.user_id.
+
+        Returns:
+            list: The Review instances whose user_id is the user's id.
+        """
+
+        return list(storage.find(Review, user_id=self.id).values())
@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 """HBNB class module Unittest"""
 import re
+import ast
 import os
 import sys
 import json
@@ -60,7 +61,9 @@ class TestHBNBCommand(unittest.TestCase):
         s = """
 Documented commands (type help <topic>):
 ========================================
-EOF  all  count  create  destroy  help  quit  show  update
+EOF  begin    count    group_by  import  near      search  update
+all  commit   create   having    max     quit      show""" + " " * 2 + """
+avg  compact  destroy  help      min     rollback  sum""" + " " * 3 + """
 
 """
         self.assertEqual(s, f.getvalue())
@@ -118,6 +121,134 @@ EOF  all  count  create  destroy  help  quit  show  update
         s = ""
         self.assertEqual(s, f.getvalue())
 
+    def test_exit_flushes(self):
+        """Test if 'quit' and 'EOF' flush the deferred saves."""
+        for command in ("quit", "EOF"):
+            with patch.object(FileStorage, "flush") as flush:
+                with patch('sys.stdout', new=StringIO()):
+                    self.assertTrue(HBNBCommand().onecmd(command))
+            flush.assert_called_once_with()
+
+    def test_do_compact(self):
+        """Test the 'compact' command."""
+        log_path = FileStorage._FileStorage__log_path
+        storage = FileStorage()
+        storage.journal()
+        try:
+            with patch('sys.stdout', new=StringIO()) as f:
+                HBNBCommand().onecmd("create User")
+            self.assertTrue(os.path.isfile(log_path))
+            with patch('sys.stdout', new=StringIO()) as f:
+                HBNBCommand().onecmd("compact")
+            self.assertEqual("", f.getvalue())
+            self.assertFalse(os.path.isfile(log_path))
+            self.assertTrue(os.path.isfile("file.json"))
+        finally:
+            storage.journal(False)
+
+    def test_do_begin_commit(self):
+        """Test the 'begin' and 'commit' commands."""
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd("begin")
+            HBNBCommand().onecmd("begin")
+            HBNBCommand().onecmd("create State")
+        lines = f.getvalue().splitlines()
+        self.assertEqual(lines[0], "** transaction already in progress **")
+        key = "State." + lines[1]
+        if os.path.isfile("file.json"):
+            with open("file.json", "r") as file:
+                self.assertNotIn(key, json.load(file))
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd("commit")
+            HBNBCommand().onecmd("commit")
+        self.assertEqual(f.getvalue(), "** no transaction in progress **\n")
+        with open("file.json", "r") as file:
+            self.assertIn(key, json.load(file))
+
+    def test_run_batch(self):
+        """Test if a script runs with one save every few commands."""
+        script = ["create State\n", "\n", "create City\n", "create User\n",
+                  "count City\n", "quit\n", "create Place\n"]
+        with patch.object(FileStorage, "write",
+                          wraps=FileStorage().write) as write:
+            with patch('sys.stdout', new=StringIO()) as f:
+                self.assertEqual(HBNBCommand().run_batch(script, 2), 5)
+        self.assertEqual(write.call_count, 2)
+        lines = f.getvalue().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(lines[3], "1")
+        with open("file.json", "r") as file:
+            self.assertIn("User." + lines[2], json.load(file))
+        self.assertFalse(FileStorage().in_batch())
+
+    def test_run_batch_transactions(self):
+        """
+        Test if commit, begin and rollback within a script act on the
+        batch, which goes on batching the next commands.
+        """
+        script = ["create State\n", "commit\n", "create City\n",
+                  "rollback\n", "create User\n", "begin\n",
+                  "create Place\n", "create Review\n", "create Amenity\n"]
+        with patch.object(FileStorage, "write",
+                          wraps=FileStorage().write) as write:
+            with patch('sys.stdout', new=StringIO()) as f:
+                self.assertEqual(HBNBCommand().run_batch(script, 2), 9)
+        self.assertEqual(write.call_count, 4)
+        state, city, user, place, review, amenity = \
+            f.getvalue().splitlines()
+        with open("file.json", "r") as file:
+            saved = json.load(file)
+        self.assertNotIn("City." + city, saved)
+        for key in ("State." + state, "User." + user, "Place." + place,
+                    "Review." + review, "Amenity." + amenity):
+            self.assertIn(key, saved)
+        self.assertFalse(FileStorage().in_batch())
+
+    def test_do_import(self):
+        """Test the 'import' command."""
+        with open("import.ndjson", "w") as file:
+            file.write('{"name": "Texas"}\n{"name": "Ohio"}\n')
+        try:
+            with patch('sys.stdout', new=StringIO()) as f:
+                HBNBCommand().onecmd("import State import.ndjson")
+            self.assertEqual(f.getvalue(), "2\n")
+            states = FileStorage().all("State").values()
+            self.assertEqual(sorted(state.name for state in states),
+                             ["Ohio", "Texas"])
+            with open("import.ndjson", "w") as file:
+                file.write('{"name": 1}\n')
+            errors = ["** class name missing **",
+                      "** class doesn't exist **",
+                      "** file path missing **",
+                      "** file doesn't exist **",
+                      "** Line 1: name must be of type str, got 1 **"]
+            with patch('sys.stdout', new=StringIO()) as f:
+                for line in ("", "Country a", "State", "State none.csv",
+                             "State import.ndjson"):
+                    HBNBCommand().onecmd("import " + line)
+            self.assertEqual(f.getvalue().splitlines(), errors)
+        finally:
+            os.remove("import.ndjson")
+
+    def test_do_rollback(self):
+        """Test the 'rollback' command."""
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd("create State")
+        state_id = f.getvalue().strip()
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd("begin")
+            HBNBCommand().onecmd(f'update State {state_id} name "Texas"')
+            HBNBCommand().onecmd("create City")
+            HBNBCommand().onecmd(f"destroy State {state_id}")
+            HBNBCommand().onecmd("rollback")
+            HBNBCommand().onecmd("rollback")
+        lines = f.getvalue().splitlines()
+        self.assertEqual(lines[1], "** no transaction in progress **")
+        self.assertIsNone(FileStorage().get("City", lines[0]))
+        state = FileStorage().get("State", state_id)
+        self.assertIsNotNone(state)
+        self.assertNotIn("name", state.__dict__)
+
     def test_do_create(self):
         """Test the 'create' command."""
         for classname in self.classes():
@@ -323,6 +454,188 @@ EOF  all  count  create  destroy  help  quit  show  update
         s = f.getvalue()
         self.assertTrue(uid in s)
 
+    def test_do_all_pages(self):
+        """Test the 'all' command with a limit, an offset and a cursor."""
+        with patch('sys.stdout', new=StringIO()) as f:
+            for i in range(4):
+                HBNBCommand().onecmd("create Amenity")
+        uids = f.getvalue().split()
+        for line, expected in (("all Amenity limit=2", uids[:2]),
+                               ("all Amenity offset=3", uids[3:]),
+                               (f"all Amenity after={uids[0]} limit=2",
+                                uids[1:3]),
+                               (f'Amenity.all(limit=1, after="{uids[2]}")',
+                                uids[3:]),
+                               (f"all after=Amenity.{uids[3]}", [])):
+            with patch('sys.stdout', new=StringIO()) as f:
+                HBNBCommand().onecmd(line)
+            output = ast.literal_eval(f.getvalue())
+            self.assertEqual([re.search(r"\((.*?)\)", s).group(1)
+                              for s in output], expected)
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd("all Amenity offset=-1")
+        self.assertEqual(f.getvalue(), "** invalid offset **\n")
+
+    def test_query(self):
+        """Test the 'where', 'order_by', 'limit' and 'explain' calls, and
+        that fractions are kept for int attributes."""
+        with patch('sys.stdout', new=StringIO()) as f:
+            for i in range(3):
+                HBNBCommand().onecmd("create Place")
+        uids = f.getvalue().split()
+        for uid, guests in zip(uids, (4, 2, 6)):
+            HBNBCommand().onecmd(f"update Place {uid} max_guest {guests}")
+            HBNBCommand().onecmd(f"update Place {uid} city_id query")
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd('Place.where(max_guest>2, city_id="query")'
+                                 '.order_by(-max_guest).limit(5)')
+        output = ast.literal_eval(f.getvalue())
+        self.assertEqual([re.search(r"\((.*?)\)", s).group(1)
+                          for s in output], [uids[2], uids[0]])
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd('Place.where(max_guest<2.5, city_id=query)')
+        output = ast.literal_eval(f.getvalue())
+        self.assertEqual([re.search(r"\((.*?)\)", s).group(1)
+                          for s in output], [uids[1]])
+        self.assertEqual(HBNBCommand().parse_conditions(
+            "Place", "max_guest>=4.0, price_by_night<0.5, name=1.50"),
+            [("max_guest", ">=", 4), ("price_by_night", "<", 0.5),
+             ("name", "=", "1.50")])
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd('Place.where(city_id=query).explain()')
+        self.assertEqual(f.getvalue().splitlines()[1:],
+                         ["filter city_id = 'query'"])
+        errors = ["** class doesn't exist **", "** class name missing **",
+                  "** invalid condition **", "** invalid condition **",
+                  "** invalid sort key **", "** invalid limit **"]
+        with patch('sys.stdout', new=StringIO()) as f:
+            for line in ("Country.where(a=1)", ".limit(1)",
+                         "Place.where(max_guest=many)", "Place.where(a)",
+                         "Place.order_by(a b)", "Place.limit(-1)"):
+                HBNBCommand().onecmd(line)
+        self.assertEqual(f.getvalue().splitlines(), errors)
+
+    def test_search(self):
+        """Test the 'search' command."""
+        with patch('sys.stdout', new=StringIO()) as f:
+            for i in range(2):
+                HBNBCommand().onecmd("create Review")
+        uids = f.getvalue().split()
+        for uid, text in zip(uids, ("xyzzy plugh", "plugh plugh xyzzy")):
+            HBNBCommand().onecmd(f'update Review {uid} text "{text}"')
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd('Review.search("plugh xyzzy")')
+            HBNBCommand().onecmd('Review.search("\\"xyzzy plugh\\"", 5)')
+            HBNBCommand().onecmd('search Review limit=1 plugh')
+        found = [[re.search(r"\((.*?)\)", s).group(1) for s in output]
+                 for output in map(ast.literal_eval,
+                                   f.getvalue().splitlines())]
+        self.assertEqual(found, [uids[::-1], uids[:1], uids[1:]])
+        errors = ["** class name missing **", "** class doesn't exist **",
+                  "** class has no text **", "** search missing **",
+                  "** invalid limit **"]
+        with patch('sys.stdout', new=StringIO()) as f:
+            for line in ("search", "search Country a", 'City.search("a")',
+                         "search Review", 'Review.search("a", b)'):
+                HBNBCommand().onecmd(line)
+        self.assertEqual(f.getvalue().splitlines(), errors)
+
+    def test_near(self):
+        """Test the 'near' command."""
+        with patch('sys.stdout', new=StringIO()) as f:
+            for i in range(2):
+                HBNBCommand().onecmd("create Place")
+        uids = f.getvalue().split()
+        for uid, latitude in zip(uids, (-45.02, -45.01)):
+            HBNBCommand().onecmd(f"update Place {uid} latitude {latitude}")
+            HBNBCommand().onecmd(f"update Place {uid} longitude 60.5")
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd("Place.near(-45, 60.5, 5)")
+            HBNBCommand().onecmd("near Place -45 60.5 5 1")
+        found = [[re.search(r"\((.*?)\)", s).group(1) for s in output]
+                 for output in map(ast.literal_eval,
+                                   f.getvalue().splitlines())]
+        self.assertEqual(found, [uids[::-1], uids[1:]])
+        errors = ["** class name missing **", "** class doesn't exist **",
+                  "** class has no location **", "** coordinates missing **",
+                  "** distance missing **", "** invalid coordinates **",
+                  "** invalid distance **", "** invalid limit **"]
+        with patch('sys.stdout', new=StringIO()) as f:
+            for line in ("near", "near Country", "City.near(1, 2, 3)",
+                         "near Place 1", "near Place 1 2", "near Place 1 x 3",
+                         "near Place 1 2 -3", "near Place 1 2 3 x"):
+                HBNBCommand().onecmd(line)
+        self.assertEqual(f.getvalue().splitlines(), errors)
+
+    def test_having(self):
+        """Test the 'having' command."""
+        with patch('sys.stdout', new=StringIO()) as f:
+            for i in range(3):
+                HBNBCommand().onecmd("create Place")
+        uids = f.getvalue().split()
+        for uid, ids in zip(uids, (["wifi", "tv"], ["wifi", "pets"], [])):
+            HBNBCommand().onecmd(
+                f'Place.update("{uid}", {{"amenity_ids": {json.dumps(ids)}}})')
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd("having Place wifi !pets")
+            HBNBCommand().onecmd("Place.having(tv|pets)")
+            HBNBCommand().onecmd("having Place !wifi")
+        found = [[re.search(r"\((.*?)\)", s).group(1) for s in output]
+                 for output in map(ast.literal_eval,
+                                   f.getvalue().splitlines())]
+        self.assertEqual(found, [uids[:1], uids[:2], uids[2:]])
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd("create Place")
+        untouched = f.getvalue().strip()
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd("Place.group_by(amenity_ids, count)")
+        self.assertGreaterEqual(
+            ast.literal_eval(f.getvalue())[("wifi", "pets")], 1)
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd("Place.where(max_guest=0)")
+            HBNBCommand().onecmd(f"show Place {untouched}")
+        self.assertNotIn("amenity_ids", f.getvalue().splitlines()[-1])
+        errors = ["** class name missing **", "** class doesn't exist **",
+                  "** class has no list attribute **",
+                  "** values missing **", "** invalid condition **"]
+        with patch('sys.stdout', new=StringIO()) as f:
+            for line in ("having", "having Country a", "City.having(a)",
+                         "having Place", "having Place a|b c|d"):
+                HBNBCommand().onecmd(line)
+        self.assertEqual(f.getvalue().splitlines(), errors)
+
+    def test_aggregates(self):
+        """Test the 'sum', 'avg', 'min', 'max' and 'group_by' commands."""
+        with patch('sys.stdout', new=StringIO()) as f:
+            for i in range(3):
+                HBNBCommand().onecmd("create Review")
+        uids = f.getvalue().split()
+        for uid, place_id in zip(uids, ("aggregate1", "aggregate1", "")):
+            HBNBCommand().onecmd(f"update Review {uid} place_id {place_id}")
+        for uid, stars in zip(uids, (4, 2, 5)):
+            HBNBCommand().onecmd(f"update Review {uid} stars {stars}")
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd("Review.group_by(place_id, count)")
+            HBNBCommand().onecmd("group_by Review place_id avg stars")
+        counts, means = map(ast.literal_eval, f.getvalue().splitlines())
+        self.assertEqual(counts["aggregate1"], 2)
+        self.assertEqual(means["aggregate1"], 3.0)
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd("Review.max(stars)")
+            HBNBCommand().onecmd("sum Review text")
+            HBNBCommand().onecmd("avg Review text")
+        self.assertEqual(f.getvalue().splitlines(), ["5.0", "0.0", "None"])
+        errors = ["** class name missing **", "** class doesn't exist **",
+                  "** attribute name missing **",
+                  "** attribute name missing **", "** function missing **",
+                  "** unknown function **"]
+        with patch('sys.stdout', new=StringIO()) as f:
+            for line in ("avg", "min Country stars", "Review.max()",
+                         "group_by Review", "group_by Review place_id",
+                         "group_by Review place_id median stars"):
+                HBNBCommand().onecmd(line)
+        self.assertEqual(f.getvalue().splitlines(), errors)
+
     def test_do_all_error(self):
         """Test error cases for the 'all' command."""
         with patch('sys.stdout', new=StringIO()) as f:
@@ -9,6 +9,7 @@ import time
 from models import storage
 from datetime import datetime
 from models.city import City
+from models.place import Place
 from models.base_model import BaseModel
 from models.engine.file_storage import FileStorage
 
@@ -55,6 +56,19 @@ class TestCity(unittest.TestCase):
             self.assertTrue(hasattr(city, key))
             self.assertEqual(type(getattr(city, key, None)), value)
 
+    def test_places(self):
+        """
+        Test if places lists the places of the city.
+        """
+        city = City()
+        self.assertEqual(city.places, [])
+        place = Place()
+        place.city_id = city.id
+        storage.new(place)
+        self.assertEqual(city.places, [place])
+        place.city_id = "elsewhere"
+        self.assertEqual(city.places, [])
+
     def test_pep8(self):
         """
         Test if the code complies with PEP8 style guidelines.
@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+"""Aggregate class module Unittest"""
+import pep8
+import unittest
+from models.place import Place
+from models.engine.aggregate import Aggregate
+
+
+class TestAggregate(unittest.TestCase):
+    """
+    Test case for the Aggregate class.
+    """
+
+    def test_pep8(self):
+        """
+        Test the code against PEP8 style guidelines.
+        """
+        py_code_style = pep8.StyleGuide(quiet=True)
+        check = py_code_style.check_files(
+            ['models/engine/aggregate.py',
+                'tests/test_models/test_engine/test_aggregate.py'])
+        self.assertEqual(check.total_errors, 0, "Errors found")
+
+    def test_functions(self):
+        """
+        Test if each function skips the values that are not numbers.
+        """
+        values = [3, 1.5, "7", None, True, 4]
+        results = {}
+        for function in Aggregate.functions:
+            aggregate = Aggregate(function)
+            for value in values:
+                aggregate.add(value)
+            results[function] = aggregate.result()
+        self.assertEqual(results, {"count": 3, "sum": 8.5, "avg": 8.5 / 3,
+                                   "min": 1.5, "max": 4.0})
+        self.assertIsInstance(results["max"], float)
+        self.assertEqual(Aggregate("sum").result(), 0.0)
+        self.assertIsNone(Aggregate("avg").result())
+        with self.assertRaises(ValueError):
+            Aggregate("median")
+
+    def test_over(self):
+        """
+        Test if over() aggregates all the objects or each group.
+        """
+        places = [Place() for i in range(5)]
+        for index, place in enumerate(places):
+            place.city_id = "c{}".format(index % 2)
+            place.max_guest = index
+        self.assertEqual(Aggregate.over(places, "count"), 5)
+        self.assertEqual(Aggregate.over(places, "max", "max_guest"), 4.0)
+        self.assertEqual(Aggregate.over(iter(places), "avg", "max_guest",
+                                        "city_id"), {"c0": 2.0, "c1": 2.0})
+        self.assertEqual(Aggregate.over(places, "count", group_by="city_id"),
+                         {"c0": 3, "c1": 2})
+        places[0].amenity_ids = ["wifi", "tv"]
+        places[1].amenity_ids = ["wifi", "tv"]
+        places[2].amenity_ids = [{"name": "pool"}]
+        self.assertEqual(Aggregate.over(places, "count",
+                                        group_by="amenity_ids"),
+                         {("wifi", "tv"): 2, ('{"name": "pool"}',): 1,
+                          (): 2})
+        with self.assertRaises(ValueError):
+            Aggregate.over(places, "sum")
+        with self.assertRaises(ValueError):
+            Aggregate.over(places, "total", "max_guest")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+#!/usr/bin/python3
+"""AsyncStorage class module Unittest"""
+import asyncio
+import os
+import pep8
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from models.city import City
+from models.state import State
+from models.engine.async_storage import AsyncStorage
+from models.engine.db_storage import DBStorage
+
+
+class TestAsyncStorage(unittest.TestCase):
+    """
+    Test case for the AsyncStorage class.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case with a facade of a database in a temporary
+        directory.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.storage = DBStorage(os.path.join(self.directory.name,
+                                              "file.db"))
+        self.storage.reload()
+        self.facade = AsyncStorage(self.storage, max_workers=1)
+
+    def tearDown(self):
+        """
+        Tear down the test case by closing and removing the database.
+        """
+        asyncio.run(self.facade.close())
+        self.storage.close()
+        self.directory.cleanup()
+
+    def test_pep8(self):
+        """
+        Test the code against PEP8 style guidelines.
+        """
+        py_code_style = pep8.StyleGuide(quiet=True)
+        check = py_code_style.check_files(
+            ['models/engine/async_storage.py',
+                'tests/test_models/test_engine/test_async_storage.py'])
+        self.assertEqual(check.total_errors, 0, "Errors found")
+
+    def test_queries(self):
+        """
+        Test if get(), find() and stream() return the stored objects.
+        """
+        state = State()
+        cities = [City() for i in range(5)]
+        for city in cities:
+            city.state_id = state.id
+            self.storage.new(city)
+        self.storage.new(state)
+
+        async def query():
+            found = await self.facade.find(City, state_id=state.id)
+            got = await self.facade.get(State, state.id)
+            streamed = [obj async for obj in self.facade.stream(
+                City, chunk_size=2)]
+            return found, got, streamed
+
+        found, got, streamed = asyncio.run(query())
+        self.assertEqual(set(found), {"City." + city.id for city in cities})
+        self.assertIs(got, state)
+        self.assertEqual({city.id for city in streamed},
+                         {city.id for city in cities})
+
+    def test_save_reload(self):
+        """
+        Test if save() writes the changes that reload() reads back.
+        """
+        state = State()
+        self.storage.new(state)
+
+        async def save_reload():
+            await self.facade.save()
+            await self.facade.reload()
+            return await self.facade.get(State, state.id)
+
+        loaded = asyncio.run(save_reload())
+        self.assertIsNot(loaded, state)
+        self.assertEqual(loaded.id, state.id)
+
+    def test_save_merges(self):
+        """
+        Test if concurrent saves run as one, and a save requested while
+        another runs waits for the next one.
+        """
+        calls = []
+
+        def save():
+            calls.append(threading.get_ident())
+            time.sleep(0.05)
+
+        async def save_many():
+            await asyncio.gather(*[self.facade.save() for i in range(10)])
+            first = asyncio.ensure_future(self.facade.save())
+            await asyncio.sleep(0.01)
+            await asyncio.gather(first, self.facade.save(),
+                                 self.facade.save())
+
+        with patch.object(self.storage, "save", side_effect=save):
+            asyncio.run(save_many())
+        self.assertEqual(len(calls), 3)
+        self.assertNotIn(threading.get_ident(), calls)
+
+    def test_save_error(self):
+        """
+        Test if an error of a save is raised to every merged call.
+        """
+        async def save_many():
+            return await asyncio.gather(
+                self.facade.save(), self.facade.save(),
+                return_exceptions=True)
+
+        with patch.object(self.storage, "save", side_effect=OSError):
+            errors = asyncio.run(save_many())
+        self.assertEqual([type(error) for error in errors],
+                         [OSError, OSError])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+"""AttributeIndex class module Unittest"""
+import pep8
+import unittest
+from models.city import City
+from models.engine.attribute_index import AttributeIndex
+
+
+class TestAttributeIndex(unittest.TestCase):
+    """
+    Test case for the AttributeIndex class.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case by indexing two cities by state.
+        """
+        self.index = AttributeIndex("state_id")
+        self.city_1 = City(id="1", state_id="CA")
+        self.city_2 = City(id="2", state_id="CA")
+        self.index.put("1", self.city_1)
+        self.index.put("2", self.city_2)
+
+    def test_pep8(self):
+        """
+        Test the code against PEP8 style guidelines.
+        """
+        py_code_style = pep8.StyleGuide(quiet=True)
+        check = py_code_style.check_files(
+            ['models/engine/attribute_index.py',
+                'tests/test_models/test_engine/test_attribute_index.py'])
+        self.assertEqual(check.total_errors, 0, "Errors found")
+
+    def test_lookup(self):
+        """
+        Test if lookup() returns the objects with a value.
+        """
+        self.assertEqual(self.index.lookup("CA"),
+                         {"1": self.city_1, "2": self.city_2})
+        self.assertEqual(self.index.lookup("NV"), {})
+        self.assertEqual(self.index.lookup(["CA"]), {})
+
+    def test_put_moves(self):
+        """
+        Test if put() moves an object whose value changed.
+        """
+        self.city_1.state_id = "NV"
+        self.index.put("1", self.city_1)
+        self.assertEqual(self.index.lookup("CA"), {"2": self.city_2})
+        self.assertEqual(self.index.lookup("NV"), {"1": self.city_1})
+
+    def test_discard(self):
+        """
+        Test if discard() removes an object.
+        """
+        self.index.discard("1")
+        self.index.discard("3")
+        self.assertEqual(self.index.lookup("CA"), {"2": self.city_2})
+
+
+if __name__ == '__main__':
+    unittest.main()
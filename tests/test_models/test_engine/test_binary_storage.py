@@ -0,0 +1,155 @@
+#!/usr/bin/python3
+"""BinaryStorage class module Unittest"""
+import os
+import json
+import pep8
+import subprocess
+import sys
+import tempfile
+import unittest
+from models.city import City
+from models.state import State
+from models.engine.file_storage import FileStorage
+from models.engine.binary_storage import BinaryStorage
+
+
+class TestBinaryStorage(unittest.TestCase):
+    """
+    Test case for the BinaryStorage class.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case with a binary file in a temporary directory.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "file.bin")
+        self.file_path = BinaryStorage._BinaryStorage__file_path
+        BinaryStorage._BinaryStorage__file_path = self.path
+        self.storage = BinaryStorage()
+        self.storage.reload()
+
+    def tearDown(self):
+        """
+        Tear down the test case by removing the binary file and the
+        stored objects.
+        """
+        BinaryStorage._BinaryStorage__file_path = self.file_path
+        self.storage.reload()
+        FileStorage._FileStorage__objects = {}
+        self.directory.cleanup()
+
+    def test_pep8(self):
+        """
+        Test the code against PEP8 style guidelines.
+        """
+        py_code_style = pep8.StyleGuide(quiet=True)
+        check = py_code_style.check_files(
+            ['models/engine/binary_storage.py',
+                'models/engine/mapped_record.py',
+                'tests/test_models/test_engine/test_binary_storage.py'])
+        self.assertEqual(check.total_errors, 0, "Errors found")
+
+    def test_point_lookup(self):
+        """
+        Test if get() decodes one object without reading the others.
+        """
+        states = [State() for i in range(20)]
+        for state in states:
+            self.storage.new(state)
+        self.storage.save()
+        self.storage.reload()
+        state = self.storage.get(State, states[7].id)
+        self.assertEqual(state.to_dict(), states[7].to_dict())
+        self.assertEqual(len(FileStorage._FileStorage__objects), 1)
+        self.assertIsNone(self.storage.get(State, "nope"))
+        self.assertIsNone(self.storage.get("nope", states[7].id))
+        self.assertEqual(self.storage.count(State), 20)
+        self.assertIs(self.storage.all(State)["State." + state.id], state)
+
+    def test_save(self):
+        """
+        Test if changes survive a save and a reload.
+        """
+        city = City()
+        city.name = "Austin"
+        self.storage.save()
+        self.storage.reload()
+        self.storage.get(City, city.id).name = "Dallas"
+        self.storage.save()
+        self.storage.reload()
+        self.assertEqual(self.storage.find(City, name="Dallas"),
+                         {"City." + city.id: self.storage.get(City, city.id)})
+        self.storage.delete(self.storage.get(City, city.id))
+        self.storage.save()
+        self.storage.reload()
+        self.assertIsNone(self.storage.get(City, city.id))
+
+    def test_rollback_lookup(self):
+        """
+        Test if an object get() decodes within a batch is kept by a
+        rollback and by the next save.
+        """
+        state = State()
+        self.storage.save()
+        self.storage.reload()
+        self.storage.begin()
+        self.assertIsNotNone(self.storage.get(State, state.id))
+        created = State()
+        self.storage.new(created)
+        self.storage.rollback()
+        self.assertIsNone(self.storage.get(State, created.id))
+        self.storage.new(State())
+        self.storage.save()
+        self.assertIsNotNone(self.storage.get(State, state.id))
+        self.storage.reload()
+        self.assertEqual(self.storage.get(State, state.id).to_dict(),
+                         state.to_dict())
+        self.assertEqual(self.storage.count(State), 2)
+
+    def test_convert(self):
+        """
+        Test if a JSON file survives a conversion to binary and back.
+        """
+        objects = {"State.{}".format(i): {"id": str(i), "__class__": "State",
+                                          "name": "State {}".format(i)}
+                   for i in range(10)}
+        json_path = os.path.join(self.directory.name, "file.json")
+        with open(json_path, "w", encoding="utf-8") as file:
+            json.dump(objects, file)
+        BinaryStorage.from_json(json_path, self.path)
+        os.remove(json_path)
+        BinaryStorage.to_json(self.path, json_path)
+        with open(json_path, "r", encoding="utf-8") as file:
+            self.assertEqual(json.load(file), objects)
+
+    def test_invalid(self):
+        """
+        Test if a file that is not a binary storage file is refused.
+        """
+        with open(self.path, "wb") as file:
+            file.write(b"{}")
+        with self.assertRaises(ValueError):
+            self.storage.reload()
+
+    def test_modes(self):
+        """
+        Test if the log and multi-process modes are refused, also when
+        the environment asks for them.
+        """
+        with self.assertRaises(ValueError):
+            self.storage.journal()
+        with self.assertRaises(ValueError):
+            self.storage.share()
+        environment = dict(os.environ, PYTHONPATH=os.getcwd(),
+                           HBNB_TYPE_STORAGE="binary", HBNB_FILE_SHARED="1")
+        process = subprocess.run([sys.executable, "-c", "import models"],
+                                 cwd=self.directory.name, env=environment,
+                                 capture_output=True, text=True)
+        self.assertNotEqual(process.returncode, 0)
+        self.assertIn("ValueError: BinaryStorage has no multi-process mode",
+                      process.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
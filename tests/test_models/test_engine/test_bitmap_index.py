@@ -0,0 +1,101 @@
+#!/usr/bin/python3
+"""BitmapIndex class module Unittest"""
+import pep8
+import random
+import types
+import unittest
+from models.engine.bitmap_index import BitmapIndex
+
+
+class TestBitmapIndex(unittest.TestCase):
+    """
+    Test case for the BitmapIndex class.
+    """
+
+    def test_pep8(self):
+        """
+        Test the code against PEP8 style guidelines.
+        """
+        py_code_style = pep8.StyleGuide(quiet=True)
+        check = py_code_style.check_files(
+            ['models/engine/bitmap_index.py',
+                'tests/test_models/test_engine/test_bitmap_index.py'])
+        self.assertEqual(check.total_errors, 0, "Errors found")
+
+    def test_match(self):
+        """
+        Test AND, OR and NOT over the values of the lists.
+        """
+        index = BitmapIndex("amenity_ids")
+        for object_id, values in (("a", ["wifi", "tv"]),
+                                  ("b", ["wifi", "pets", "wifi"]),
+                                  ("c", []), ("d", "wifi"),
+                                  ("e", [["tv"], "tv", None])):
+            index.put(object_id, types.SimpleNamespace(amenity_ids=values))
+        self.assertEqual(len(index), 5)
+        self.assertEqual(index.match(["wifi", "tv"]), ["a"])
+        self.assertEqual(index.match(any_of=["pets", "tv"]), ["a", "b", "e"])
+        self.assertEqual(index.match(none_of=["wifi"]), ["c", "d", "e"])
+        self.assertEqual(index.match(["tv"], none_of=["wifi"]), ["e"])
+        self.assertEqual(index.match(), ["a", "b", "c", "d", "e"])
+        self.assertEqual(index.match(["spa"]), [])
+        self.assertEqual(index.match(any_of=["spa"]), [])
+
+    def test_ordinals(self):
+        """
+        Test the ordinals of sparse and dense bitsets.
+        """
+        self.assertEqual(BitmapIndex.ordinals(0), [])
+        self.assertEqual(BitmapIndex.ordinals(1 << 900 | 1 << 9 | 1),
+                         [0, 9, 900])
+        dense = random.sample(range(800), 300)
+        self.assertEqual(BitmapIndex.ordinals(sum(1 << ordinal for ordinal
+                                                  in dense)), sorted(dense))
+
+    def test_put_discard(self):
+        """
+        Test if changed and removed objects update the bitsets, and if
+        the ordinals of removed objects are given again.
+        """
+        index = BitmapIndex("amenity_ids")
+        index.put("a", types.SimpleNamespace(amenity_ids=["wifi"]))
+        index.put("b", types.SimpleNamespace(amenity_ids=["wifi"]))
+        self.assertEqual(index.match(["wifi"]), ["a", "b"])
+        index.put("a", types.SimpleNamespace(amenity_ids=["tv"]))
+        self.assertEqual(index.match(["wifi"]), ["b"])
+        index.discard("a")
+        index.discard("a")
+        self.assertEqual(index.match(["tv"]), [])
+        index.put("c", types.SimpleNamespace(amenity_ids=["tv"]))
+        self.assertEqual(index.match(), ["c", "b"])
+        self.assertEqual(len(index), 2)
+
+    def test_random(self):
+        """
+        Test the matches against set operations over many changes.
+        """
+        index = BitmapIndex("tags")
+        lists = {}
+        for step in range(2000):
+            object_id = str(random.randrange(300))
+            if random.random() < 0.2:
+                index.discard(object_id)
+                lists.pop(object_id, None)
+            else:
+                tags = random.sample(range(8), random.randrange(4))
+                index.put(object_id, types.SimpleNamespace(tags=tags))
+                lists[object_id] = set(tags)
+        for step in range(50):
+            all_of, any_of, none_of = (random.sample(range(8), count)
+                                       for count in (1, 2, 1))
+            expected = {object_id for object_id, tags in lists.items()
+                        if tags.issuperset(all_of) and
+                        tags.intersection(any_of) and
+                        tags.isdisjoint(none_of)}
+            found = index.match(all_of, any_of, none_of)
+            self.assertEqual(len(found), len(expected))
+            self.assertEqual(set(found), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+#!/usr/bin/python3
+"""BulkLoader class module Unittest"""
+import datetime
+import json
+import os
+import pep8
+import tempfile
+import unittest
+from models.engine.bulk_loader import BulkLoader
+from models.engine.file_storage import FileStorage
+
+
+class TestBulkLoader(unittest.TestCase):
+    """
+    Test case for the BulkLoader class.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case with a temporary directory and the types
+        of the Place attributes.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        attributes = FileStorage().attributes()
+        self.types = dict(attributes["BaseModel"], **attributes["Place"])
+
+    def tearDown(self):
+        """
+        Tear down the test case by removing the temporary directory.
+        """
+        self.directory.cleanup()
+
+    def write(self, name, text):
+        """
+        Write a file in the temporary directory.
+
+        Args:
+            name (str): The name of the file.
+            text (str): The content of the file.
+
+        Returns:
+            str: The path of the file.
+        """
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(text)
+        return path
+
+    def test_pep8(self):
+        """
+        Test the code against PEP8 style guidelines.
+        """
+        py_code_style = pep8.StyleGuide(quiet=True)
+        check = py_code_style.check_files(
+            ['models/engine/bulk_loader.py',
+                'tests/test_models/test_engine/test_bulk_loader.py'])
+        self.assertEqual(check.total_errors, 0, "Errors found")
+
+    def test_format_of(self):
+        """
+        Test if the format is guessed from the extension.
+        """
+        self.assertEqual(BulkLoader.format_of("seed.CSV"), "csv")
+        self.assertEqual(BulkLoader.format_of("seed.ndjson"), "ndjson")
+        with self.assertRaises(ValueError):
+            BulkLoader("Place", self.types, "xml")
+
+    def test_ndjson(self):
+        """
+        Test if NDJSON rows are converted and completed.
+        """
+        path = self.write("places.ndjson", "\n".join([
+            json.dumps({"name": "Loft", "number_rooms": "3",
+                        "latitude": 2, "amenity_ids": ["a"],
+                        "owner": 5}),
+            "",
+            json.dumps({"id": "1", "__class__": "Place",
+                        "created_at": "2020-01-02T03:04:05.000006"})]))
+        records = list(BulkLoader("Place", self.types,
+                                  "ndjson").records(path))
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0]["number_rooms"], 3)
+        self.assertEqual(records[0]["latitude"], 2.0)
+        self.assertIsInstance(records[0]["latitude"], float)
+        self.assertEqual(records[0]["owner"], 5)
+        self.assertEqual(records[0]["__class__"], "Place")
+        self.assertIsInstance(records[0]["created_at"], datetime.datetime)
+        self.assertEqual(records[1]["id"], "1")
+        self.assertEqual(records[1]["created_at"],
+                         datetime.datetime(2020, 1, 2, 3, 4, 5, 6))
+        self.assertEqual(records[1]["updated_at"],
+                         records[1]["created_at"])
+
+    def test_csv(self):
+        """
+        Test if CSV rows are converted, skipping empty cells.
+        """
+        path = self.write("places.csv",
+                          "name,max_guest,amenity_ids\n"
+                          "\"Two\nlines\",4,\"a,b\"\n"
+                          "Empty,,[\"c\"]\n")
+        records = list(BulkLoader("Place", self.types, "csv",
+                                  chunk_size=1).records(path))
+        self.assertEqual(records[0]["name"], "Two\nlines")
+        self.assertEqual(records[0]["max_guest"], 4)
+        self.assertEqual(records[0]["amenity_ids"], ["a", "b"])
+        self.assertNotIn("max_guest", records[1])
+        self.assertEqual(records[1]["amenity_ids"], ["c"])
+
+    def test_errors(self):
+        """
+        Test if invalid rows raise a ValueError naming their line.
+        """
+        rows = {
+            "places.ndjson": "{}\n[1]\n",
+            "rooms.ndjson": "{}\n{}\n{\"number_rooms\": 1.5}\n",
+            "names.ndjson": "{\"name\": 1}\n",
+            "class.ndjson": "{\"__class__\": \"City\"}\n",
+            "dates.ndjson": "{\"created_at\": \"2020-01-02\"}\n",
+            "json.ndjson": "{\n",
+            "places.csv": "name,latitude\n\"a\nb\",1\nc,north\n",
+            "cells.csv": "name\na,b\n"}
+        lines = {"places.ndjson": 2, "rooms.ndjson": 3, "places.csv": 4,
+                 "cells.csv": 2}
+        for name, text in rows.items():
+            path = self.write(name, text)
+            loader = BulkLoader("Place", self.types,
+                                BulkLoader.format_of(name))
+            with self.assertRaisesRegex(
+                    ValueError, "^Line {}: ".format(lines.get(name, 1))):
+                list(loader.records(path))
+
+    def test_workers(self):
+        """
+        Test if a process pool converts the rows in file order.
+        """
+        path = self.write("places.ndjson", "".join(
+            json.dumps({"number_rooms": index}) + "\n"
+            for index in range(50)))
+        loader = BulkLoader("Place", self.types, "ndjson", chunk_size=7)
+        records = list(loader.records(path, workers=2))
+        self.assertEqual([record["number_rooms"] for record in records],
+                         list(range(50)))
+        path = self.write("rooms.ndjson", "{}\n" * 30 + "{\"x\": 1\n")
+        with self.assertRaisesRegex(ValueError, "^Line 31: "):
+            list(loader.records(path, workers=2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+#!/usr/bin/python3
+"""ColumnStore class module Unittest"""
+import pep8
+import unittest
+from unittest.mock import patch
+from models.place import Place
+from models.engine import column_store
+from models.engine.column_store import ColumnStore
+
+
+class TestColumnStore(unittest.TestCase):
+    """
+    Test case for the ColumnStore class, with the plain arrays used
+    when NumPy is not installed.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case by storing five places.
+        """
+        self.patcher = patch.object(column_store, "numpy", self.numpy())
+        self.patcher.start()
+        self.store = ColumnStore(("price_by_night", "latitude"))
+        self.places = [Place(id=str(i), price_by_night=10 * i,
+                             latitude=i / 2) for i in range(5)]
+        for place in self.places:
+            self.store.put(place.id, place)
+
+    def tearDown(self):
+        """
+        Tear down the test case by restoring the NumPy module.
+        """
+        self.patcher.stop()
+
+    def numpy(self):
+        """
+        Get the NumPy module the store is tested with.
+        """
+        return None
+
+    def test_pep8(self):
+        """
+        Test the code against PEP8 style guidelines.
+        """
+        py_code_style = pep8.StyleGuide(quiet=True)
+        check = py_code_style.check_files(
+            ['models/engine/column_store.py',
+                'tests/test_models/test_engine/test_column_store.py'])
+        self.assertEqual(check.total_errors, 0, "Errors found")
+
+    def test_select(self):
+        """
+        Test if select() returns the ids within the bounds.
+        """
+        self.assertEqual(
+            sorted(self.store.select(price_by_night=(10, 30))),
+            ["1", "2", "3"])
+        self.assertEqual(
+            sorted(self.store.select(price_by_night=(None, 30),
+                                     latitude=(1, None))),
+            ["2", "3"])
+        self.assertEqual(self.store.select(latitude=(10, None)), [])
+
+    def test_put_updates(self):
+        """
+        Test if put() updates the row of a stored object.
+        """
+        self.places[0].price_by_night = 100
+        self.store.put("0", self.places[0])
+        self.assertEqual(len(self.store), 5)
+        self.assertEqual(self.store.select(price_by_night=(50, None)), ["0"])
+
+    def test_discard(self):
+        """
+        Test if discard() removes a row and keeps the others.
+        """
+        self.store.discard("1")
+        self.store.discard("unknown")
+        self.assertEqual(len(self.store), 4)
+        self.assertEqual(sorted(self.store.select()), ["0", "2", "3", "4"])
+        self.assertEqual(self.store.select(price_by_night=(40, 40)), ["4"])
+
+    def test_missing(self):
+        """
+        Test if values that are not numbers are ignored.
+        """
+        self.places[2].price_by_night = "free"
+        self.store.put("2", self.places[2])
+        self.assertEqual(sorted(self.store.select(price_by_night=(0, None))),
+                         ["0", "1", "3", "4"])
+        self.assertEqual(self.store.aggregate("price_by_night", "count"), 4)
+
+    def test_aggregate(self):
+        """
+        Test if aggregate() computes each function within the bounds.
+        """
+        self.assertEqual(self.store.aggregate("price_by_night", "sum"), 100)
+        self.assertEqual(self.store.aggregate("price_by_night", "mean"), 20)
+        self.assertEqual(self.store.aggregate("latitude", "max",
+                                              price_by_night=(0, 20)), 1)
+        self.assertEqual(self.store.aggregate("latitude", "min",
+                                              price_by_night=(10, None)),
+                         0.5)
+        self.assertIsNone(self.store.aggregate("latitude", "min",
+                                               price_by_night=(99, None)))
+        with self.assertRaises(ValueError):
+            self.store.aggregate("latitude", "median")
+
+    def test_growth(self):
+        """
+        Test if the store grows past its initial capacity.
+        """
+        for i in range(5, 100):
+            self.store.put(str(i), Place(id=str(i), price_by_night=10 * i))
+        self.assertEqual(len(self.store), 100)
+        self.assertEqual(self.store.aggregate("price_by_night", "max"), 990)
+
+
+@unittest.skipIf(column_store.numpy is None, "NumPy is not installed")
+class TestColumnStoreNumPy(TestColumnStore):
+    """
+    Test case for the ColumnStore class, with NumPy arrays.
+    """
+
+    def numpy(self):
+        """
+        Get the NumPy module the store is tested with.
+        """
+        return column_store.numpy
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,429 @@
+#!/usr/bin/python3
+"""DBStorage class module Unittest"""
+import os
+import pep8
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.engine.db_storage import DBStorage
+from models.engine.query import Query
+
+
+class TestDBStorage(unittest.TestCase):
+    """
+    Test case for the DBStorage class.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case with a database in a temporary directory.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "file.db")
+        self.storage = DBStorage(self.path)
+        self.storage.reload()
+
+    def tearDown(self):
+        """
+        Tear down the test case by closing and removing the database.
+        """
+        self.storage.close()
+        self.directory.cleanup()
+
+    def test_pep8(self):
+        """
+        Test the code against PEP8 style guidelines.
+        """
+        py_code_style = pep8.StyleGuide(quiet=True)
+        check = py_code_style.check_files(
+            ['models/engine/db_storage.py',
+                'tests/test_models/test_engine/test_db_storage.py'])
+        self.assertEqual(check.total_errors, 0, "Errors found")
+
+    def test_schema(self):
+        """
+        Test if each class has a table, each foreign key an index and
+        each class with text attributes a full-text table.
+        """
+        connection = sqlite3.connect(self.path)
+        tables = {row[0] for row in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'")}
+        indexes = {row[0] for row in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'")}
+        connection.close()
+        self.assertEqual({name for name in tables if "_search" not in name},
+                         set(self.storage.classes()))
+        self.assertIn("Place_search", tables)
+        self.assertIn("Review_search", tables)
+        self.assertIn("City_state_id", indexes)
+        self.assertIn("Place_city_id", indexes)
+        self.assertIn("Review_place_id", indexes)
+
+    def test_save_reload(self):
+        """
+        Test if saved objects are read back after a reload.
+        """
+        place = Place()
+        place.name = "Loft"
+        place.number_rooms = 3
+        place.latitude = 1.5
+        place.amenity_ids = ["a", "b"]
+        place.owner = "someone"
+        self.storage.new(place)
+        self.storage.save()
+        self.storage.reload()
+        key = "Place." + place.id
+        self.assertEqual(list(self.storage.all(Place)), [key])
+        loaded = self.storage.get(Place, place.id)
+        self.assertIsNot(loaded, place)
+        self.assertEqual(loaded.to_dict(), place.to_dict())
+        self.assertIs(self.storage.get("Place", place.id), loaded)
+
+    def test_unsaved_changes(self):
+        """
+        Test if queries see unsaved changes and reload drops them.
+        """
+        state = State()
+        self.storage.new(state)
+        self.assertEqual(self.storage.count(State), 1)
+        self.storage.reload()
+        self.assertEqual(self.storage.count(State), 0)
+        self.assertIsNone(self.storage.get(State, state.id))
+
+    def test_delete(self):
+        """
+        Test if deleted objects are removed on save.
+        """
+        states = [State() for i in range(3)]
+        for state in states:
+            self.storage.new(state)
+        self.storage.save()
+        self.storage.delete(states[1])
+        self.storage.save()
+        self.storage.reload()
+        self.assertEqual(self.storage.count(), 2)
+        self.assertIsNone(self.storage.get(State, states[1].id))
+
+    def test_touch(self):
+        """
+        Test if touched objects are written again on save.
+        """
+        state = State()
+        self.storage.new(state)
+        self.storage.save()
+        state.name = "Texas"
+        self.storage.touch(state, "name")
+        self.storage.save()
+        self.storage.reload()
+        self.assertEqual(self.storage.get(State, state.id).name, "Texas")
+        state = State(name="no id")
+        state.number = 1
+        self.storage.touch(state, "number")
+        self.storage.delete(state)
+        self.assertEqual(self.storage.count(State), 1)
+
+    def test_refresh(self):
+        """
+        Test if refresh() reads again the rows another storage saved,
+        and keeps the unsaved changes.
+        """
+        state = State()
+        state.name = "A"
+        self.storage.new(state)
+        self.storage.save()
+        other = DBStorage(self.path)
+        other.reload()
+        try:
+            other.get(State, state.id).name = "B"
+            other.touch(other.get(State, state.id), "name")
+            other.save()
+            created = State()
+            self.storage.new(created)
+            self.storage.refresh()
+            self.assertIs(self.storage.get(State, created.id), created)
+            refreshed = self.storage.get(State, state.id)
+            self.assertEqual(refreshed.name, "B")
+            refreshed.code = "TX"
+            self.storage.touch(refreshed, "code")
+            self.storage.save()
+            other.refresh()
+            self.assertEqual(other.get(State, state.id).name, "B")
+            self.assertEqual(other.get(State, state.id).code, "TX")
+        finally:
+            other.close()
+
+    def test_find(self):
+        """
+        Test if find() matches declared, default and extra attributes.
+        """
+        first, second = State(), State()
+        cities = [City() for i in range(4)]
+        for index, city in enumerate(cities):
+            city.state_id = (first if index % 2 else second).id
+            self.storage.new(city)
+        cities[0].name = "Austin"
+        cities[1].zip = "78701"
+        self.storage.save()
+        self.assertEqual(
+            set(self.storage.find(City, state_id=first.id)),
+            {"City." + cities[1].id, "City." + cities[3].id})
+        self.assertEqual(
+            set(self.storage.find("City", state_id=second.id, name="")),
+            {"City." + cities[2].id})
+        self.assertEqual(set(self.storage.find(City, zip="78701")),
+                         {"City." + cities[1].id})
+        self.assertEqual(self.storage.find(City, state_id="none"), {})
+
+    def test_between(self):
+        """
+        Test if between() matches set and default numeric values.
+        """
+        places = [Place() for i in range(3)]
+        places[1].price_by_night = 80
+        places[2].price_by_night = 500
+        for place in places:
+            self.storage.new(place)
+        self.assertEqual(
+            set(self.storage.between(Place, price_by_night=(0, 100))),
+            {"Place." + places[0].id, "Place." + places[1].id})
+        self.assertEqual(
+            set(self.storage.between("Place", price_by_night=(100, None))),
+            {"Place." + places[2].id})
+        with self.assertRaises(KeyError):
+            self.storage.between(Place, name=(0, 1))
+
+    def test_batch(self):
+        """
+        Test if a batch commits once and rolls back on an exception.
+        """
+        state = State()
+        self.storage.new(state)
+        with self.storage.batch():
+            self.storage.new(City())
+            self.storage.save()
+        self.assertEqual(self.storage.count(), 2)
+        with self.assertRaises(ValueError):
+            with self.storage.batch():
+                self.storage.changing(state, "name")
+                state.__dict__["name"] = "Texas"
+                self.storage.new(City())
+                self.storage.delete(state)
+                self.assertEqual(self.storage.count(State), 0)
+                raise ValueError
+        self.assertNotIn("name", state.__dict__)
+        self.assertEqual(self.storage.count(State), 1)
+        self.assertEqual(self.storage.count(City), 1)
+        self.assertIs(self.storage.get(State, state.id), state)
+
+    def test_bulk_load(self):
+        """
+        Test if bulk_load() commits the rows of a file once, and if a
+        bad row leaves the batch in progress open.
+        """
+        path = os.path.join(self.directory.name, "places.ndjson")
+        with open(path, "w") as file:
+            file.write('{"name": "Loft", "max_guest": "4"}\n{}\n')
+        self.assertEqual(self.storage.bulk_load(Place, path), 2)
+        self.storage.reload()
+        places = self.storage.find(Place, max_guest=4)
+        self.assertEqual([place.name for place in places.values()],
+                         ["Loft"])
+        self.assertEqual(self.storage.count(Place), 2)
+        with open(path, "w") as file:
+            file.write('{"max_guest": "many"}\n')
+        self.storage.begin()
+        state = State()
+        self.storage.new(state)
+        with self.assertRaises(ValueError):
+            self.storage.bulk_load(Place, path)
+        self.assertTrue(self.storage.in_batch())
+        self.storage.commit()
+        self.storage.reload()
+        self.assertIsNotNone(self.storage.get(State, state.id))
+        self.assertEqual(self.storage.count(Place), 2)
+
+    def test_stream(self):
+        """
+        Test if stream() pages through the objects by class and id.
+        """
+        states = sorted([State() for i in range(5)], key=lambda s: s.id)
+        city = City()
+        for obj in states + [city]:
+            self.storage.new(obj)
+        with patch.object(DBStorage, "_DBStorage__page_size", 2):
+            self.assertEqual(list(self.storage.stream(State)), states)
+            self.assertEqual(list(self.storage.stream(
+                "State", offset=1, limit=3)), states[1:4])
+            self.assertEqual(list(self.storage.stream(
+                State, after="State." + states[2].id)), states[3:])
+            self.assertEqual(list(self.storage.stream(offset=2, limit=4)),
+                             states[2:] + [city])
+
+    def test_select(self):
+        """
+        Test if select() filters, sorts and limits in SQL, and checks
+        the other attributes on the objects.
+        """
+        places = [Place() for i in range(4)]
+        for index, place in enumerate(places):
+            place.city_id = "c" if index else "d"
+            place.name = "abcd"[index]
+            if index != 2:
+                place.price_by_night = index * 10
+            place.owner = index % 2
+            self.storage.new(place)
+        query = Query(Place).where(("price_by_night", "<", 25),
+                                   city_id="c").order_by("-name").limit(2)
+        self.assertEqual(self.storage.select(query), [places[2], places[1]])
+        steps = self.storage.explain(query)
+        self.assertTrue(steps[0].endswith("LIMIT ?"))
+        self.assertIn("USING INDEX Place_city_id", steps[1])
+        query = query.where(owner=1)
+        self.assertEqual(self.storage.select(query), [places[1]])
+        self.assertEqual(self.storage.explain(query)[-3:],
+                         ["filter owner = 1", "sort by name DESC",
+                          "limit 2"])
+
+    def test_search(self):
+        """
+        Test if search() ranks the matches of the full-text table, which
+        follows the saved changes and is filled when it is created.
+        """
+        reviews = [Review() for i in range(3)]
+        texts = ["Quiet and clean", "Very quiet street", "Loud"]
+        for review, text in zip(reviews, texts):
+            review.text = text
+            self.storage.new(review)
+        self.assertEqual([review for score, review in self.storage.search(
+            Review, "quiet clean")], reviews[:2])
+        self.assertEqual([review for score, review in self.storage.search(
+            "Review", '"very quiet"', 5)], reviews[1:2])
+        reviews[2].text = "quiet"
+        self.storage.new(reviews[2])
+        self.storage.delete(reviews[0])
+        self.assertEqual(len(self.storage.search(Review, "quiet")), 2)
+        self.storage.save()
+        with sqlite3.connect(self.path) as connection:
+            for statement in ("TRIGGER Review_search_insert",
+                              "TRIGGER Review_search_delete",
+                              "TABLE Review_search"):
+                connection.execute("DROP " + statement)
+        self.storage.reload()
+        self.assertEqual(len(self.storage.search(Review, "quiet", 1)), 1)
+        with self.assertRaises(KeyError):
+            self.storage.search(City, "quiet")
+
+    def test_having(self):
+        """
+        Test if having() filters the JSON lists of amenity ids with AND,
+        OR and NOT, an unset list holding no id.
+        """
+        places = [Place() for i in range(3)]
+        places[0].amenity_ids = ["wifi", "tv"]
+        places[1].amenity_ids = ["wifi", "pets"]
+        for place in places:
+            self.storage.new(place)
+        self.storage.save()
+        self.storage.reload()
+        self.assertEqual([place.id for place in self.storage.having(
+            Place, ["wifi"], none_of=["pets"]).values()], [places[0].id])
+        self.assertEqual(len(self.storage.having(
+            "Place", any_of=["pets", "tv"])), 2)
+        self.assertEqual([place.id for place in self.storage.having(
+            Place, none_of=["wifi"]).values()], [places[2].id])
+        with self.assertRaises(KeyError):
+            self.storage.having(City, ["wifi"])
+
+    def test_near(self):
+        """
+        Test if near() reads the rows around a point through the latitude
+        index, the unset coordinates reading as 0, and stops growing its
+        circle once it covers the globe.
+        """
+        places = [Place() for i in range(4)]
+        for index, place in enumerate(places[1:]):
+            place.latitude = 0.001 * (index + 1)
+            place.longitude = 180 if index % 2 else -180
+        for place in places:
+            self.storage.new(place)
+        found = self.storage.near(0, 180, 1)
+        self.assertEqual([place for distance, place in found], places[1:])
+        self.assertEqual([place for distance, place in self.storage.near(
+            0.001, 180, 200, 2)], places[1:3])
+        self.assertEqual([place for distance, place in self.storage.near(
+            0, 0.001, 200)], places[:1])
+        with patch.object(self.storage, "_DBStorage__select",
+                          wraps=self.storage._DBStorage__select) as select:
+            found = self.storage.near(0, 0, float("inf"), 10)
+        self.assertEqual(len(found), 4)
+        self.assertLessEqual(select.call_count, 12)
+        self.assertIn("USING INDEX Place_latitude", self.storage.explain(
+            Query(Place).where(("latitude", ">", 1)))[1])
+
+    def test_aggregate(self):
+        """
+        Test if aggregate() computes in SQL over the columns, reading
+        unset attributes as the class default, and over the objects
+        otherwise.
+        """
+        places = [Place() for i in range(5)]
+        for index, place in enumerate(places):
+            if index:
+                place.city_id = "c{}".format(index % 2)
+                place.price_by_night = index * 10
+            place.stars = index
+            self.storage.new(place)
+        self.assertEqual(self.storage.aggregate(Place, "count"), 5)
+        self.assertEqual(self.storage.aggregate(Place, "avg",
+                                                "price_by_night"), 20.0)
+        self.assertEqual(self.storage.aggregate(
+            "Place", "max", "price_by_night", "city_id"),
+            {"": 0.0, "c0": 40.0, "c1": 30.0})
+        self.assertEqual(self.storage.aggregate(Place, "count", "name"), 0)
+        self.assertEqual(self.storage.aggregate(Place, "sum", "stars",
+                                                "city_id"),
+                         {"": 0.0, "c0": 6.0, "c1": 4.0})
+        with self.assertRaises(ValueError):
+            self.storage.aggregate(Place, "avg")
+
+    def test_count(self):
+        """
+        Test if count() counts every class or one class.
+        """
+        for obj in [State(), State(), City()]:
+            self.storage.new(obj)
+        self.assertEqual(self.storage.count(), 3)
+        self.assertEqual(self.storage.count(State), 2)
+        self.assertEqual(self.storage.count("City"), 1)
+
+    def test_journal(self):
+        """
+        Test if the log and write-behind modes are refused, also when
+        the environment asks for them.
+        """
+        self.storage.journal(False)
+        self.storage.write_behind(False)
+        with self.assertRaises(ValueError):
+            self.storage.journal()
+        with self.assertRaises(ValueError):
+            self.storage.write_behind()
+        environment = dict(os.environ, PYTHONPATH=os.getcwd(),
+                           HBNB_TYPE_STORAGE="db", HBNB_FILE_JOURNAL="1",
+                           HBNB_SQLITE_PATH=self.path)
+        process = subprocess.run([sys.executable, "-c", "import models"],
+                                 env=environment, capture_output=True,
+                                 text=True)
+        self.assertNotEqual(process.returncode, 0)
+        self.assertIn("ValueError: DBStorage has no log mode",
+                      process.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,27 @@
 #!/usr/bin/python3
 """FileStorage class module Unittest"""
 import os
+import sys
+import json
+import subprocess
+import tempfile
+import time
+import threading
 import pep8
 import unittest
+from unittest.mock import patch
 from models import storage
+from models.user import User
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
 from models.base_model import BaseModel
 from models.engine import file_storage
+from models.engine.aggregate import Aggregate
 from models.engine.file_storage import FileStorage
+from models.engine.geo_index import GeoIndex
+from models.engine.query import Query
 
 
 class TestFileStorage(unittest.TestCase):
@@ -56,6 +71,481 @@ class TestFileStorage(unittest.TestCase):
         """
         self.assertTrue(type(self.file_stor.all()) == dict)
 
+    def test_all_cls(self):
+        """
+        Test if all() and count() select the objects of one class.
+        """
+        users = self.file_stor.count(User)
+        user = User()
+        key = "User." + user.id
+        self.assertIs(self.file_stor.all(User)[key], user)
+        self.assertIs(self.file_stor.all("User")[key], user)
+        self.assertNotIn(key, self.file_stor.all(BaseModel))
+        self.assertEqual(self.file_stor.count(User), users + 1)
+        self.assertEqual(self.file_stor.count("User"), users + 1)
+        self.file_stor.delete(user)
+        self.assertNotIn(key, self.file_stor.all(User))
+        self.assertEqual(self.file_stor.count(User), users)
+
+    def test_find(self):
+        """
+        Test if find() selects the objects with the given attribute
+        values, through an index or not.
+        """
+        city_1 = City()
+        city_1.state_id = "CA"
+        city_1.name = "San Francisco"
+        city_2 = City()
+        city_2.state_id = "CA"
+        key_1 = "City." + city_1.id
+        key_2 = "City." + city_2.id
+        self.assertEqual(self.file_stor.find(City, state_id="CA"),
+                         {key_1: city_1, key_2: city_2})
+        self.assertEqual(
+            self.file_stor.find("City", state_id="CA", name="San Francisco"),
+            {key_1: city_1})
+        self.assertEqual(self.file_stor.find(City, name="San Francisco"),
+                         {key_1: city_1})
+        city_2.state_id = "NV"
+        self.assertEqual(self.file_stor.find(City, state_id="NV"),
+                         {key_2: city_2})
+        self.file_stor.delete(city_1)
+        self.assertEqual(self.file_stor.find(City, state_id="CA"), {})
+
+    def test_between(self):
+        """
+        Test if between() selects the objects within numeric bounds and
+        follows the changes of the stored objects.
+        """
+        cheap = Place()
+        cheap.price_by_night = 4050
+        expensive = Place()
+        expensive.price_by_night = 4500
+        key_1 = "Place." + cheap.id
+        key_2 = "Place." + expensive.id
+        self.assertEqual(self.file_stor.between(Place,
+                                                price_by_night=(4040, 4100)),
+                         {key_1: cheap})
+        expensive.price_by_night = 4080
+        self.assertEqual(self.file_stor.between("Place",
+                                                price_by_night=(4040, 4100)),
+                         {key_1: cheap, key_2: expensive})
+        self.file_stor.delete(cheap)
+        self.assertEqual(self.file_stor.between(Place,
+                                                price_by_night=(4040, 4100)),
+                         {key_2: expensive})
+        self.assertEqual(self.file_stor.column_store(Place).aggregate(
+            "price_by_night", "sum", price_by_night=(4040, 4100)), 4080)
+
+    def test_batch(self):
+        """
+        Test if a batch saves once on commit and restores the objects
+        on rollback.
+        """
+        self.file_stor.save()
+        with patch.object(FileStorage, "write",
+                          wraps=self.file_stor.write) as write:
+            with self.file_stor.batch():
+                cities = [City() for i in range(10)]
+                for city in cities:
+                    city.save()
+        self.assertEqual(write.call_count, 1)
+        self.assertFalse(self.file_stor.in_batch())
+        with self.assertRaises(KeyError):
+            with self.file_stor.batch():
+                cities[0].state_id = "batch"
+                self.file_stor.delete(cities[1])
+                user = User()
+                user.save()
+                raise KeyError
+        self.assertNotIn("state_id", cities[0].__dict__)
+        self.assertIs(self.file_stor.get(City, cities[1].id), cities[1])
+        self.assertIsNone(self.file_stor.get(User, user.id))
+        self.assertEqual(self.file_stor.find(City, state_id="batch"), {})
+        with self.assertRaises(RuntimeError):
+            self.file_stor.commit()
+
+    def test_bulk_load(self):
+        """
+        Test if bulk_load() stores the rows of a file in one save, and
+        nothing if a row is invalid, leaving the batch in progress open.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cities.csv")
+            with open(path, "w") as file:
+                file.write("name,state_id\nAustin,bulk\nDallas,bulk\n")
+            self.file_stor.save()
+            with patch.object(FileStorage, "write",
+                              wraps=self.file_stor.write) as write:
+                self.assertEqual(self.file_stor.bulk_load(City, path), 2)
+            self.assertEqual(write.call_count, 1)
+            cities = self.file_stor.find(City, state_id="bulk")
+            self.assertEqual(sorted(city.name for city in cities.values()),
+                             ["Austin", "Dallas"])
+            with open("file.json", "r") as file:
+                self.assertTrue(set(cities) <= set(json.load(file)))
+            path = os.path.join(directory, "cities.ndjson")
+            with open(path, "w") as file:
+                file.write('{"state_id": "bulk"}\n{"state_id": 5}\n')
+            count = self.file_stor.count()
+            with self.assertRaisesRegex(ValueError, "^Line 2: "):
+                self.file_stor.bulk_load("City", path)
+            self.assertEqual(self.file_stor.count(), count)
+            self.assertFalse(self.file_stor.in_batch())
+            self.file_stor.begin()
+            state = State()
+            with self.assertRaises(ValueError):
+                self.file_stor.bulk_load("City", path)
+            self.assertTrue(self.file_stor.in_batch())
+            self.file_stor.commit()
+            with open("file.json", "r") as file:
+                self.assertIn("State." + state.id, json.load(file))
+
+    def test_stream(self):
+        """
+        Test if stream() pages through the objects in storage order,
+        and resumes after objects are added during the iteration.
+        """
+        states = [State() for i in range(5)]
+        keys = ["State." + state.id for state in states]
+        streamed = list(self.file_stor.stream(State, after=keys[0]))
+        self.assertEqual(streamed[-4:], states[1:])
+        self.assertEqual(list(self.file_stor.stream(
+            "State", offset=1, limit=2, after=keys[0])), states[2:4])
+        self.assertEqual(list(self.file_stor.stream(
+            after=keys[3], limit=5)), states[4:])
+        with patch.object(FileStorage, "_FileStorage__page_size", 2):
+            streamed = []
+            for state in self.file_stor.stream(State, after=keys[0]):
+                streamed.append(state)
+                if state is states[2]:
+                    added = State()
+            self.assertEqual(streamed[-5:], states[1:] + [added])
+
+    def test_aggregate(self):
+        """
+        Test if aggregate() gives the same results through the column
+        store and through a pass over the objects.
+        """
+        places = [Place() for i in range(4)]
+        for index, place in enumerate(places):
+            place.city_id = "aggregate{}".format(index % 2)
+            place.number_rooms = index + 1
+            place.rooms = index + 1
+        self.assertEqual(self.file_stor.aggregate(Place, "count"),
+                         self.file_stor.count(Place))
+        for function in ("count", "sum", "avg", "min", "max"):
+            self.assertAlmostEqual(
+                self.file_stor.aggregate(Place, function, "number_rooms"),
+                Aggregate.over(self.file_stor.all(Place).values(),
+                               function, "number_rooms"))
+        groups = self.file_stor.aggregate(Place, "sum", "rooms", "city_id")
+        self.assertEqual((groups["aggregate0"], groups["aggregate1"]),
+                         (4.0, 6.0))
+        with self.assertRaises(ValueError):
+            self.file_stor.aggregate(Place, "median", "number_rooms")
+
+    def test_near(self):
+        """
+        Test if near() finds the closest Places as they are created,
+        moved and deleted.
+        """
+        places = [Place() for i in range(3)]
+        for index, place in enumerate(places):
+            place.latitude = -54.5 + index / 100
+            place.longitude = -179.99
+        self.assertEqual([place for distance, place in self.file_stor.near(
+            -54.5, 179.99, 10, 2)], places[:2])
+        places[0].longitude = 0.5
+        self.file_stor.delete(places[2])
+        found = self.file_stor.near(-54.5, 179.99, 10)
+        self.assertEqual([place for distance, place in found], places[1:2])
+        self.assertAlmostEqual(found[0][0], GeoIndex.distance(
+            (-54.5, 179.99), (-54.49, -179.99)))
+        with self.assertRaises(KeyError):
+            self.file_stor.near(0, 0, 10, cls="City")
+
+    def test_search(self):
+        """
+        Test if search() ranks the Reviews by their text as they are
+        created, changed and deleted.
+        """
+        reviews = [Review() for i in range(3)]
+        reviews[0].text = "Spotless zephyr loft, a spotless stay"
+        reviews[1].text = "The zephyr kept us awake"
+        self.assertEqual([review for score, review in self.file_stor.search(
+            Review, "spotless zephyr")], reviews[:2])
+        reviews[2].text = "zephyr zephyr"
+        self.file_stor.delete(reviews[0])
+        self.assertEqual([review for score, review in self.file_stor.search(
+            "Review", "zephyr", 1)], reviews[2:])
+        self.assertEqual(self.file_stor.search(Review, "spotless"), [])
+        with self.assertRaises(KeyError):
+            self.file_stor.search(City, "zephyr")
+
+    def test_having(self):
+        """
+        Test if having() combines amenity ids with AND, OR and NOT as
+        the Places are created, changed and deleted.
+        """
+        places = [Place() for i in range(4)]
+        places[0].amenity_ids = ["wifi-h", "tv-h"]
+        places[1].amenity_ids = ["wifi-h", "pets-h"]
+        places[2].amenity_ids = ["tv-h"]
+        self.assertEqual(list(self.file_stor.having(
+            Place, ["wifi-h"], none_of=["pets-h"]).values()), places[:1])
+        self.assertEqual(set(self.file_stor.having(
+            "Place", any_of=["pets-h", "tv-h"]).values()), set(places[:3]))
+        self.assertNotIn("amenity_ids", vars(places[3]))
+        places[3].amenity_ids.append("wifi-h")
+        places[3].save()
+        self.file_stor.delete(places[1])
+        self.assertEqual(set(self.file_stor.having(
+            Place, ["wifi-h"], ["tv-h", "wifi-h"]).values()),
+            {places[0], places[3]})
+        self.assertEqual(self.file_stor.having(Place, ["wifi-h", "spa-h"]),
+                         {})
+        with self.assertRaises(KeyError):
+            self.file_stor.having(Place, ["wifi-h"], attribute="name")
+
+    def test_select(self):
+        """
+        Test if select() reads through an index, the column store or a
+        scan, and explain() tells which.
+        """
+        places = [Place() for i in range(4)]
+        for index, place in enumerate(places):
+            place.city_id = "select"
+            place.price_by_night = 4200 + index
+        query = Query(Place).where(("price_by_night", ">", 4200),
+                                   city_id="select").order_by(
+            "-price_by_night").limit(2)
+        self.assertEqual(self.file_stor.select(query), places[:1:-1])
+        self.assertRegex(self.file_stor.explain(query)[0],
+                         r"^index lookup Place.city_id = 'select' \(4 of ")
+        query = Query(Place).where(("price_by_night", ">=", 4202),
+                                   ("price_by_night", "<", 4210))
+        self.assertEqual(self.file_stor.select(query), places[2:])
+        self.assertTrue(self.file_stor.explain(query)[0].startswith(
+            "column store range price_by_night in [4202, 4210]"))
+        places[3].description = "select"
+        query = Query("Place").where(description="select").limit(1)
+        self.assertEqual(self.file_stor.select(query), places[3:])
+        self.assertEqual(self.file_stor.explain(query)[1:],
+                         ["filter description = 'select'", "limit 1"])
+        self.assertTrue(self.file_stor.explain(query)[0].startswith(
+            "scan Place"))
+
+    def test_write_behind(self):
+        """
+        Test if write-behind saves merge into one background write, and
+        if flush() writes at once.
+        """
+        self.file_stor.write_behind(quiet=0.05, max_delay=1)
+        try:
+            with patch.object(FileStorage, "write",
+                              wraps=self.file_stor.write) as write:
+                for i in range(5):
+                    User().save()
+                self.assertEqual(write.call_count, 0)
+                self.file_stor.flush()
+                self.assertEqual(write.call_count, 1)
+                self.file_stor.flush()
+                self.assertEqual(write.call_count, 1)
+                user = User()
+                user.save()
+                for i in range(100):
+                    with open("file.json", "r") as file:
+                        if "User." + user.id in json.load(file):
+                            break
+                    time.sleep(0.01)
+                self.assertEqual(write.call_count, 2)
+            with open("file.json", "r") as file:
+                self.assertIn("User." + user.id, json.load(file))
+        finally:
+            self.file_stor.write_behind(False)
+
+    def test_write_behind_batch(self):
+        """
+        Test if the changes of a batch rolled back in write-behind mode
+        never reach the file.
+        """
+        state = State()
+        state.name = "pre"
+        self.file_stor.write_behind(quiet=0.01, max_delay=0.01)
+        try:
+            state.save()
+            self.file_stor.begin()
+            with open("file.json", "r") as file:
+                self.assertEqual(json.load(file)["State." + state.id]["name"],
+                                 "pre")
+            state.name = "inbatch"
+            state.save()
+            time.sleep(0.1)
+            self.file_stor.rollback()
+            self.file_stor.flush()
+            self.assertEqual(state.name, "pre")
+            with open("file.json", "r") as file:
+                self.assertEqual(json.load(file)["State." + state.id]["name"],
+                                 "pre")
+        finally:
+            if self.file_stor.in_batch():
+                self.file_stor.rollback()
+            self.file_stor.write_behind(False)
+
+    def test_write_behind_exit(self):
+        """
+        Test if a process exiting during a background write, right after
+        a burst of saves, still writes all of them.
+        """
+        code = ("import time\n"
+                "from models import storage\n"
+                "from models.engine.file_storage import FileStorage\n"
+                "from models.state import State\n"
+                "write = FileStorage.write\n"
+                "def slow_write(self, entries):\n"
+                "    entries = list(entries)\n"
+                "    time.sleep(0.3)\n"
+                "    write(self, entries)\n"
+                "FileStorage.write = slow_write\n"
+                "storage.write_behind(quiet=0.01, max_delay=0.01)\n"
+                "for i in range(50):\n"
+                "    State().save()\n"
+                "time.sleep(0.1)\n")
+        with tempfile.TemporaryDirectory() as directory:
+            subprocess.run([sys.executable, "-c", code], check=True,
+                           cwd=directory,
+                           env=dict(os.environ, PYTHONPATH=os.getcwd()))
+            with open(os.path.join(directory, "file.json"), "r") as file:
+                self.assertEqual(len(json.load(file)), 50)
+
+    def test_threads(self):
+        """
+        Stress the storage with threads creating, changing, deleting,
+        reading and saving objects at once.
+        """
+        errors = []
+        marker = "threads"
+
+        def run(work):
+            try:
+                for i in range(100):
+                    work(i)
+            except Exception as error:
+                errors.append(error)
+
+        def write(i):
+            city = City()
+            city.state_id = marker
+            city.name = str(i)
+            if i % 4 == 0:
+                self.file_stor.delete(city)
+
+        def read(i):
+            for key, obj in self.file_stor.all().items():
+                obj.to_dict()
+            self.file_stor.find(City, state_id=marker)
+            self.file_stor.count(City)
+
+        def save(i):
+            if i % 10 == 0:
+                self.file_stor.save()
+
+        threads = [threading.Thread(target=run, args=(work,))
+                   for work in [write] * 4 + [read] * 4 + [save]]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(self.file_stor.find(City, state_id=marker)),
+                         4 * 75)
+        self.file_stor.save()
+        with open("file.json", "r") as file:
+            saved = json.load(file)
+        self.assertEqual(len([value for value in saved.values()
+                              if value.get("state_id") == marker]), 4 * 75)
+
+    def run_process(self, code):
+        """
+        Run code in another process sharing the storage file.
+
+        Args:
+            code (str): The Python code to run.
+
+        Returns:
+            str: What the process printed.
+        """
+        environment = dict(os.environ, HBNB_FILE_SHARED="1",
+                           PYTHONPATH=os.getcwd())
+        return subprocess.run([sys.executable, "-c", code], check=True,
+                              env=environment, capture_output=True,
+                              text=True).stdout.strip()
+
+    def test_share(self):
+        """
+        Test if saves merge the records other processes saved, and if
+        refresh() picks them up.
+        """
+        self.file_stor.share()
+        try:
+            city = City()
+            city.save()
+            state_id = self.run_process(
+                "from models.state import State\n"
+                "state = State()\n"
+                "state.save()\n"
+                "print(state.id)")
+            user = User()
+            user.save()
+            self.assertIsNotNone(self.file_stor.get("State", state_id))
+            with open("file.json", "r") as file:
+                saved = json.load(file)
+            for key in ("City." + city.id, "State." + state_id,
+                        "User." + user.id):
+                self.assertIn(key, saved)
+            self.run_process(
+                "from models import storage\n"
+                "city = storage.get('City', '{}')\n"
+                "city.name = 'Shared'\n"
+                "city.save()\n"
+                "storage.delete(storage.get('State', '{}'))\n"
+                "storage.save()".format(city.id, state_id))
+            self.file_stor.refresh()
+            self.assertEqual(self.file_stor.get(City, city.id).name,
+                             "Shared")
+            self.assertIsNone(self.file_stor.get("State", state_id))
+            self.assertIs(self.file_stor.get(User, user.id), user)
+        finally:
+            self.file_stor.share(False)
+            os.remove("file.json.lock")
+
+    def test_share_concurrent(self):
+        """
+        Test if processes saving at once lose no update.
+        """
+        self.file_stor.share()
+        try:
+            self.file_stor.save()
+            code = ("from models.state import State\n"
+                    "for i in range(20):\n"
+                    "    state = State()\n"
+                    "    state.name = 'concurrent'\n"
+                    "    state.save()")
+            environment = dict(os.environ, HBNB_FILE_SHARED="1",
+                               PYTHONPATH=os.getcwd())
+            processes = [subprocess.Popen([sys.executable, "-c", code],
+                                          env=environment)
+                         for i in range(3)]
+            for process in processes:
+                self.assertEqual(process.wait(), 0)
+            self.file_stor.refresh()
+            self.assertEqual(
+                len(self.file_stor.find(State, name="concurrent")), 60)
+        finally:
+            self.file_stor.share(False)
+            os.remove("file.json.lock")
+
     def test_new(self):
         """
         Test if a new BaseModel instance is added to the
@@ -90,6 +580,122 @@ class TestFileStorage(unittest.TestCase):
         self.assertEqual(dict1[key_1].to_dict(), dict2[
             key_2].to_dict())
 
+    def test_dirty_tracking(self):
+        """
+        Test if save() only serializes the objects changed since the
+        last save.
+        """
+        models = [BaseModel() for i in range(3)]
+        self.file_stor.save()
+        self.assertEqual(FileStorage._FileStorage__dirty, set())
+        models[0].name = "dirty"
+        self.assertEqual(FileStorage._FileStorage__dirty,
+                         {"BaseModel." + models[0].id})
+        with patch.object(BaseModel, "to_dict",
+                          autospec=True,
+                          side_effect=BaseModel.to_dict) as to_dict:
+            self.file_stor.save()
+        self.assertEqual(to_dict.call_count, 1)
+        with open("file.json", "r", encoding="utf-8") as file:
+            snapshot = json.load(file)
+        self.assertEqual(snapshot["BaseModel." + models[0].id]["name"],
+                         "dirty")
+        self.assertIn("BaseModel." + models[1].id, snapshot)
+
+    def test_no_id(self):
+        """
+        Test if instances built without an id can be changed and deleted
+        while they are not stored.
+        """
+        model = BaseModel(name="no id")
+        model.number = 1
+        self.file_stor.touch(model)
+        self.file_stor.delete(model)
+        self.assertEqual((model.name, model.number), ("no id", 1))
+
+    def test_lazy(self):
+        """
+        Test if lazy mode builds the instances on first access only, and
+        if the unbuilt records read their dates as datetimes.
+        """
+        city = City()
+        city.state_id = "lazy"
+        key = "City." + city.id
+        unbuilt = City()
+        self.file_stor.save()
+        self.file_stor.lazy()
+        try:
+            self.file_stor.reload()
+            pending = FileStorage._FileStorage__pending
+            self.assertEqual(pending, self.file_stor.count())
+            self.assertIsInstance(self.file_stor.all(City)[key], City)
+            self.assertEqual(FileStorage._FileStorage__pending,
+                             pending - self.file_stor.count(City))
+            self.file_stor.reload()
+            self.assertIsInstance(self.file_stor.get(City, city.id), City)
+            self.assertIsNone(self.file_stor.get(City, "nope"))
+            self.assertEqual(FileStorage._FileStorage__pending, pending - 1)
+            self.assertIn(key, self.file_stor.find(City, state_id="lazy"))
+            self.assertEqual(FileStorage._FileStorage__pending, pending - 1)
+            self.assertIsInstance(self.file_stor.all()[key], City)
+            self.assertEqual(FileStorage._FileStorage__pending, 0)
+            self.file_stor.reload()
+            self.file_stor.get(City, city.id)
+            self.assertIn(key, self.file_stor.find(
+                City, created_at=city.created_at))
+            self.assertIn("City." + unbuilt.id, self.file_stor.find(
+                City, created_at=unbuilt.created_at))
+        finally:
+            self.file_stor.lazy(False)
+            self.file_stor.reload()
+
+    def test_journal(self):
+        """
+        Test if log mode appends one record per change and if reload()
+        replays the log on top of the snapshot.
+        """
+        log_path = FileStorage._FileStorage__log_path
+        self.file_stor.save()
+        self.file_stor.journal()
+        try:
+            model = BaseModel()
+            model.name = "journaled"
+            model.save()
+            with open(log_path, "r", encoding="utf-8") as file:
+                self.assertEqual(len(file.readlines()), 1)
+            self.file_stor.reload()
+            key = "BaseModel." + model.id
+            self.assertEqual(self.file_stor.all()[key].name, "journaled")
+            self.file_stor.delete(self.file_stor.all()[key])
+            self.file_stor.save()
+            self.file_stor.reload()
+            self.assertNotIn(key, self.file_stor.all())
+        finally:
+            self.file_stor.journal(False)
+            self.file_stor.save()
+        self.assertFalse(os.path.isfile(log_path))
+
+    def test_compact(self):
+        """
+        Test if the log is folded into the snapshot once it reaches
+        the record threshold.
+        """
+        log_path = FileStorage._FileStorage__log_path
+        self.file_stor.save()
+        self.file_stor.journal(max_records=3)
+        try:
+            models = [BaseModel() for i in range(3)]
+            self.file_stor.save()
+            FileStorage._FileStorage__compactor.join()
+            self.assertFalse(os.path.isfile(log_path))
+            with open("file.json", "r", encoding="utf-8") as file:
+                snapshot = json.load(file)
+            for model in models:
+                self.assertIn("BaseModel." + model.id, snapshot)
+        finally:
+            self.file_stor.journal(False, max_records=10000)
+            self.file_stor.save()
+
 
 if __name__ == '__main__':
     unittest.main()
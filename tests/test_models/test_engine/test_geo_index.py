@@ -0,0 +1,109 @@
+#!/usr/bin/python3
+"""GeoIndex class module Unittest"""
+import pep8
+import random
+import types
+import unittest
+from unittest.mock import patch
+from models.engine.geo_index import GeoIndex
+
+
+class TestGeoIndex(unittest.TestCase):
+    """
+    Test case for the GeoIndex class.
+    """
+
+    def test_pep8(self):
+        """
+        Test the code against PEP8 style guidelines.
+        """
+        py_code_style = pep8.StyleGuide(quiet=True)
+        check = py_code_style.check_files(
+            ['models/engine/geo_index.py',
+                'tests/test_models/test_engine/test_geo_index.py'])
+        self.assertEqual(check.total_errors, 0, "Errors found")
+
+    def test_distance(self):
+        """
+        Test the great-circle distance and the checks of a point.
+        """
+        self.assertAlmostEqual(GeoIndex.distance((0, 0), (0, 1)),
+                               111.195, places=3)
+        self.assertAlmostEqual(GeoIndex.distance((10, 179.5), (10, -179.5)),
+                               GeoIndex.distance((10, 0), (10, 1)))
+        self.assertEqual(GeoIndex.coordinates(1, 2), (1.0, 2.0))
+        self.assertIsNone(GeoIndex.coordinates(91, 0))
+        self.assertIsNone(GeoIndex.coordinates(0, "2"))
+        self.assertIsNone(GeoIndex.coordinates(True, 0))
+
+    def test_put_discard(self):
+        """
+        Test if objects are moved and removed, and those without
+        coordinates are left out.
+        """
+        index = GeoIndex()
+        place = types.SimpleNamespace(latitude=48.85, longitude=2.35)
+        index.put("a", place)
+        self.assertEqual(index.nearest(48.8, 2.3, 10), [
+            (GeoIndex.distance((48.8, 2.3), (48.85, 2.35)), "a")])
+        place.latitude, place.longitude = -33.87, 151.21
+        index.put("a", place)
+        self.assertEqual(index.nearest(48.8, 2.3, 10), [])
+        self.assertEqual(len(index.nearest(-33.9, 151.2, 10)), 1)
+        place.latitude = "north"
+        index.put("a", place)
+        self.assertEqual(len(index), 0)
+        place.latitude = 0
+        index.put("a", place)
+        index.discard("a")
+        index.discard("b")
+        self.assertEqual(len(index), 0)
+        with self.assertRaises(ValueError):
+            index.nearest(0, 200, 10)
+
+    def test_nearest(self):
+        """
+        Test if nearest() agrees with a scan, across the antimeridian
+        and near the poles.
+        """
+        index = GeoIndex(degrees=2)
+        points = {}
+        for number in range(2000):
+            point = (random.uniform(-90, 90), random.uniform(-180, 180))
+            if number % 5 == 0:
+                point = (random.uniform(80, 90), random.choice((-180, 180)))
+            place = types.SimpleNamespace(latitude=point[0],
+                                          longitude=point[1])
+            points[str(number)] = point
+            index.put(str(number), place)
+        for latitude, longitude, km, limit in (
+                (0, 0, 3000, None), (50, 179.5, 800, None),
+                (-20, -179.9, 20000, 10), (89, 0, 500, 3), (30, 10, 1, 5),
+                (-90, 0, 2000, 1)):
+            found = sorted(
+                (GeoIndex.distance((latitude, longitude), point), key)
+                for key, point in points.items()
+                if GeoIndex.distance((latitude, longitude), point) <= km)
+            self.assertEqual(
+                index.nearest(latitude, longitude, km, limit),
+                found[:limit])
+        self.assertEqual(index.nearest(0, 0, 100, 0), [])
+
+    def test_nearest_everywhere(self):
+        """
+        Test if nearest() with an infinite distance stops growing its
+        radius once it covers the globe.
+        """
+        index = GeoIndex()
+        for number, point in enumerate(((0, 0), (0, 180), (-90, 0))):
+            index.put(str(number), types.SimpleNamespace(
+                latitude=point[0], longitude=point[1]))
+        with patch.object(index, "_GeoIndex__within",
+                          wraps=index._GeoIndex__within) as within:
+            found = index.nearest(0, 0, float("inf"), 5)
+        self.assertEqual([key for distance, key in found], ["0", "2", "1"])
+        self.assertLessEqual(within.call_count, 12)
+
+
+if __name__ == "__main__":
+    unittest.main()
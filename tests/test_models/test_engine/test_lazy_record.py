@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+"""LazyRecord class module Unittest"""
+import pep8
+import unittest
+from datetime import datetime
+from models.place import Place
+from models.engine.lazy_record import LazyRecord
+
+
+class TestLazyRecord(unittest.TestCase):
+    """
+    Test case for the LazyRecord class.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case with the record of a Place.
+        """
+        self.values = {"id": "1", "__class__": "Place", "name": "Loft",
+                       "created_at": "2023-07-14T13:57:32.171403",
+                       "updated_at": "2023-07-14T13:57:32.171516"}
+        self.record = LazyRecord(Place, self.values)
+
+    def test_pep8(self):
+        """
+        Test the code against PEP8 style guidelines.
+        """
+        py_code_style = pep8.StyleGuide(quiet=True)
+        check = py_code_style.check_files(
+            ['models/engine/lazy_record.py',
+                'tests/test_models/test_engine/test_lazy_record.py'])
+        self.assertEqual(check.total_errors, 0, "Errors found")
+
+    def test_getattr(self):
+        """
+        Test if attributes read the values, then the class defaults.
+        """
+        self.assertEqual(self.record.name, "Loft")
+        self.assertEqual(self.record.max_guest, 0)
+        self.assertIsNone(getattr(self.record, "nope", None))
+        self.assertEqual(self.record.created_at,
+                         datetime(2023, 7, 14, 13, 57, 32, 171403))
+        self.assertEqual(self.record.updated_at,
+                         self.record.materialize().updated_at)
+
+    def test_materialize(self):
+        """
+        Test if materialize() builds the instance.
+        """
+        place = self.record.materialize()
+        self.assertIsInstance(place, Place)
+        self.assertEqual(place.name, "Loft")
+        self.assertIsInstance(place.created_at, datetime)
+        self.assertEqual(self.values["created_at"],
+                         "2023-07-14T13:57:32.171403")
+
+
+if __name__ == '__main__':
+    unittest.main()
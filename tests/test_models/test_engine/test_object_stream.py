@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+"""ObjectStream class module Unittest"""
+import pep8
+import unittest
+from io import StringIO
+from models.engine.object_stream import ObjectStream
+
+
+class TestObjectStream(unittest.TestCase):
+    """
+    Test case for the ObjectStream class.
+    """
+
+    def test_pep8(self):
+        """
+        Test the code against PEP8 style guidelines.
+        """
+        py_code_style = pep8.StyleGuide(quiet=True)
+        check = py_code_style.check_files(
+            ['models/engine/object_stream.py',
+                'tests/test_models/test_engine/test_object_stream.py'])
+        self.assertEqual(check.total_errors, 0, "Errors found")
+
+    def test_members(self):
+        """
+        Test if the members are decoded across chunk boundaries.
+        """
+        text = ' {"a": {"id": "1", "n": [1, 2.5, null]},\n "b" : 12345,' \
+               '"c": "x}y", "d": true }'
+        for chunk_size in (1, 2, 7, 1 << 16):
+            members = list(ObjectStream(StringIO(text), chunk_size))
+            self.assertEqual(members, [("a", {"id": "1", "n": [1, 2.5, None]}),
+                                       ("b", 12345), ("c", "x}y"),
+                                       ("d", True)])
+
+    def test_empty(self):
+        """
+        Test if an empty object has no members.
+        """
+        self.assertEqual(list(ObjectStream(StringIO("{ }"))), [])
+
+    def test_invalid(self):
+        """
+        Test if a file that is not a JSON object raises ValueError.
+        """
+        for text in ("", "[]", '{"a" 1}', '{"a": 1 "b": 2}', '{"a": '):
+            with self.assertRaises(ValueError):
+                list(ObjectStream(StringIO(text), 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
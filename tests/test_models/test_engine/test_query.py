@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+"""Query class module Unittest"""
+import pep8
+import unittest
+from models.place import Place
+from models.engine.query import Query
+
+
+class TestQuery(unittest.TestCase):
+    """
+    Test case for the Query class.
+    """
+
+    def test_pep8(self):
+        """
+        Test the code against PEP8 style guidelines.
+        """
+        py_code_style = pep8.StyleGuide(quiet=True)
+        check = py_code_style.check_files(
+            ['models/engine/query.py',
+                'tests/test_models/test_engine/test_query.py'])
+        self.assertEqual(check.total_errors, 0, "Errors found")
+
+    def test_build(self):
+        """
+        Test if where(), order_by() and limit() return new queries.
+        """
+        query = Query(Place)
+        built = query.where(("max_guest", ">", 2), city_id="c").order_by(
+            "-max_guest", "name").limit(3)
+        self.assertEqual(query.conditions, ())
+        self.assertEqual(built.class_name, "Place")
+        self.assertEqual(built.conditions, (("max_guest", ">", 2),
+                                            ("city_id", "=", "c")))
+        self.assertEqual(built.order, (("max_guest", True),
+                                       ("name", False)))
+        self.assertEqual(built.row_limit, 3)
+        self.assertEqual(built.equals("city_id"), ["c"])
+        with self.assertRaises(ValueError):
+            query.where(("name", "~", "a"))
+        with self.assertRaises(ValueError):
+            query.limit(-1)
+
+    def test_bounds(self):
+        """
+        Test if bounds() merges the numeric conditions of attributes.
+        """
+        query = Query("Place").where(
+            ("max_guest", ">", 2), ("max_guest", "<=", 8),
+            ("max_guest", ">=", 4), ("latitude", "=", 1.5),
+            ("number_rooms", "!=", 1), ("name", "<", "b"),
+            ("price_by_night", "<", "10"))
+        self.assertEqual(
+            query.bounds(("max_guest", "latitude", "number_rooms",
+                          "price_by_night")),
+            {"max_guest": (4, 8), "latitude": (1.5, 1.5)})
+
+    def test_matches_arrange(self):
+        """
+        Test if matches() checks every condition and arrange() sorts
+        and limits.
+        """
+        places = [Place() for i in range(4)]
+        for place, (name, guests) in zip(places, [("b", 2), ("a", 2),
+                                                  ("c", 5), ("d", "x")]):
+            place.name = name
+            place.max_guest = guests
+        query = Query(Place).where(("max_guest", ">=", 2))
+        matches = [place for place in places if query.matches(place)]
+        self.assertEqual(matches, places[:3])
+        self.assertEqual(query.order_by("-max_guest", "name").limit(
+            2).arrange(matches), [places[2], places[1]])
+        self.assertEqual(query.limit(1).arrange(iter(matches)), places[:1])
+        self.assertEqual(query.order_by("name").describe(),
+                         ["filter max_guest >= 2", "sort by name"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+#!/usr/bin/python3
+"""RWLock class module Unittest"""
+import pep8
+import threading
+import time
+import unittest
+from models.engine.rw_lock import RWLock
+
+
+class TestRWLock(unittest.TestCase):
+    """
+    Test case for the RWLock class.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case with an unlocked lock.
+        """
+        self.lock = RWLock()
+
+    def test_pep8(self):
+        """
+        Test the code against PEP8 style guidelines.
+        """
+        py_code_style = pep8.StyleGuide(quiet=True)
+        check = py_code_style.check_files(
+            ['models/engine/rw_lock.py',
+                'tests/test_models/test_engine/test_rw_lock.py'])
+        self.assertEqual(check.total_errors, 0, "Errors found")
+
+    def test_readers_share(self):
+        """
+        Test if several threads read at once.
+        """
+        inside = threading.Barrier(3, timeout=5)
+
+        def read():
+            with self.lock.reading():
+                inside.wait()
+
+        threads = [threading.Thread(target=read) for i in range(2)]
+        for thread in threads:
+            thread.start()
+        with self.lock.reading():
+            inside.wait()
+        for thread in threads:
+            thread.join()
+
+    def test_writer_excludes(self):
+        """
+        Test if a writer waits for the readers and blocks new ones.
+        """
+        events = []
+        self.lock.acquire_read()
+
+        def write():
+            with self.lock.writing():
+                events.append("write")
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        time.sleep(0.05)
+        self.assertEqual(events, [])
+
+        def read():
+            with self.lock.reading():
+                events.append("read")
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        time.sleep(0.05)
+        self.assertEqual(events, [])
+        self.lock.release_read()
+        writer.join(5)
+        reader.join(5)
+        self.assertEqual(events, ["write", "read"])
+
+    def test_reentrant(self):
+        """
+        Test if both sides are reentrant and the writer may read.
+        """
+        with self.lock.writing():
+            with self.lock.writing():
+                with self.lock.reading():
+                    pass
+        with self.lock.reading():
+            with self.lock.reading():
+                with self.assertRaises(RuntimeError):
+                    self.lock.acquire_write()
+        with self.lock.writing():
+            pass
+
+
+if __name__ == "__main__":
+    unittest.main()
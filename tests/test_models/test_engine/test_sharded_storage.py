@@ -0,0 +1,211 @@
+#!/usr/bin/python3
+"""ShardedStorage class module Unittest"""
+import os
+import json
+import pep8
+import subprocess
+import sys
+import tempfile
+import unittest
+from models.city import City
+from models.state import State
+from models.engine.file_storage import FileStorage
+from models.engine.lazy_record import LazyRecord
+from models.engine.sharded_storage import ShardedStorage
+
+
+class TestShardedStorage(unittest.TestCase):
+    """
+    Test case for the ShardedStorage class.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case with a shard directory in a temporary
+        directory.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "file.shards")
+        self.shard_path = ShardedStorage._ShardedStorage__directory
+        ShardedStorage._ShardedStorage__directory = self.path
+        self.storage = ShardedStorage()
+        self.storage.reload()
+
+    def tearDown(self):
+        """
+        Tear down the test case by removing the shard directory and the
+        stored objects.
+        """
+        ShardedStorage._ShardedStorage__directory = self.shard_path
+        self.storage.lazy(False)
+        self.storage.reload()
+        FileStorage._FileStorage__objects = {}
+        self.directory.cleanup()
+
+    def manifest(self):
+        """
+        Read the manifest of the shard directory.
+
+        Returns:
+            dict: The manifest.
+        """
+        with open(os.path.join(self.path, "manifest.json"), "r",
+                  encoding="utf-8") as file:
+            return json.load(file)
+
+    def test_pep8(self):
+        """
+        Test the code against PEP8 style guidelines.
+        """
+        py_code_style = pep8.StyleGuide(quiet=True)
+        check = py_code_style.check_files(
+            ['models/engine/sharded_storage.py',
+                'tests/test_models/test_engine/test_sharded_storage.py'])
+        self.assertEqual(check.total_errors, 0, "Errors found")
+
+    def test_save_reload(self):
+        """
+        Test if changes survive a save and a reload, in and out of the
+        lazy mode.
+        """
+        states = [State() for i in range(40)]
+        for state in states:
+            state.name = "State " + state.id
+        self.storage.save()
+        shards = self.manifest()["shards"]
+        self.assertEqual(len(shards), 16)
+        self.assertEqual(sorted(name for name in os.listdir(self.path)
+                                if name != "manifest.json"),
+                         sorted(name for name in shards if name))
+        self.storage.reload()
+        self.assertEqual(self.storage.count(State), 40)
+        self.assertEqual(self.storage.get(State, states[3].id).to_dict(),
+                         states[3].to_dict())
+        self.storage.lazy()
+        self.storage.reload()
+        self.assertIsInstance(FileStorage._FileStorage__objects[
+            "State." + states[3].id], LazyRecord)
+        self.assertEqual(self.storage.get(State, states[3].id).name,
+                         states[3].name)
+
+    def test_dirty_shards(self):
+        """
+        Test if a save rewrites only the shards of the changed and
+        deleted objects.
+        """
+        cities = [City() for i in range(40)]
+        self.storage.save()
+        before = self.manifest()["shards"]
+        self.storage.reload()
+        self.storage.get(City, cities[0].id).name = "Austin"
+        self.storage.delete(self.storage.get(City, cities[1].id))
+        self.storage.save()
+        after = self.manifest()["shards"]
+        changed = {ShardedStorage.shard_of("City." + city.id, 16)
+                   for city in cities[:2]}
+        self.assertEqual({shard for shard in range(16)
+                          if before[shard] != after[shard]}, changed)
+        self.assertEqual(self.manifest()["generation"], 2)
+        self.storage.save()
+        self.assertEqual(self.manifest()["generation"], 2)
+        self.storage.reload()
+        self.assertEqual(self.storage.count(City), 39)
+        self.assertEqual(self.storage.get(City, cities[0].id).name,
+                         "Austin")
+
+    def test_replaced_objects(self):
+        """
+        Test if a save after the object dictionary is replaced rewrites
+        all the shards from the new one.
+        """
+        [City() for i in range(10)]
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        state = State()
+        self.storage.save()
+        self.assertEqual(len([name for name in self.manifest()["shards"]
+                              if name]), 1)
+        self.storage.reload()
+        self.assertEqual(list(self.storage.all()), ["State." + state.id])
+
+    def test_parallel_reload(self):
+        """
+        Test if a reload across a process pool stores the same objects.
+        """
+        states = [State() for i in range(20)]
+        self.storage.save()
+        self.storage.reload(workers=2)
+        self.assertEqual(sorted(self.storage.all(State)),
+                         sorted("State." + state.id for state in states))
+        self.assertEqual(self.storage.get(State, states[0].id).created_at,
+                         states[0].created_at)
+
+    def test_spawn_reload(self):
+        """
+        Test if the workers of a reload under the spawn start method
+        import the models package without reloading the storage, as
+        they import the main script again.
+        """
+        [State() for i in range(20)]
+        self.storage.save()
+        script = os.path.join(self.directory.name, "spawn_reload.py")
+        with open(script, "w", encoding="utf-8") as file:
+            # a single write per line, which the workers cannot mix
+            file.write("import multiprocessing\n"
+                       "import os\n"
+                       "from models import storage\n"
+                       "os.write(1, 'loaded {}\\n'.format(\n"
+                       "    len(storage.all())).encode())\n"
+                       "if __name__ == '__main__':\n"
+                       "    multiprocessing.set_start_method('spawn')\n"
+                       "    storage.reload(workers=2)\n"
+                       "    print('reloaded', len(storage.all()))\n")
+        environment = dict(os.environ, PYTHONPATH=os.getcwd(),
+                           HBNB_TYPE_STORAGE="sharded")
+        lines = subprocess.run([sys.executable, script], check=True,
+                               cwd=self.directory.name, env=environment,
+                               capture_output=True,
+                               text=True).stdout.splitlines()
+        self.assertEqual(lines[0], "loaded 20")
+        self.assertEqual(lines[-1], "reloaded 20")
+        self.assertGreater(len(lines), 2)
+        self.assertEqual(set(lines[1:-1]), {"loaded 0"})
+
+    def test_convert(self):
+        """
+        Test if a JSON file survives a conversion to shards and back.
+        """
+        objects = {"State.{}".format(i): {"id": str(i), "__class__": "State",
+                                          "name": "State {}".format(i)}
+                   for i in range(10)}
+        json_path = os.path.join(self.directory.name, "file.json")
+        with open(json_path, "w", encoding="utf-8") as file:
+            json.dump(objects, file)
+        ShardedStorage.from_json(json_path, self.path, 4)
+        self.assertEqual(len(self.manifest()["shards"]), 4)
+        os.remove(json_path)
+        ShardedStorage.to_json(self.path, json_path)
+        with open(json_path, "r", encoding="utf-8") as file:
+            self.assertEqual(json.load(file), objects)
+
+    def test_modes(self):
+        """
+        Test if the log and multi-process modes are refused, also when
+        the environment asks for them.
+        """
+        with self.assertRaises(ValueError):
+            self.storage.journal()
+        with self.assertRaises(ValueError):
+            self.storage.share()
+        environment = dict(os.environ, PYTHONPATH=os.getcwd(),
+                           HBNB_TYPE_STORAGE="sharded", HBNB_FILE_JOURNAL="1")
+        process = subprocess.run([sys.executable, "-c", "import models"],
+                                 cwd=self.directory.name, env=environment,
+                                 capture_output=True, text=True)
+        self.assertNotEqual(process.returncode, 0)
+        self.assertIn("ValueError: ShardedStorage has no log mode",
+                      process.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+#!/usr/bin/python3
+"""TextIndex class module Unittest"""
+import pep8
+import random
+import types
+import unittest
+from models.engine.text_index import TextIndex
+
+
+class TestTextIndex(unittest.TestCase):
+    """
+    Test case for the TextIndex class.
+    """
+
+    def document(self, name, description=None):
+        """
+        Build an object with text attributes.
+
+        Args:
+            name (str): The name of the object.
+            description (str): The description of the object.
+
+        Returns:
+            SimpleNamespace: The object.
+        """
+        return types.SimpleNamespace(name=name, description=description)
+
+    def test_pep8(self):
+        """
+        Test the code against PEP8 style guidelines.
+        """
+        py_code_style = pep8.StyleGuide(quiet=True)
+        check = py_code_style.check_files(
+            ['models/engine/text_index.py',
+                'tests/test_models/test_engine/test_text_index.py'])
+        self.assertEqual(check.total_errors, 0, "Errors found")
+
+    def test_parse(self):
+        """
+        Test if searches are split into lowercase words and phrases.
+        """
+        self.assertEqual(TextIndex.tokens("Quiet, CLEAN room!"),
+                         ["quiet", "clean", "room"])
+        self.assertEqual(TextIndex.parse('Quiet "very clean" ""'),
+                         [["quiet"], ["very", "clean"]])
+
+    def test_search(self):
+        """
+        Test if matches are ranked with BM25 and phrases checked against
+        the positions, within one attribute.
+        """
+        index = TextIndex(("name", "description"))
+        index.put("a", self.document("Quiet loft", "very quiet and clean"))
+        index.put("b", self.document("Clean", "noisy but clean"))
+        index.put("c", self.document("Loft", 5))
+        index.put("d", self.document(None))
+        self.assertEqual(len(index), 3)
+        self.assertEqual([object_id for score, object_id
+                          in index.search("quiet clean")], ["a", "b"])
+        self.assertEqual([object_id for score, object_id
+                          in index.search("loft clean", 2)], ["a", "c"])
+        self.assertEqual(index.search('"very quiet"')[0][1], "a")
+        self.assertEqual(index.search('"quiet very"'), [])
+        self.assertEqual(index.search('"loft very"'), [])
+        self.assertEqual(index.search("hotel"), [])
+        scores = dict((object_id, score) for score, object_id
+                      in index.search("clean"))
+        self.assertGreater(scores["b"], scores["a"])
+
+    def test_changes(self):
+        """
+        Test if changed and removed objects are searched as they are,
+        also once the postings are rewritten.
+        """
+        index = TextIndex(("name",))
+        words = ["alpha", "beta", "gamma", "delta"]
+        names = {}
+        for step in range(4000):
+            object_id = str(random.randrange(300))
+            if step % 5 == 0:
+                index.discard(object_id)
+                names.pop(object_id, None)
+            else:
+                name = " ".join(random.choice(words) for i in range(3))
+                index.put(object_id, self.document(name))
+                names[object_id] = name
+        self.assertEqual(len(index), len(names))
+        for word in words:
+            self.assertEqual(
+                sorted(object_id for score, object_id in index.search(word)),
+                sorted(object_id for object_id, name in names.items()
+                       if word in name.split()))
+
+
+if __name__ == "__main__":
+    unittest.main()
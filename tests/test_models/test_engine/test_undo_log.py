@@ -0,0 +1,46 @@
+#!/usr/bin/python3
+"""UndoLog class module Unittest"""
+import pep8
+import unittest
+from models.state import State
+from models.engine.undo_log import UndoLog
+
+
+class TestUndoLog(unittest.TestCase):
+    """
+    Test case for the UndoLog class.
+    """
+
+    def test_pep8(self):
+        """
+        Test the code against PEP8 style guidelines.
+        """
+        py_code_style = pep8.StyleGuide(quiet=True)
+        check = py_code_style.check_files(
+            ['models/engine/undo_log.py',
+                'tests/test_models/test_engine/test_undo_log.py'])
+        self.assertEqual(check.total_errors, 0, "Errors found")
+
+    def test_undo(self):
+        """
+        Test if undo() restores attributes and entries, newest first.
+        """
+        state = State(id="1", name="Texas")
+        log = UndoLog()
+        log.attribute(state, "name")
+        state.__dict__["name"] = "Ohio"
+        log.attribute(state, "name")
+        state.__dict__["name"] = "Utah"
+        log.attribute(state, "capital")
+        state.__dict__["capital"] = "Salt Lake City"
+        log.entry("State.1", None)
+        log.entry("State.2", state)
+        restored = []
+        log.undo(lambda key, previous: restored.append((key, previous)))
+        self.assertEqual(state.__dict__, {"id": "1", "name": "Texas"})
+        self.assertEqual(restored, [("State.2", state), ("State.1", None)])
+        self.assertEqual(len(log), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
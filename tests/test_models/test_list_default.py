@@ -0,0 +1,61 @@
+#!/usr/bin/python3
+"""ListDefault class module Unittest"""
+import pep8
+import unittest
+from models.list_default import ListDefault
+from models.place import Place
+
+
+class TestListDefault(unittest.TestCase):
+    """
+    Test case for the ListDefault class.
+    """
+
+    def test_pep8(self):
+        """
+        Test the code against PEP8 style guidelines.
+        """
+        py_code_style = pep8.StyleGuide(quiet=True)
+        check = py_code_style.check_files(
+            ['models/list_default.py',
+                'tests/test_models/test_list_default.py'])
+        self.assertEqual(check.total_errors, 0, "Errors found")
+
+    def test_own_list(self):
+        """
+        Test if each instance appends to its own list, and the class
+        default stays empty.
+        """
+        class Listing:
+            """A class with a list attribute."""
+            tags = ListDefault()
+
+        first, second = Listing(), Listing()
+        first.tags.append("a")
+        self.assertEqual(first.tags, ["a"])
+        self.assertEqual(second.tags, [])
+        self.assertEqual(Listing.tags, [])
+        Listing.tags.append("b")
+        self.assertEqual(Listing().tags, [])
+        second.tags = ["c"]
+        self.assertEqual(second.tags, ["c"])
+        self.assertEqual(vars(second), {"tags": ["c"]})
+        third = Listing()
+        third.tags
+        self.assertEqual(vars(third), {})
+        third.tags += ["d"]
+        self.assertEqual(vars(third), {"tags": ["d"]})
+
+    def test_place(self):
+        """
+        Test if the amenity ids of Places do not leak between them.
+        """
+        place = Place()
+        place.amenity_ids.append("wifi")
+        self.assertEqual(Place().amenity_ids, [])
+        self.assertEqual(Place.amenity_ids, [])
+        self.assertEqual(place.to_dict()["amenity_ids"], ["wifi"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/python3
+"""PendingList class module Unittest"""
+import pep8
+import unittest
+from models import storage
+from models.pending_list import PendingList
+from models.place import Place
+
+
+class TestPendingList(unittest.TestCase):
+    """
+    Test case for the PendingList class.
+    """
+
+    def test_pep8(self):
+        """
+        Test the code against PEP8 style guidelines.
+        """
+        py_code_style = pep8.StyleGuide(quiet=True)
+        check = py_code_style.check_files(
+            ['models/pending_list.py',
+                'tests/test_models/test_pending_list.py'])
+        self.assertEqual(check.total_errors, 0, "Errors found")
+
+    def test_attach(self):
+        """
+        Test if each change sets the list on the instance, unless the
+        instance got a value of its own first.
+        """
+        for change in (lambda ids: ids.append("a"),
+                       lambda ids: ids.extend(["a"]),
+                       lambda ids: ids.insert(0, "a"),
+                       lambda ids: ids.__setitem__(slice(0, 0), ["a"]),
+                       lambda ids: ids.__iadd__(["a"])):
+            place = Place()
+            ids = place.amenity_ids
+            self.assertIsInstance(ids, PendingList)
+            self.assertNotIn("amenity_ids", vars(place))
+            change(ids)
+            self.assertIs(vars(place)["amenity_ids"], ids)
+            self.assertEqual(place.amenity_ids, ["a"])
+        place = Place()
+        ids = place.amenity_ids
+        place.amenity_ids = ["b"]
+        ids.append("a")
+        self.assertEqual(place.amenity_ids, ["b"])
+
+    def test_rollback(self):
+        """
+        Test if a rollback removes a list set on its instance by a change
+        within the batch.
+        """
+        place = Place()
+        storage.begin()
+        place.amenity_ids.append("a")
+        storage.rollback()
+        self.assertNotIn("amenity_ids", vars(place))
+
+
+if __name__ == "__main__":
+    unittest.main()
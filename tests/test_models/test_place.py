@@ -9,6 +9,8 @@ import time
 from models import storage
 from datetime import datetime
 from models.place import Place
+from models.review import Review
+from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.engine.file_storage import FileStorage
 
@@ -54,7 +56,33 @@ class TestPlace(unittest.TestCase):
         place = Place()
         for key, value in attributes.items():
             self.assertTrue(hasattr(place, key))
-            self.assertEqual(type(getattr(place, key, None)), value)
+            self.assertIsInstance(getattr(place, key, None), value)
+
+    def test_reviews(self):
+        """
+        Test if reviews lists the reviews of the place.
+        """
+        place = Place()
+        reviews = [Review() for i in range(2)]
+        for review in reviews:
+            review.place_id = place.id
+            storage.new(review)
+        self.assertEqual(sorted(review.id for review in place.reviews),
+                         sorted(review.id for review in reviews))
+        storage.delete(reviews[0])
+        self.assertEqual(place.reviews, [reviews[1]])
+
+    def test_amenities(self):
+        """
+        Test if amenities lists the stored amenities of amenity_ids, in
+        order.
+        """
+        place = Place()
+        self.assertEqual(place.amenities, [])
+        self.assertNotIn("amenity_ids", vars(place))
+        amenities = [Amenity() for i in range(2)]
+        place.amenity_ids = [amenities[1].id, "missing", amenities[0].id]
+        self.assertEqual(place.amenities, amenities[::-1])
 
     def test_pep8(self):
         """
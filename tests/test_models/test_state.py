@@ -9,6 +9,7 @@ import time
 from models import storage
 from datetime import datetime
 from models.state import State
+from models.city import City
 from models.base_model import BaseModel
 from models.engine.file_storage import FileStorage
 
@@ -56,6 +57,23 @@ class TestState(unittest.TestCase):
             self.assertTrue(hasattr(state, key))
             self.assertEqual(type(getattr(state, key, None)), value)
 
+    def test_cities(self):
+        """
+        Test if cities follows the cities that are added, moved and
+        deleted.
+        """
+        state, other = State(), State()
+        cities = [City() for i in range(3)]
+        for city in cities:
+            city.state_id = state.id
+            storage.new(city)
+        self.assertEqual(sorted(city.id for city in state.cities),
+                         sorted(city.id for city in cities))
+        cities[0].state_id = other.id
+        storage.delete(cities[1])
+        self.assertEqual(state.cities, [cities[2]])
+        self.assertEqual(other.cities, [cities[0]])
+
     def test_pep8(self):
         """
         Test if the code complies with PEP8 style guidelines.
@@ -9,6 +9,8 @@ import time
 from models import storage
 from datetime import datetime
 from models.user import User
+from models.place import Place
+from models.review import Review
 from models.base_model import BaseModel
 from models.engine.file_storage import FileStorage
 
@@ -56,6 +58,19 @@ class TestUser(unittest.TestCase):
             self.assertTrue(hasattr(user, key))
             self.assertEqual(type(getattr(user, key, None)), value)
 
+    def test_places_reviews(self):
+        """
+        Test if places and reviews list what the user owns and wrote.
+        """
+        user = User()
+        place, review = Place(), Review()
+        place.user_id = review.user_id = user.id
+        storage.new(place)
+        storage.new(review)
+        self.assertEqual(user.places, [place])
+        self.assertEqual(user.reviews, [review])
+        self.assertEqual(User().places, [])
+
     def test_pep8(self):
         """
         Test if the code complies with PEP8 style guidelines.